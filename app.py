@@ -1,4 +1,129 @@
-from mission_control import MissionControl
+import argparse
+import csv
+import json
+import sys
+import time
+
+from mission_control import HISTORY_WINDOW, MissionControl
+from mission_statistics import MissionStatistics
+
+# Columns of the batch output: the mission identity followed by its summary.
+COLUMNS = ("mission_name", "random_seed", *MissionStatistics.FIELDS)
+
+
+class SummaryWriter:
+    """
+    Streams mission summaries as JSON lines or CSV rows, one per mission as soon as it completes.
+
+    Attributes:
+        stream (file): The stream the summaries are written to.
+        format (str): "jsonl" or "csv".
+        count (int): The number of summaries written.
+
+    Methods:
+        write(mission): Writes the summary of a finished mission.
+    """
+
+    def __init__(self, stream, output_format="jsonl"):
+        """
+        Initializes a new SummaryWriter object, writing the CSV header if needed.
+
+        Args:
+            stream (file): The stream the summaries are written to.
+            output_format (str): "jsonl" or "csv" (default: "jsonl").
+        """
+        self.stream = stream
+        self.format = output_format
+        self.count = 0
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.writer(stream)
+            self._csv.writerow(COLUMNS)
+
+    def write(self, mission):
+        """
+        Writes the summary of a finished mission.
+
+        Args:
+            mission (Mission): The finished mission.
+        """
+        row = (mission.mission_name, mission.random_seed, *(mission.summary[field] for field in MissionStatistics.FIELDS))
+        if self._csv is None:
+            self.stream.write(json.dumps(dict(zip(COLUMNS, row))) + "\n")
+        else:
+            self._csv.writerow(row)
+        self.count += 1
+
+
+def run_batch(missions, seed, workers, output_format, output, batch_size, history=None):
+    """
+    Runs missions without prompts and streams their summaries.
+
+    Args:
+        missions (int): The number of missions to run.
+        seed (int): The base random seed of the missions.
+        workers (int): The number of worker processes, or None for the number of CPUs.
+        output_format (str): "jsonl" or "csv".
+        output (str): The path of the output file, or None or "-" for stdout.
+        batch_size (int): The number of missions distributed to the workers at once.
+        history (MissionHistory): Persists every mission as well, if given (default: None).
+    """
+    stream = sys.stdout if output in (None, "-") else open(output, "w", newline="")
+    started_at = time.perf_counter()
+    try:
+        writer = SummaryWriter(stream, output_format)
+        control = MissionControl(random_seed=seed, retain_missions=False, history=history)
+        control.run_missions(missions, workers=workers, batch_size=batch_size, on_mission=writer.write)
+        stream.flush()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(f"Ran {writer.count:,} missions in {time.perf_counter() - started_at:.2f} s", file=sys.stderr)
+
 
 if __name__ == "__main__":
-    MissionControl.start()
+    parser = argparse.ArgumentParser(description="Mission Control. Without a command, starts the interactive session.")
+    parser.add_argument("--history", help="SQLite file persisting every mission across sessions")
+    parser.add_argument("--telemetry", action="store_true", help="persist the telemetry of interactive missions too")
+    parser.add_argument(
+        "--window",
+        type=int,
+        help=f"recent missions kept in memory (default: every mission, or {HISTORY_WINDOW} with --history)",
+    )
+    parser.add_argument(
+        "--bus", nargs="?", const=True, metavar="NAME", help="publish live telemetry on a shared memory bus"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="run missions without prompts and stream their summaries")
+    run_parser.add_argument("--missions", type=int, default=1000, help="number of missions (default: 1000)")
+    run_parser.add_argument("--seed", type=int, default=12, help="base random seed (default: 12)")
+    run_parser.add_argument("--workers", type=int, help="worker processes (default: the number of CPUs)")
+    run_parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="output format (default: jsonl)")
+    run_parser.add_argument("--output", help="output file (default: stdout)")
+    run_parser.add_argument("--batch-size", type=int, default=10000, help="missions distributed at once (default: 10000)")
+
+    args = parser.parse_args()
+    # sqlite3 and the telemetry bus are only imported when asked for, so plain batch runs start faster.
+    history = None
+    if args.history:
+        from mission_history import MissionHistory
+
+        history = MissionHistory(args.history, telemetry=args.telemetry, random_seed=getattr(args, "seed", 12))
+    # Batch missions are resolved without a flight loop, so only interactive rockets publish on the bus.
+    bus = None
+    if args.bus and args.command != "run":
+        from telemetry_bus import TelemetryBus
+
+        bus = TelemetryBus.create() if args.bus is True else TelemetryBus.create(args.bus)
+    try:
+        if args.command == "run":
+            run_batch(args.missions, args.seed, args.workers, args.format, args.output, args.batch_size, history)
+        else:
+            MissionControl.start(history=history, window=args.window, bus=bus)
+    finally:
+        if history is not None:
+            history.close()
+        if bus is not None:
+            bus.close()
@@ -0,0 +1,384 @@
+import argparse
+import json
+import mmap
+import os
+from array import array
+
+from mission import Mission
+from telemetry import FIELDS, TYPECODES, TelemetryRecord
+
+# Integer columns store the difference from the previous value, float columns the XOR of their IEEE 754
+# bits with the previous value's. Both are lossless and mostly zero or small for telemetry streams.
+ENCODINGS = {"q": "q", "d": "Q"}
+
+# Missions ended since the manifest was last written are appended to this journal, one JSON line each with
+# the position of the mission in the manifest, so ending a mission costs one line rather than a rewrite of
+# every mission before it. Positions let a reader skip entries the manifest already has.
+JOURNAL = "manifest.jsonl"
+
+
+def _to_bits(value):
+    return array("Q", array("d", [value]).tobytes())[0]
+
+
+def _from_bits(bits):
+    return array("d", array("Q", [bits]).tobytes())[0]
+
+
+class TelemetryRecorder:
+    """
+    Appends rocket telemetry to a columnar archive: a directory holding one delta-encoded binary file per
+    status field, an anchor file per field with the decoded value at the start of every block, and a
+    manifest listing the archived missions and their row ranges.
+
+    Every mission is appended to the manifest journal once the columns it covers are written, so a
+    recorder that dies mid-mission loses that mission only. The manifest itself is replaced atomically when
+    the archive is opened and closed, folding the journal into it. Rows past the last archived mission are
+    cut off when the archive is opened again.
+
+    Attributes:
+        path (str): The directory of the archive.
+        block_size (int): The number of rows between anchors, which bounds the work of a random seek.
+        rows (int): The number of rows in the archive.
+        missions (list): The archived missions as dicts with a name, a start row and a stop row.
+
+    Methods:
+        begin_mission(name): Starts a new mission in the archive.
+        record(status): Appends a status sample to the current mission.
+        end_mission(): Ends the current mission and appends it to the manifest journal.
+        close(): Flushes the columns and writes the manifest.
+    """
+
+    def __init__(self, path, block_size=4096):
+        """
+        Initializes a new TelemetryRecorder object, creating the archive or appending to an existing one.
+
+        Args:
+            path (str): The directory of the archive.
+            block_size (int): The number of rows between anchors for a new archive (default: 4096).
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.block_size = block_size
+        self.rows = 0
+        self.missions = []
+        self._previous = {field: 0 for field in FIELDS}
+        self._mission = None
+
+        manifest_path = os.path.join(path, "manifest.json")
+        if os.path.exists(manifest_path):
+            archive = TelemetryArchive(path)
+            self.block_size = archive.block_size
+            self.rows = archive.rows
+            self.missions = archive.missions
+            if self.rows:
+                self._previous = {field: self._raw(field, archive.record(self.rows - 1)[field]) for field in FIELDS}
+            archive.close()
+
+        # Drops the rows of a mission that was still being recorded when the archive was last written.
+        for field in FIELDS:
+            itemsize = array(ENCODINGS[TYPECODES[field]]).itemsize
+            self._truncate(os.path.join(path, f"{field}.col"), self.rows * itemsize)
+            self._truncate(os.path.join(path, f"{field}.idx"), -(-self.rows // self.block_size) * itemsize)
+
+        self._columns = {field: open(os.path.join(path, f"{field}.col"), "ab") for field in FIELDS}
+        self._anchors = {field: open(os.path.join(path, f"{field}.idx"), "ab") for field in FIELDS}
+        self._pending = {field: array(ENCODINGS[TYPECODES[field]]) for field in FIELDS}
+
+        # Folds the journal into the manifest, which also drops a line torn by a recorder that died writing it.
+        self._journal = None
+        self._write_manifest()
+        self._journal = open(os.path.join(path, JOURNAL), "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def begin_mission(self, name):
+        """
+        Starts a new mission in the archive, ending the current one if necessary.
+
+        Args:
+            name (str): The name of the mission.
+        """
+        if self._mission is not None:
+            self.end_mission()
+        self._mission = {"name": name, "start": self.rows, "stop": self.rows}
+
+    def record(self, status):
+        """
+        Appends a status sample to the current mission.
+
+        Args:
+            status (Mapping): Status information as returned by Rocket.status.
+        """
+        if self.rows % self.block_size == 0:
+            self._flush()
+            for field in FIELDS:
+                typecode = ENCODINGS[TYPECODES[field]]
+                self._anchors[field].write(array(typecode, [self._previous[field]]).tobytes())
+
+        previous = self._previous
+        for field in FIELDS:
+            value = self._raw(field, status[field])
+            if TYPECODES[field] == "q":
+                self._pending[field].append(value - previous[field])
+            else:
+                self._pending[field].append(value ^ previous[field])
+            previous[field] = value
+
+        self.rows += 1
+        if self._mission is not None:
+            self._mission["stop"] = self.rows
+
+    def end_mission(self):
+        """
+        Ends the current mission and appends it to the manifest journal.
+        """
+        if self._mission is not None:
+            self.missions.append(self._mission)
+            self._sync()
+            self._journal.write(json.dumps([len(self.missions) - 1, self._mission]) + "\n")
+            self._journal.flush()
+            self._mission = None
+
+    def close(self):
+        """
+        Ends the current mission, flushes the columns and writes the manifest.
+        """
+        self.end_mission()
+        self._write_manifest()
+        for handle in (*self._columns.values(), *self._anchors.values(), self._journal):
+            handle.close()
+
+    def _write_manifest(self):
+        self._sync()
+        manifest = {"fields": list(FIELDS), "block_size": self.block_size, "rows": self.rows, "missions": self.missions}
+        manifest_path = os.path.join(self.path, "manifest.json")
+        with open(f"{manifest_path}.tmp", "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+        if self._journal is not None:
+            self._journal.seek(0)
+            self._journal.truncate()
+
+    def _sync(self):
+        self._flush()
+        for handle in (*self._columns.values(), *self._anchors.values()):
+            handle.flush()
+
+    def _flush(self):
+        for field, pending in self._pending.items():
+            if pending:
+                pending.tofile(self._columns[field])
+                del pending[:]
+
+    @staticmethod
+    def _truncate(path, size):
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    @staticmethod
+    def _raw(field, value):
+        if TYPECODES[field] == "q":
+            return int(value)
+        return _to_bits(float(value))
+
+
+class TelemetryArchive:
+    """
+    Reads a telemetry archive written by TelemetryRecorder. Every column is memory-mapped, so opening an
+    archive and scanning a range only touches the pages of that range, however large the archive is.
+
+    Attributes:
+        path (str): The directory of the archive.
+        block_size (int): The number of rows between anchors.
+        rows (int): The number of rows in the archive.
+        missions (list): The archived missions as dicts with a name, a start row and a stop row.
+
+    Methods:
+        raw(field, start, stop): Retrieves a zero-copy view of the encoded values of a column range.
+        scan(field, start, stop): Decodes the values of a column range.
+        record(row): Decodes a single row.
+        records(start, stop): Decodes a range of rows.
+        mission(name): Finds an archived mission by name.
+        replay(name, mission): Replays an archived mission through Mission.display_mission_status.
+        close(): Releases the memory maps.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes a new TelemetryArchive object.
+
+        Args:
+            path (str): The directory of the archive.
+        """
+        with open(os.path.join(path, "manifest.json")) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.path = path
+        self.block_size = manifest["block_size"]
+        self.rows = manifest["rows"]
+        self.missions = manifest["missions"]
+        journal_path = os.path.join(path, JOURNAL)
+        if os.path.exists(journal_path):
+            with open(journal_path) as journal_file:
+                for line in journal_file:
+                    try:
+                        position, mission = json.loads(line)
+                    except ValueError:
+                        # Torn by a recorder that died writing it; nothing follows.
+                        break
+                    if position == len(self.missions):
+                        self.missions.append(mission)
+                        self.rows = max(self.rows, mission["stop"])
+        self._maps = []
+        self._columns = {}
+        self._anchors = {}
+
+        for field in FIELDS:
+            typecode = ENCODINGS[TYPECODES[field]]
+            self._columns[field] = self._map(os.path.join(path, f"{field}.col"), typecode)
+            self._anchors[field] = self._map(os.path.join(path, f"{field}.idx"), typecode)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def raw(self, field, start=0, stop=None):
+        """
+        Retrieves a zero-copy view of the encoded values of a column range.
+
+        Args:
+            field (str): The status field.
+            start (int): The first row (default: 0).
+            stop (int): The row after the last one (default: the end of the archive).
+
+        Returns:
+            memoryview: The delta-encoded values, backed by the memory map.
+        """
+        return self._columns[field][start:self.rows if stop is None else stop]
+
+    def scan(self, field, start=0, stop=None):
+        """
+        Decodes the values of a column range, starting from the anchor of the block holding the first row.
+
+        Args:
+            field (str): The status field.
+            start (int): The first row (default: 0).
+            stop (int): The row after the last one (default: the end of the archive).
+
+        Yields:
+            int or float: The decoded values, in row order.
+        """
+        stop = self.rows if stop is None else min(stop, self.rows)
+        if start >= stop:
+            return
+
+        column = self._columns[field]
+        block_start = start - start % self.block_size
+        value = self._anchors[field][block_start // self.block_size]
+        is_integer = TYPECODES[field] == "q"
+
+        for row in range(block_start, stop):
+            if is_integer:
+                value += column[row]
+            else:
+                value ^= column[row]
+            if row >= start:
+                yield value if is_integer else _from_bits(value)
+
+    def record(self, row):
+        """
+        Decodes a single row.
+
+        Args:
+            row (int): The row to decode.
+
+        Returns:
+            TelemetryRecord: The status sample stored in the row.
+        """
+        if not 0 <= row < self.rows:
+            raise IndexError("telemetry row out of range")
+        return next(self.records(row, row + 1))
+
+    def records(self, start=0, stop=None):
+        """
+        Decodes a range of rows.
+
+        Args:
+            start (int): The first row (default: 0).
+            stop (int): The row after the last one (default: the end of the archive).
+
+        Yields:
+            TelemetryRecord: The status samples, in row order.
+        """
+        scans = [self.scan(field, start, stop) for field in FIELDS]
+        for values in zip(*scans):
+            yield TelemetryRecord(*values)
+
+    def mission(self, name):
+        """
+        Finds an archived mission by name. If several missions share the name, the latest one is returned.
+
+        Args:
+            name (str): The name of the mission.
+
+        Returns:
+            dict: The mission with its name, start row and stop row.
+        """
+        for mission in reversed(self.missions):
+            if mission["name"] == name:
+                return mission
+        raise KeyError(name)
+
+    def replay(self, name, mission=None):
+        """
+        Replays an archived mission through Mission.display_mission_status.
+
+        Args:
+            name (str): The name of the archived mission.
+            mission (Mission): The mission used to display the statuses (default: a new Mission).
+        """
+        if mission is None:
+            mission = Mission(mission_name=name)
+
+        archived = self.mission(name)
+        for status in self.records(archived["start"], archived["stop"]):
+            mission.display_mission_status(status)
+
+    def close(self):
+        """
+        Releases the memory maps.
+        """
+        for view in (*self._columns.values(), *self._anchors.values()):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+
+    def _map(self, path, typecode):
+        if os.path.getsize(path) == 0:
+            return memoryview(array(typecode))
+        with open(path, "rb") as column_file:
+            mapped = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(typecode)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a mission from a telemetry archive.")
+    parser.add_argument("path", help="directory of the telemetry archive")
+    parser.add_argument("mission", nargs="?", help="name of the mission to replay (default: list the missions)")
+    args = parser.parse_args()
+
+    with TelemetryArchive(args.path) as archive:
+        if args.mission is None:
+            for archived in archive.missions:
+                print(f"{archived['name']}: rows {archived['start']}-{archived['stop']}")
+        else:
+            archive.replay(args.mission)
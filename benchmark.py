@@ -0,0 +1,332 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+
+import launch_sequence
+from clock import VirtualClock
+from decisions import PolicyDecisions
+from launch_control import LaunchControl
+from mission import Mission
+from mission_control import MissionControl
+from mission_statistics import MissionStatistics
+from rocket import Rocket
+
+
+class Benchmark:
+    """
+    Times an operation that can be repeated a known number of times.
+
+    Attributes:
+        name (str): The name of the benchmark.
+        operations (int): The number of operations performed by one run.
+        run (callable): Performs the operations once.
+        setup (callable): Prepares the argument of run outside of the timed section, or None.
+    """
+
+    def __init__(self, name, operations, run, setup=None):
+        """
+        Initializes a new Benchmark object.
+
+        Args:
+            name (str): The name of the benchmark.
+            operations (int): The number of operations performed by one run.
+            run (callable): Performs the operations, called with the result of setup if given.
+            setup (callable): Prepares the argument of run, outside of the timed section (default: None).
+        """
+        self.name = name
+        self.operations = operations
+        self.run = run
+        self.setup = setup
+
+    def measure(self, repeat):
+        """
+        Runs the benchmark several times and keeps the fastest run.
+
+        Args:
+            repeat (int): The number of runs.
+
+        Returns:
+            dict: The fastest run time in seconds, the number of operations and the time per operation in nanoseconds.
+        """
+        best = float("inf")
+        for _ in range(repeat):
+            argument = self.setup() if self.setup else None
+            with contextlib.redirect_stdout(io.StringIO()):
+                started_at = time.perf_counter()
+                if self.setup:
+                    self.run(argument)
+                else:
+                    self.run()
+                best = min(best, time.perf_counter() - started_at)
+
+        return {"seconds": best, "operations": self.operations, "ns_per_op": best / self.operations * 1e9}
+
+
+def flight_ticks(ticks):
+    """
+    Creates a benchmark of the per-tick cost of Rocket.launch on a virtual clock.
+
+    Args:
+        ticks (int): The number of ticks the flight lasts.
+
+    Returns:
+        Benchmark: The benchmark.
+    """
+    speed = 60
+    distance = speed / 60 * ticks * (ticks + 1) / 2
+
+    def setup():
+        # Over such a long flight the per-tick explosion chance is negligible; the seed fixes the outcome.
+        rng = random.Random(12)
+        return Rocket(distance, 168240, speed, rng=rng, clock=VirtualClock(), decisions=PolicyDecisions())
+
+    def run(rocket):
+        for _ in rocket.launch():
+            pass
+
+    return Benchmark(f"rocket.launch/{ticks}-ticks", ticks, run, setup)
+
+
+def launch_sequences(count):
+    """
+    Creates a benchmark of LaunchControl.prepare_for_launch and launch with non-interactive decisions.
+
+    Args:
+        count (int): The number of launch sequences.
+
+    Returns:
+        Benchmark: The benchmark.
+    """
+    def run():
+        decisions = PolicyDecisions()
+        for _ in range(count):
+            launch_control = LaunchControl(decisions=decisions)
+            launch_control.prepare_for_launch()
+            launch_control.launch()
+
+    return Benchmark(f"launch_control.prepare_for_launch/{count}", count, run)
+
+
+def launch_transitions(count):
+    """
+    Creates a benchmark of a single transition of the launch sequence state machine, stepping a batch of
+    sequences through the three preparation stages.
+
+    Args:
+        count (int): The number of launch sequences in the batch.
+
+    Returns:
+        Benchmark: The benchmark.
+    """
+    def setup():
+        decisions = PolicyDecisions()
+        return [LaunchControl(decisions=decisions) for _ in range(count)]
+
+    def run(controls):
+        launch_sequence.run_batch(controls, launch_sequence.PREPARED)
+
+    return Benchmark(f"launch_sequence.transition/{count}", 3 * count, run, setup)
+
+
+def simulated_missions(count):
+    """
+    Creates a benchmark of the per-mission cost of Mission.simulate.
+
+    Args:
+        count (int): The number of missions.
+
+    Returns:
+        Benchmark: The benchmark.
+    """
+    def run():
+        for seed in range(count):
+            Mission(random_seed=seed, decisions=PolicyDecisions()).simulate()
+
+    return Benchmark(f"mission.simulate/{count}", count, run)
+
+
+def summary_aggregation(count, samples):
+    """
+    Creates a benchmark of recording finished missions in MissionControl and displaying the final summary.
+
+    Args:
+        count (int): The number of missions aggregated.
+        samples (list): Finished missions, recorded over and over until count is reached.
+
+    Returns:
+        Benchmark: The benchmark.
+    """
+    def run():
+        mission_control = MissionControl(retain_missions=False)
+        for mission in itertools.islice(itertools.cycle(samples), count):
+            mission_control.record_mission(mission)
+        mission_control.display_summary()
+
+    return Benchmark(f"mission_control.display_summary/{count}", count, run)
+
+
+def statistics_updates(count):
+    """
+    Creates a benchmark of MissionStatistics.add.
+
+    Args:
+        count (int): The number of summaries added.
+
+    Returns:
+        Benchmark: The benchmark.
+    """
+    summary = {"total_distance": 250.0, "no_abort_retries": 0, "no_explosions": 0, "total_fuel_burned": 11216.0, "flight_time": 4}
+
+    def run():
+        statistics = MissionStatistics()
+        for _ in range(count):
+            statistics.add(summary)
+
+    return Benchmark(f"mission_statistics.add/{count}", count, run)
+
+
+def rocket_snapshots(count):
+    """
+    Creates a benchmark of a checkpoint round trip: Rocket.snapshot followed by Rocket.from_snapshot.
+
+    Args:
+        count (int): The number of rockets checkpointed and restored.
+
+    Returns:
+        Benchmark: The benchmark.
+    """
+    def setup():
+        rocket = Rocket(16000, 168240, 1500, rng=random.Random(12), clock=VirtualClock(), decisions=PolicyDecisions())
+        flight = rocket.launch()
+        for _ in range(10):
+            next(flight)
+        return rocket
+
+    def run(rocket):
+        clock = VirtualClock()
+        decisions = PolicyDecisions()
+        for _ in range(count):
+            Rocket.from_snapshot(rocket.snapshot(), clock=clock, decisions=decisions)
+
+    return Benchmark(f"rocket.snapshot_restore/{count}", count, run, setup)
+
+
+def suite(sizes):
+    """
+    Builds the benchmark suite.
+
+    Args:
+        sizes (list): The numbers of missions used by the per-mission and aggregation benchmarks.
+
+    Returns:
+        list: The benchmarks.
+    """
+    samples = [Mission(random_seed=seed, decisions=PolicyDecisions()) for seed in range(1000)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for mission in samples:
+            mission.simulate()
+
+    benchmarks = [
+        flight_ticks(10000),
+        launch_sequences(10000),
+        launch_transitions(10000),
+        simulated_missions(min(sizes[-1], 10000)),
+        rocket_snapshots(10000),
+    ]
+    for size in sizes:
+        benchmarks.append(summary_aggregation(size, samples))
+        benchmarks.append(statistics_updates(size))
+    return benchmarks
+
+
+def run_suite(sizes, repeat, output, only=None):
+    """
+    Runs the benchmark suite and writes the results to a JSON baseline.
+
+    Args:
+        sizes (list): The numbers of missions used by the per-mission and aggregation benchmarks.
+        repeat (int): The number of runs of each benchmark.
+        output (str): The path of the JSON file to write, or None to only print the results.
+        only (str): Runs only the benchmarks whose name contains this text (default: None).
+
+    Returns:
+        dict: The results.
+    """
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": {},
+    }
+
+    for benchmark in suite(sizes):
+        if only and only not in benchmark.name:
+            continue
+        measurement = benchmark.measure(repeat)
+        results["benchmarks"][benchmark.name] = measurement
+        print(f"{benchmark.name:<48} {measurement['ns_per_op']:>14,.1f} ns/op {measurement['seconds']:>10.4f} s")
+
+    if output:
+        with open(output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    return results
+
+
+def compare(baseline_path, current_path, threshold):
+    """
+    Compares two benchmark runs and flags the benchmarks that got slower by more than the threshold.
+
+    Args:
+        baseline_path (str): The path of the baseline JSON results.
+        current_path (str): The path of the current JSON results.
+        threshold (float): The tolerated relative slowdown, e.g. 0.1 for 10%.
+
+    Returns:
+        list: The names of the regressed benchmarks.
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)["benchmarks"]
+    with open(current_path) as current_file:
+        current = json.load(current_file)["benchmarks"]
+
+    regressions = []
+    for name in sorted(baseline.keys() & current.keys()):
+        change = current[name]["ns_per_op"] / baseline[name]["ns_per_op"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {baseline[name]['ns_per_op']:>12,.1f} -> {current[name]['ns_per_op']:>12,.1f} ns/op {change:>+8.1%}{flag}")
+
+    for name in sorted(baseline.keys() ^ current.keys()):
+        print(f"{name:<48} only in {'baseline' if name in baseline else 'current run'}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the flight loop, launch sequence and summary aggregation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmark suite")
+    run_parser.add_argument("--output", help="JSON file to record the results in")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6], help="mission counts")
+    run_parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the fastest is kept")
+    run_parser.add_argument("--only", help="run only the benchmarks whose name contains this text")
+
+    compare_parser = commands.add_parser("compare", help="compare two recorded runs")
+    compare_parser.add_argument("baseline", help="JSON results of the baseline run")
+    compare_parser.add_argument("current", help="JSON results of the current run")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="tolerated slowdown (default: 0.1)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_suite(sorted(args.sizes), args.repeat, args.output, args.only)
+    elif compare(args.baseline, args.current, args.threshold):
+        sys.exit(1)
@@ -0,0 +1,125 @@
+import os
+import struct
+import time
+
+from rocket import Rocket
+
+# A checkpoint file is a magic tag and a rocket count, followed by every rocket as a name length, a snapshot
+# length, the UTF-8 name and the snapshot written by Rocket.snapshot.
+CHECKPOINT_MAGIC = b"CKP1"
+CHECKPOINT_HEADER = struct.Struct("<4sI")
+ENTRY_HEADER = struct.Struct("<HI")
+
+
+def write_checkpoint(path, rockets):
+    """
+    Writes the snapshots of in-flight rockets to a checkpoint file. The file is replaced atomically, so a
+    crash while writing leaves the previous checkpoint intact.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        rockets (dict): Names, e.g. mission names, mapped to the rockets to checkpoint.
+    """
+    parts = [CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, len(rockets))]
+    for name, rocket in rockets.items():
+        encoded = name.encode()
+        snapshot = rocket.snapshot()
+        parts.append(ENTRY_HEADER.pack(len(encoded), len(snapshot)))
+        parts.append(encoded)
+        parts.append(snapshot)
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as checkpoint_file:
+        checkpoint_file.write(b"".join(parts))
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(temporary, path)
+
+
+def read_checkpoint(path, clock=None, decisions=None):
+    """
+    Restores the rockets of a checkpoint file. Each one continues its flight with launch(resume=True).
+
+    Args:
+        path (str): The path of the checkpoint file.
+        clock (Clock): The clock the restored rockets fly on (default: real time).
+        decisions (DecisionProvider): Answers the launch stage questions (default: the operator on the terminal).
+
+    Returns:
+        dict: Names mapped to the restored rockets, in checkpoint order.
+    """
+    with open(path, "rb") as checkpoint_file:
+        data = memoryview(checkpoint_file.read())
+
+    magic, count = CHECKPOINT_HEADER.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError(f"{path} is not a checkpoint file")
+
+    rockets = {}
+    offset = CHECKPOINT_HEADER.size
+    for _ in range(count):
+        name_size, snapshot_size = ENTRY_HEADER.unpack_from(data, offset)
+        offset += ENTRY_HEADER.size
+        name = bytes(data[offset:offset + name_size]).decode()
+        offset += name_size
+        rockets[name] = Rocket.from_snapshot(data[offset:offset + snapshot_size], clock=clock, decisions=decisions)
+        offset += snapshot_size
+    return rockets
+
+
+class Checkpointer:
+    """
+    Checkpoints in-flight rockets periodically. Flight loops call checkpoint after every status, and the
+    rockets are only written when the interval has passed since the last checkpoint.
+
+    Attributes:
+        path (str): The path of the checkpoint file.
+        interval (float): The minimum number of wall-clock seconds between two checkpoints.
+        checkpoints (int): The number of checkpoints written.
+
+    Methods:
+        checkpoint(rockets, force): Writes a checkpoint if the interval has passed.
+        clear(): Removes the checkpoint once its rockets have finished flying.
+    """
+
+    def __init__(self, path, interval=5.0):
+        """
+        Initializes a new Checkpointer object.
+
+        Args:
+            path (str): The path of the checkpoint file.
+            interval (float): The minimum number of wall-clock seconds between two checkpoints (default: 5.0).
+        """
+        self.path = path
+        self.interval = interval
+        self.checkpoints = 0
+        self._last = time.monotonic()
+
+    def checkpoint(self, rockets, force=False):
+        """
+        Writes a checkpoint if the interval has passed since the last one.
+
+        Args:
+            rockets (dict): Names mapped to the rockets in flight.
+            force (bool): Writes the checkpoint whatever the interval (default: False).
+
+        Returns:
+            bool: True if a checkpoint was written, False otherwise.
+        """
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return False
+
+        write_checkpoint(self.path, rockets)
+        self._last = now
+        self.checkpoints += 1
+        return True
+
+    def clear(self):
+        """
+        Removes the checkpoint file once the rockets it holds have finished flying, so they are not resumed.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,191 @@
+import time
+import types
+
+# asyncio is imported by the asynchronous waits that need it, so batch runs, which never wait on an event
+# loop, do not load it.
+
+
+@types.coroutine
+def _yield_to_loop():
+    # What asyncio.sleep(0) does: gives every other ready task a turn.
+    yield
+
+
+class Clock:
+    """
+    Represents the source of simulated time used by rockets and missions.
+
+    Methods:
+        now(): Retrieves the current simulated time.
+        sleep(seconds): Waits until the given number of simulated seconds has passed.
+        sleep_async(seconds): Waits without blocking the event loop until the given number of simulated seconds has passed.
+        sleep_until(deadline): Waits until the given simulated time.
+        sleep_until_async(deadline): Waits without blocking the event loop until the given simulated time.
+    """
+
+    def now(self):
+        """
+        Retrieves the current simulated time.
+
+        Returns:
+            float: The current simulated time in seconds.
+        """
+        raise NotImplementedError
+
+    def sleep(self, seconds):
+        """
+        Waits until the given number of simulated seconds has passed.
+
+        Args:
+            seconds (float): The number of simulated seconds to wait.
+        """
+        raise NotImplementedError
+
+    async def sleep_async(self, seconds):
+        """
+        Waits without blocking the event loop until the given number of simulated seconds has passed.
+
+        Args:
+            seconds (float): The number of simulated seconds to wait.
+        """
+        raise NotImplementedError
+
+    def sleep_until(self, deadline):
+        """
+        Waits until the given simulated time, returning at once if it has passed. Waiting for absolute
+        deadlines keeps a periodic loop on schedule whatever the time spent between the waits.
+
+        Args:
+            deadline (float): The simulated time to wait for.
+        """
+        while (remaining := deadline - self.now()) > 0:
+            self.sleep(remaining)
+
+    async def sleep_until_async(self, deadline):
+        """
+        Waits without blocking the event loop until the given simulated time. Yields to the event loop once
+        even if the deadline has passed.
+
+        Args:
+            deadline (float): The simulated time to wait for.
+        """
+        remaining = deadline - self.now()
+        await self.sleep_async(max(remaining, 0))
+        while (remaining := deadline - self.now()) > 0:
+            await self.sleep_async(remaining)
+
+
+class RealTimeClock(Clock):
+    """
+    A clock where one simulated second lasts one second of real time.
+    """
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds):
+        import asyncio
+
+        await asyncio.sleep(seconds)
+
+
+class ScaledClock(Clock):
+    """
+    A clock where simulated time runs a constant factor faster than real time.
+
+    Attributes:
+        factor (float): The number of simulated seconds per second of real time, e.g. 100 for 100x.
+    """
+
+    def __init__(self, factor):
+        """
+        Initializes a new ScaledClock object.
+
+        Args:
+            factor (float): The number of simulated seconds per second of real time.
+        """
+        if factor <= 0:
+            raise ValueError("factor must be positive")
+
+        self.factor = factor
+        self._origin = time.monotonic()
+
+    def now(self):
+        return (time.monotonic() - self._origin) * self.factor
+
+    def sleep(self, seconds):
+        time.sleep(seconds / self.factor)
+
+    async def sleep_async(self, seconds):
+        import asyncio
+
+        await asyncio.sleep(seconds / self.factor)
+
+
+class VirtualClock(Clock):
+    """
+    A clock where simulated time only moves when it is slept on, so waits return instantly.
+    Asynchronous waits still yield to the event loop once, so other tasks keep running.
+
+    Attributes:
+        time (float): The current simulated time in seconds.
+
+    Methods:
+        advance_to(time): Moves the clock forward to the given simulated time.
+    """
+
+    def __init__(self, start=0):
+        """
+        Initializes a new VirtualClock object.
+
+        Args:
+            start (float): The simulated time the clock starts at (default: 0).
+        """
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.time += seconds
+
+    async def sleep_async(self, seconds):
+        self.time += seconds
+        await _yield_to_loop()
+
+    def advance_to(self, time):
+        """
+        Moves the clock forward to the given simulated time. Earlier times leave the clock unchanged.
+
+        Args:
+            time (float): The simulated time to move to.
+        """
+        self.time = max(self.time, time)
+
+
+CLOCKS = {
+    "real": RealTimeClock,
+    "instant": VirtualClock,
+}
+
+
+def create_clock(mode="real"):
+    """
+    Creates a clock from a mode name.
+
+    Args:
+        mode (str): "real", "instant", or a time-warp factor such as "100x".
+
+    Returns:
+        Clock: A new clock instance.
+    """
+    if mode in CLOCKS:
+        return CLOCKS[mode]()
+
+    try:
+        return ScaledClock(float(mode.rstrip("x")))
+    except ValueError:
+        raise ValueError(f"unknown clock mode: {mode!r}") from None
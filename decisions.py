@@ -0,0 +1,260 @@
+import json
+import os
+
+
+class DecisionProvider:
+    """
+    Answers the questions asked during a mission and receives its announcements, so launch stages and
+    mission prompts do not depend on a terminal.
+
+    Every question has a key naming the decision, e.g. "engage_afterburner", "retry_afterburner",
+    "release_structure", "cross_checks", "launch", "mission_name", "proceed" or "another_mission".
+
+    Attributes:
+        echo (bool): Whether announcements are printed.
+        renderer (StatusRenderer): Writes the announcements above its live frame, or None to print them.
+
+    Methods:
+        answer(key, question): Retrieves the raw answer to a question.
+        confirm(key, question, accept): Checks if a question is answered with the accepting answer.
+        answer_async(key, question): Retrieves the raw answer to a question without blocking the event loop.
+        confirm_async(key, question, accept): Checks the answer to a question without blocking the event loop.
+        announce(message): Reports a mission event.
+    """
+
+    def __init__(self, echo=True):
+        """
+        Initializes a new DecisionProvider object.
+
+        Args:
+            echo (bool): Whether announcements are printed (default: True).
+        """
+        self.echo = echo
+        self.renderer = None
+
+    def answer(self, key, question):
+        """
+        Retrieves the raw answer to a question.
+
+        Args:
+            key (str): The name of the decision.
+            question (str): The question as shown to an operator.
+
+        Returns:
+            str: The answer.
+        """
+        raise NotImplementedError
+
+    def confirm(self, key, question, accept="yes"):
+        """
+        Checks if a question is answered with the accepting answer.
+
+        Args:
+            key (str): The name of the decision.
+            question (str): The question as shown to an operator.
+            accept (str): The answer that confirms, e.g. "yes" or "y" (default: "yes").
+
+        Returns:
+            bool: True if the answer matches the accepting answer, False otherwise.
+        """
+        return self.answer(key, question).strip().lower() == accept
+
+    async def answer_async(self, key, question):
+        """
+        Retrieves the raw answer to a question without blocking the event loop.
+
+        Args:
+            key (str): The name of the decision.
+            question (str): The question as shown to an operator.
+
+        Returns:
+            str: The answer.
+        """
+        return self.answer(key, question)
+
+    async def confirm_async(self, key, question, accept="yes"):
+        """
+        Checks if a question is answered with the accepting answer without blocking the event loop.
+
+        Args:
+            key (str): The name of the decision.
+            question (str): The question as shown to an operator.
+            accept (str): The answer that confirms, e.g. "yes" or "y" (default: "yes").
+
+        Returns:
+            bool: True if the answer matches the accepting answer, False otherwise.
+        """
+        return (await self.answer_async(key, question)).strip().lower() == accept
+
+    def announce(self, message):
+        """
+        Reports a mission event.
+
+        Args:
+            message (str): The event to report.
+        """
+        if self.echo:
+            if self.renderer is None:
+                print(message)
+            else:
+                self.renderer.note(message)
+
+
+class InteractiveDecisions(DecisionProvider):
+    """
+    Asks the operator every question on the terminal.
+    """
+
+    def answer(self, key, question):
+        return input(question)
+
+    async def answer_async(self, key, question):
+        import asyncio
+
+        return await asyncio.to_thread(input, question)
+
+
+class ScriptedDecisions(DecisionProvider):
+    """
+    Answers questions from a script, given as a list of answers consumed in order, or as a mapping from
+    decision keys to an answer used every time or a list of answers consumed in order.
+
+    Answers can be any scalar. Booleans, as YAML loads yes and no and JSON loads true and false, confirm or
+    decline whatever answer the question accepts, and read as "yes" or "no". Other values are used as
+    their string.
+
+    Methods:
+        from_file(path, echo): Loads a script from a JSON or YAML file.
+    """
+
+    def __init__(self, answers, echo=True):
+        """
+        Initializes a new ScriptedDecisions object.
+
+        Args:
+            answers (list or dict): The scripted answers.
+            echo (bool): Whether questions, answers and announcements are printed (default: True).
+        """
+        super().__init__(echo)
+        if isinstance(answers, dict):
+            self._answers = {
+                key: iter([_scripted(answer) for answer in value]) if isinstance(value, list) else _scripted(value)
+                for key, value in answers.items()
+            }
+        else:
+            self._answers = iter([_scripted(answer) for answer in answers])
+
+    @classmethod
+    def from_file(cls, path, echo=True):
+        """
+        Loads a script from a JSON file, or from a YAML file if PyYAML is installed.
+
+        Args:
+            path (str): The path of the script, ending in .json, .yaml or .yml.
+            echo (bool): Whether questions, answers and announcements are printed (default: True).
+
+        Returns:
+            ScriptedDecisions: A new instance of the ScriptedDecisions class.
+        """
+        with open(path) as script:
+            if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+                try:
+                    import yaml
+                except ImportError:
+                    raise RuntimeError("PyYAML is required to load YAML answer scripts") from None
+                answers = yaml.safe_load(script)
+            else:
+                answers = json.load(script)
+
+        return cls(answers, echo)
+
+    def answer(self, key, question):
+        return _answer_text(self._next(key, question))
+
+    def confirm(self, key, question, accept="yes"):
+        answer = self._next(key, question)
+        if isinstance(answer, bool):
+            return answer
+        return answer.strip().lower() == accept
+
+    def _next(self, key, question):
+        if isinstance(self._answers, dict):
+            if key not in self._answers:
+                raise EOFError(f"no scripted answer for {key!r}")
+            answer = self._answers[key]
+        else:
+            answer = self._answers
+
+        if not isinstance(answer, (str, bool)):
+            answer = next(answer, None)
+            if answer is None:
+                raise EOFError(f"scripted answers exhausted at {key!r}")
+
+        if self.echo:
+            print(f"{question}{_answer_text(answer)}")
+        return answer
+
+
+def _scripted(answer):
+    return answer if isinstance(answer, bool) else str(answer)
+
+
+def _answer_text(answer):
+    if isinstance(answer, bool):
+        return "yes" if answer else "no"
+    return answer
+
+
+class PolicyDecisions(DecisionProvider):
+    """
+    Answers questions from a fixed policy: every launch stage and mission is approved, a declined
+    afterburner is retried up to a limit, missions are named after their number and the session stops
+    after a number of missions.
+
+    Attributes:
+        retries (int): The number of afterburner retries approved.
+        missions (int): The number of missions to run before declining another one.
+        overrides (dict): Decision keys mapped to a fixed "yes" or "no".
+    """
+
+    def __init__(self, retries=0, missions=1, overrides=None, echo=False):
+        """
+        Initializes a new PolicyDecisions object.
+
+        Args:
+            retries (int): The number of afterburner retries approved (default: 0).
+            missions (int): The number of missions to run before declining another one (default: 1).
+            overrides (dict): Decision keys mapped to a fixed "yes" or "no", e.g. {"engage_afterburner": "no"}
+                (default: None).
+            echo (bool): Whether announcements are printed (default: False).
+        """
+        super().__init__(echo)
+        self.retries = retries
+        self.missions = missions
+        self.overrides = overrides or {}
+        self._retried = 0
+        self._named = 0
+        self._started = 1
+
+    def answer(self, key, question):
+        if key == "mission_name":
+            self._named += 1
+            return f"Mission {self._named}"
+        return "yes" if self._decide(key) else "no"
+
+    def confirm(self, key, question, accept="yes"):
+        return self._decide(key)
+
+    def _decide(self, key):
+        if key in self.overrides:
+            return self.overrides[key] == "yes"
+
+        if key == "retry_afterburner":
+            self._retried += 1
+            return self._retried <= self.retries
+
+        if key == "another_mission":
+            self._started += 1
+            return self._started <= self.missions
+
+        return True
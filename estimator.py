@@ -0,0 +1,296 @@
+import argparse
+import math
+import random
+from collections import namedtuple
+from statistics import NormalDist
+
+from decisions import PolicyDecisions
+from mission import Mission
+
+# LaunchControl.abort_and_retry aborts when randint(0, 2) draws 0, so the abort rate of an approved launch
+# is known exactly and the abort indicator can serve as a control variate for the other outcomes.
+ABORT_PROBABILITY = 1 / 3
+
+# The outcome rates the README specifies, reported next to the estimates.
+SPECIFIED_RATES = {"abort_rate": 1 / 3, "explosion_rate": 1 / 5}
+
+OUTCOMES = ("abort_rate", "explosion_rate", "mean_distance", "mean_fuel")
+RATES = ("abort_rate", "explosion_rate")
+
+Estimate = namedtuple("Estimate", "value low high")
+
+
+class AntitheticRandom(random.Random):
+    """
+    Mirrors every draw of a random.Random with the same seed: random() returns the opposite point of the
+    unit interval and randint, randrange and choice return the opposite end of their range. A mission flown
+    with both generators gives two samples of the same distribution that are negatively correlated, so
+    their average varies less than the average of two independent missions.
+    """
+
+    # The largest value random() can return; mirroring around it keeps the results in [0, 1).
+    _TOP = math.nextafter(1.0, 0.0)
+
+    def random(self):
+        return self._TOP - super().random()
+
+    def _randbelow(self, n):
+        return n - 1 - super()._randbelow(n)
+
+
+class _Moments:
+    """
+    Running sums of an outcome and of the control variate, enough to estimate the outcome mean with or
+    without the control variate.
+    """
+
+    __slots__ = ("count", "y", "c", "yy", "cc", "yc")
+
+    def __init__(self):
+        self.count = 0
+        self.y = self.c = self.yy = self.cc = self.yc = 0.0
+
+    def add(self, y, c):
+        self.count += 1
+        self.y += y
+        self.c += c
+        self.yy += y * y
+        self.cc += c * c
+        self.yc += y * c
+
+    def estimate(self, control_mean=None):
+        """
+        Estimates the mean of the outcome and the variance of that estimate. With a control mean, the
+        outcome is regressed on the control variate and corrected by the deviation of the control from its
+        known mean, which removes the part of the variance the two share.
+        """
+        n = self.count
+        mean = self.y / n
+        syy = max(self.yy - self.y * self.y / n, 0.0)
+        if control_mean is None or n < 3:
+            return mean, syy / (n - 1) / n if n > 1 else math.inf
+
+        scc = self.cc - self.c * self.c / n
+        if scc <= 0:
+            return mean, syy / (n - 1) / n
+        syc = self.yc - self.y * self.c / n
+        beta = syc / scc
+        residual = max(syy - beta * syc, 0.0)
+        return mean - beta * (self.c / n - control_mean), residual / (n - 2) / n
+
+
+class OutcomeEstimator:
+    """
+    Estimates the outcome rates and mean results of non-interactive missions by running them in batches
+    until every confidence interval is narrower than its target width.
+
+    Two variance reduction techniques cut the number of missions needed:
+        - antithetic pairs: every seed is flown twice, once with the mirrored draws of AntitheticRandom, and
+          the pair average is the sample;
+        - a control variate: the abort indicator, whose mean ABORT_PROBABILITY is known, corrects the
+          explosion rate, mean distance and mean fuel for the sampling noise of the abort draw.
+    The abort rate itself is estimated without the control variate, so it still checks LaunchControl.
+
+    Attributes:
+        parameters (dict): The Mission keyword arguments, e.g. travel_distance or burn_rate.
+        random_seed (int): The seed of the first mission; mission n uses random_seed + n.
+        confidence (float): The confidence level of the intervals.
+        rate_width (float): The target interval width of the rates.
+        mean_width (float): The target interval width of the means, relative to the mean.
+        batch_size (int): The number of missions run between two convergence checks.
+        max_missions (int): The number of missions after which the estimator stops unconverged.
+        antithetic (bool): Whether missions are flown in antithetic pairs.
+        control_variate (bool): Whether the abort indicator is used as a control variate.
+        missions (int): The number of missions run so far.
+
+    Methods:
+        run_batch(): Runs a batch of missions.
+        estimates(): Calculates the current estimates and their confidence intervals.
+        converged(estimates): Checks if every interval is narrower than its target.
+        run(): Runs batches until convergence and reports the estimates.
+    """
+
+    def __init__(
+        self,
+        parameters=None,
+        random_seed=12,
+        confidence=0.95,
+        rate_width=0.01,
+        mean_width=0.01,
+        batch_size=1000,
+        max_missions=1000000,
+        antithetic=True,
+        control_variate=True,
+    ):
+        """
+        Initializes a new OutcomeEstimator object.
+
+        Args:
+            parameters (dict): The Mission keyword arguments (default: None, the Mission defaults).
+            random_seed (int): The seed of the first mission (default: 12).
+            confidence (float): The confidence level of the intervals (default: 0.95).
+            rate_width (float): The target interval width of the rates (default: 0.01).
+            mean_width (float): The target interval width of the means, relative to the mean (default: 0.01).
+            batch_size (int): The number of missions run between two convergence checks (default: 1000).
+            max_missions (int): The number of missions after which the estimator stops (default: 1000000).
+            antithetic (bool): Whether missions are flown in antithetic pairs (default: True).
+            control_variate (bool): Whether the abort indicator is used as a control variate (default: True).
+        """
+        self.parameters = dict(parameters or {})
+        self.random_seed = random_seed
+        self.confidence = confidence
+        self.rate_width = rate_width
+        self.mean_width = mean_width
+        self.batch_size = batch_size
+        self.max_missions = max_missions
+        self.antithetic = antithetic
+        self.control_variate = control_variate
+        self.missions = 0
+        self._z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self._samples = {outcome: _Moments() for outcome in OUTCOMES}
+        self._plain = {outcome: _Moments() for outcome in OUTCOMES}
+        self._seed = random_seed
+
+    def run_batch(self):
+        """
+        Runs a batch of missions, or of antithetic mission pairs, and adds them to the estimates.
+        """
+        stop = min(self.missions + self.batch_size, self.max_missions)
+        while self.missions < stop:
+            seed = self._seed
+            self._seed += 1
+            outcomes = self._fly(seed, random.Random(seed))
+            if self.antithetic:
+                mirrored = self._fly(seed, AntitheticRandom(seed))
+                outcomes = [(value + other) / 2 for value, other in zip(outcomes, mirrored)]
+
+            control = outcomes[0]
+            for outcome, value in zip(OUTCOMES, outcomes):
+                self._samples[outcome].add(value, control)
+
+    def estimates(self):
+        """
+        Calculates the current estimates and their confidence intervals.
+
+        Returns:
+            dict: The outcome names mapped to an Estimate with the value and the interval bounds.
+        """
+        estimates = {}
+        for outcome, moments in self._samples.items():
+            control_mean = ABORT_PROBABILITY if self.control_variate and outcome != "abort_rate" else None
+            value, variance = moments.estimate(control_mean)
+            half_width = self._z * math.sqrt(variance)
+            estimates[outcome] = Estimate(value, value - half_width, value + half_width)
+        return estimates
+
+    def converged(self, estimates):
+        """
+        Checks if every confidence interval is narrower than its target width.
+
+        Args:
+            estimates (dict): The estimates as returned by estimates().
+
+        Returns:
+            bool: True if every interval is narrow enough, False otherwise.
+        """
+        for outcome, estimate in estimates.items():
+            target = self.rate_width if outcome in RATES else self.mean_width * abs(estimate.value)
+            if estimate.high - estimate.low > target:
+                return False
+        return True
+
+    def run(self):
+        """
+        Runs batches of missions until every confidence interval is narrower than its target width, or until
+        max_missions missions have been run.
+
+        Returns:
+            dict: The number of missions run, whether the estimates converged, the estimates, and for every
+                outcome the number of independent missions that would have reached the same interval width.
+        """
+        while True:
+            self.run_batch()
+            estimates = self.estimates()
+            converged = self.converged(estimates)
+            if converged or self.missions >= self.max_missions:
+                break
+
+        return {
+            "missions": self.missions,
+            "converged": converged,
+            "estimates": estimates,
+            "independent_missions": self.independent_missions(estimates),
+        }
+
+    def independent_missions(self, estimates):
+        """
+        Calculates how many independent missions, without variance reduction, would reach the interval
+        widths of the estimates.
+
+        Args:
+            estimates (dict): The estimates as returned by estimates().
+
+        Returns:
+            dict: The outcome names mapped to a number of missions.
+        """
+        needed = {}
+        for outcome, estimate in estimates.items():
+            _, variance = self._plain[outcome].estimate()
+            width = estimate.high - estimate.low
+            if width <= 0 or math.isinf(variance):
+                needed[outcome] = self.missions
+                continue
+            per_mission = variance * self._plain[outcome].count
+            needed[outcome] = math.ceil(per_mission * (2 * self._z / width) ** 2)
+        return needed
+
+    def _fly(self, seed, rng):
+        mission = Mission(random_seed=seed, decisions=PolicyDecisions(), **self.parameters)
+        summary = mission.simulate(rng=rng)
+        self.missions += 1
+
+        outcomes = (
+            1.0 if summary["no_abort_retries"] else 0.0,
+            float(summary["no_explosions"]),
+            summary["total_distance"],
+            summary["total_fuel_burned"],
+        )
+        for outcome, value in zip(OUTCOMES, outcomes):
+            self._plain[outcome].add(value, 0.0)
+        return outcomes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estimate mission outcome rates with confidence intervals.")
+    parser.add_argument("--seed", type=int, default=12, help="seed of the first mission (default: 12)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level (default: 0.95)")
+    parser.add_argument("--rate-width", type=float, default=0.01, help="target width of the rate intervals")
+    parser.add_argument("--mean-width", type=float, default=0.01, help="target relative width of the mean intervals")
+    parser.add_argument("--batch-size", type=int, default=1000, help="missions between convergence checks")
+    parser.add_argument("--max-missions", type=int, default=1000000, help="missions after which to stop")
+    parser.add_argument("--no-antithetic", action="store_true", help="fly independent missions only")
+    parser.add_argument("--no-control-variate", action="store_true", help="do not correct for the abort draw")
+    args = parser.parse_args()
+
+    estimator = OutcomeEstimator(
+        random_seed=args.seed,
+        confidence=args.confidence,
+        rate_width=args.rate_width,
+        mean_width=args.mean_width,
+        batch_size=args.batch_size,
+        max_missions=args.max_missions,
+        antithetic=not args.no_antithetic,
+        control_variate=not args.no_control_variate,
+    )
+    report = estimator.run()
+
+    label = f"{args.confidence:.0%} interval"
+    print(f"{'Outcome':<16} {'Estimate':>14} {label:>30} {'Specified':>10} {'Independent':>12}")
+    for outcome, estimate in report["estimates"].items():
+        specified = SPECIFIED_RATES.get(outcome)
+        print(
+            f"{outcome:<16} {estimate.value:>14.4f} {f'[{estimate.low:.4f}, {estimate.high:.4f}]':>30} "
+            f"{'' if specified is None else f'{specified:.4f}':>10} {report['independent_missions'][outcome]:>12,}"
+        )
+    status = "converged" if report["converged"] else "did not converge"
+    print(f"Missions: {report['missions']:,} ({status})")
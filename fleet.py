@@ -0,0 +1,165 @@
+import argparse
+import time
+
+import numpy as np
+
+from mission import Mission
+from rocket import Rocket
+
+
+class FleetSimulator:
+    """
+    Simulates a whole fleet of identical, non-interactive missions at once using NumPy arrays.
+
+    Every rocket in the fleet follows the same deterministic trajectory as Rocket.launch; only the
+    random draws made by LaunchControl differ between missions. The simulator therefore computes the
+    trajectory once and resolves the random draws for the whole fleet as array operations.
+
+    Attributes:
+        distance (float): The total distance each rocket needs to travel.
+        burn_rate (float): The fuel burn rate of each rocket in liters per minute.
+        average_speed (float): The average speed of each rocket in kilometers per hour.
+        rng (numpy.random.Generator): The random generator used for the fleet draws.
+        chunk_size (int): The maximum number of random draws held in memory at once.
+        last_run_time (float): The wall-clock duration of the last run in seconds.
+
+    Methods:
+        from_mission(mission, seed): Creates a simulator using the parameters of a Mission.
+        flight_profile(): Calculates the distance traveled after each tick of a full flight.
+        run(fleet_size): Simulates the fleet and returns the per-mission summaries as arrays.
+        missions_per_second(fleet_size): Calculates the throughput of the last run.
+    """
+
+    def __init__(self, distance, burn_rate, average_speed, seed=None, chunk_size=1 << 22):
+        """
+        Initializes a new FleetSimulator object with provided parameters.
+
+        Args:
+            distance (float): The total distance each rocket needs to travel.
+            burn_rate (float): The fuel burn rate of each rocket in liters per minute.
+            average_speed (float): The average speed of each rocket in kilometers per hour.
+            seed (int): The seed of the fleet random generator (default: None).
+            chunk_size (int): The maximum number of random draws held in memory at once.
+        """
+        self.distance = distance
+        self.burn_rate = burn_rate
+        self.average_speed = average_speed
+        self.rng = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+        self.last_run_time = None
+
+    @classmethod
+    def from_mission(cls, mission, seed=None):
+        """
+        Creates a new FleetSimulator using the parameters of a Mission.
+
+        Args:
+            mission (Mission): The mission whose parameters every rocket in the fleet uses.
+            seed (int): The seed of the fleet random generator (default: the mission random seed).
+
+        Returns:
+            FleetSimulator: A new instance of the FleetSimulator class.
+        """
+        return cls(
+            distance=mission.travel_distance,
+            burn_rate=mission.burn_rate,
+            average_speed=mission.average_speed,
+            seed=mission.random_seed if seed is None else seed,
+        )
+
+    def flight_profile(self):
+        """
+        Calculates the distance traveled after each tick of a full flight by stepping a Rocket
+        through the same calculations Rocket.launch performs, without waiting between ticks.
+
+        Returns:
+            numpy.ndarray: The distance traveled after 0, 1, ..., n ticks, where n is the arrival tick.
+        """
+        rocket = Rocket(self.distance, self.burn_rate, self.average_speed)
+        distances = [rocket.distance_traveled]
+
+        while not rocket.reached_destination():
+            rocket.elapsed_time += 1
+            rocket.distance_traveled += rocket.calculate_distance_traveled()
+            distances.append(rocket.distance_traveled)
+
+        return np.array(distances, dtype=np.float64)
+
+    def run(self, fleet_size):
+        """
+        Simulates the fleet and returns the per-mission summaries as arrays.
+
+        Every stage of a headless fleet is approved, so the only abort is the LaunchControl.abort_and_retry
+        draw at launch, after which the rocket stays on the ground. Before every tick Rocket.launch compares
+        a fresh LaunchControl.rand_launch_iteration draw with the elapsed time and explodes on a match; the
+        summary then flips LaunchControl.explode, which is always False for an aborted launch. All of these
+        are reproduced here with the same value ranges, so the outcome distributions match the scalar path.
+
+        Args:
+            fleet_size (int): The number of missions to simulate.
+
+        Returns:
+            dict: The keys of Rocket.summary mapped to arrays holding one value per mission.
+        """
+        started_at = time.perf_counter()
+
+        profile = self.flight_profile()
+        arrival_tick = len(profile) - 1
+        total_iterations = (self.distance / (self.average_speed / 60)).__ceil__()
+        if total_iterations < 2:
+            raise ValueError(f"empty range for explosion iteration (0, {total_iterations - 2})")
+
+        aborted = self.rng.integers(0, 3, size=fleet_size) == 0
+        elapsed_time = np.full(fleet_size, arrival_tick, dtype=np.int64)
+        ticks = np.arange(arrival_tick)
+        rows_per_chunk = max(1, self.chunk_size // max(1, arrival_tick))
+
+        for start in range(0, fleet_size if arrival_tick else 0, rows_per_chunk):
+            stop = min(fleet_size, start + rows_per_chunk)
+            draws = self.rng.integers(0, total_iterations - 1, size=(stop - start, arrival_tick))
+            hits = draws == ticks
+            exploded = hits.any(axis=1)
+            elapsed_time[start:stop][exploded] = hits[exploded].argmax(axis=1)
+        elapsed_time[aborted] = 0
+
+        summary = {
+            "total_distance": profile[elapsed_time],
+            "no_abort_retries": aborted.astype(np.int64),
+            "no_explosions": ((self.rng.integers(0, 2, size=fleet_size) == 0) & ~aborted).astype(np.int64),
+            "total_fuel_burned": (self.burn_rate * elapsed_time) / 60,
+            "flight_time": elapsed_time.astype(np.float64),
+        }
+
+        self.last_run_time = time.perf_counter() - started_at
+        return summary
+
+    def missions_per_second(self, fleet_size):
+        """
+        Calculates the throughput of the last run.
+
+        Args:
+            fleet_size (int): The number of missions simulated in the last run.
+
+        Returns:
+            float: The number of missions simulated per second of wall-clock time.
+        """
+        if not self.last_run_time:
+            return float("inf")
+        return fleet_size / self.last_run_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a fleet of missions with NumPy.")
+    parser.add_argument("--missions", type=int, default=100000, help="number of missions to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the fleet random generator")
+    args = parser.parse_args()
+
+    simulator = FleetSimulator.from_mission(Mission(), seed=args.seed)
+    results = simulator.run(args.missions)
+
+    print(f"Simulated {args.missions} missions in {simulator.last_run_time:.3f} s")
+    print(f"  Throughput: {simulator.missions_per_second(args.missions):,.0f} missions/s")
+    print(f"  Mean distance traveled: {results['total_distance'].mean():.2f} km")
+    print(f"  Mean fuel burned: {results['total_fuel_burned'].mean():.2f} liters")
+    print(f"  Abort rate: {results['no_abort_retries'].mean():.4f}")
+    print(f"  Explosion rate: {results['no_explosions'].mean():.4f}")
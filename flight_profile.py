@@ -0,0 +1,258 @@
+import atexit
+import hashlib
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+# Layout of a profile table: a magic tag, the flight parameters and the arrival tick, followed by one column
+# per trajectory value with an entry for every tick from launch to arrival: the distance traveled and the
+# fuel burned as doubles, and the time to destination as 64-bit integers. A shared table gets its magic tag
+# last, so a process attaching while the table is being written sees no tag and computes the table itself.
+PROFILE_MAGIC = b"FPR1"
+PROFILE_HEADER = struct.Struct("<4s4xdddq")
+COLUMNS = (("distance_traveled", "d"), ("total_fuel_burned", "d"), ("time_to_destination", "q"))
+
+
+def segment_name(distance, burn_rate, average_speed):
+    """
+    Derives the name of the shared memory segment holding the profile of a configuration, so every process
+    finds the table of a configuration without being told where it is.
+
+    Args:
+        distance (float): The total distance the rocket needs to travel.
+        burn_rate (float): The fuel burn rate of the rocket in liters per minute.
+        average_speed (float): The average speed of the rocket in kilometers per hour.
+
+    Returns:
+        str: The segment name.
+    """
+    key = struct.pack("<ddd", distance, burn_rate, average_speed)
+    return f"flight-profile-{hashlib.blake2b(key, digest_size=8).hexdigest()}"
+
+
+def attach_segment(name):
+    """
+    Attaches to a shared memory segment created by another process without registering it with the resource
+    tracker of this process, which would remove the segment when this process exits. The creator removes it.
+
+    Args:
+        name (str): The segment name.
+
+    Returns:
+        SharedMemory: The segment.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Before Python 3.13, attaching always registers the segment. Unregistering it afterwards is not enough:
+    # forked workers share the tracker of their parent, and would remove the registration of the creator.
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class FlightProfile:
+    """
+    The trajectory of a flight configuration, computed once into an immutable table.
+
+    The trajectory only depends on the distance, burn rate and average speed; missions of the same
+    configuration only differ in the tick at which they explode, if they do. The table holds the values
+    Rocket.launch reaches after every tick, accumulated in the same order, so a rocket can jump to any tick
+    with a single lookup. The columns are memoryviews over the buffer of the table, which can be a shared
+    memory segment read by every worker process.
+
+    Attributes:
+        distance (float): The total distance the rocket needs to travel.
+        burn_rate (float): The fuel burn rate of the rocket in liters per minute.
+        average_speed (float): The average speed of the rocket in kilometers per hour.
+        arrival (int): The tick at which the rocket reaches its destination.
+        distance_traveled (memoryview): The distance traveled after every tick.
+        total_fuel_burned (memoryview): The fuel burned after every tick.
+        time_to_destination (memoryview): The estimated time remaining after every tick.
+
+    Methods:
+        compute(distance, burn_rate, average_speed): Computes the table of a configuration.
+        release(): Releases the views over the table.
+    """
+
+    def __init__(self, buffer):
+        """
+        Initializes a new FlightProfile object over a table.
+
+        Args:
+            buffer (bytes-like): The table, as returned by compute.
+        """
+        magic, self.distance, self.burn_rate, self.average_speed, self.arrival = PROFILE_HEADER.unpack_from(buffer)
+        if magic != PROFILE_MAGIC:
+            raise ValueError("not a flight profile table")
+
+        table = memoryview(buffer)
+        self._views = [table, table.toreadonly()]
+        offset = PROFILE_HEADER.size
+        size = 8 * (self.arrival + 1)
+        for name, typecode in COLUMNS:
+            column = self._views[1][offset:offset + size]
+            self._views.append(column)
+            self._views.append(column.cast(typecode))
+            setattr(self, name, self._views[-1])
+            offset += size
+
+    def release(self):
+        """
+        Releases the views over the table, which a shared memory segment needs before it can be closed. The
+        profile cannot be read afterwards.
+        """
+        for view in reversed(self._views):
+            view.release()
+
+    @staticmethod
+    def compute(distance, burn_rate, average_speed):
+        """
+        Computes the table of a configuration by stepping through the flight once, with the arithmetic of
+        Rocket.calculate_distance_traveled, calculate_total_fuel_burned and calculate_time_to_destination.
+
+        Args:
+            distance (float): The total distance the rocket needs to travel.
+            burn_rate (float): The fuel burn rate of the rocket in liters per minute.
+            average_speed (float): The average speed of the rocket in kilometers per hour.
+
+        Returns:
+            bytearray: The table.
+        """
+        current_speed = average_speed / 60
+        distances, fuel, remaining = [0], [0], [int(distance / average_speed)]
+        distance_traveled = 0
+        elapsed_time = 0
+        while distance_traveled < distance:
+            elapsed_time += 1
+            distance_traveled += current_speed * elapsed_time
+            distances.append(distance_traveled)
+            fuel.append((burn_rate * elapsed_time) / 60)
+            remaining.append(int((distance - distance_traveled) / average_speed))
+
+        ticks = len(distances)
+        return bytearray(
+            PROFILE_HEADER.pack(PROFILE_MAGIC, distance, burn_rate, average_speed, elapsed_time)
+            + struct.pack(f"<{ticks}d", *distances)
+            + struct.pack(f"<{ticks}d", *fuel)
+            + struct.pack(f"<{ticks}q", *remaining)
+        )
+
+
+class ProfileCache:
+    """
+    Resolves flight configurations to their FlightProfile, computing every table at most once per process.
+
+    A process running missions in a pool shares the tables of the configurations it is about to run; the
+    workers then attach to the shared segments by name instead of computing the tables themselves. A
+    configuration that has not been shared is computed into private memory.
+
+    Attributes:
+        shared (dict): The configurations shared by this process, mapped to their segment.
+
+    Methods:
+        get(distance, burn_rate, average_speed): Retrieves the profile of a configuration.
+        share(distance, burn_rate, average_speed): Publishes the profile of a configuration in shared memory.
+        close(): Releases the profiles, removing the segments shared by this process.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new, empty ProfileCache object.
+        """
+        self.shared = {}
+        self._profiles = {}
+        self._attached = []
+        atexit.register(self.close)
+
+    def get(self, distance, burn_rate, average_speed):
+        """
+        Retrieves the profile of a configuration: from the process cache, from a segment shared by another
+        process, or by computing it.
+
+        Args:
+            distance (float): The total distance the rocket needs to travel.
+            burn_rate (float): The fuel burn rate of the rocket in liters per minute.
+            average_speed (float): The average speed of the rocket in kilometers per hour.
+
+        Returns:
+            FlightProfile: The profile.
+        """
+        key = (distance, burn_rate, average_speed)
+        profile = self._profiles.get(key)
+        if profile is not None:
+            return profile
+
+        try:
+            segment = attach_segment(segment_name(*key))
+        except (FileNotFoundError, ValueError):
+            # Not shared, or shared but still empty.
+            segment = None
+        if segment is not None:
+            try:
+                profile = FlightProfile(segment.buf)
+            except ValueError:
+                # The table is still being written.
+                segment.close()
+            else:
+                self._attached.append(segment)
+                self._profiles[key] = profile
+                return profile
+
+        profile = FlightProfile(bytes(FlightProfile.compute(*key)))
+        self._profiles[key] = profile
+        return profile
+
+    def share(self, distance, burn_rate, average_speed):
+        """
+        Publishes the profile of a configuration in shared memory, unless this process already did.
+
+        Args:
+            distance (float): The total distance the rocket needs to travel.
+            burn_rate (float): The fuel burn rate of the rocket in liters per minute.
+            average_speed (float): The average speed of the rocket in kilometers per hour.
+
+        Returns:
+            FlightProfile: The profile, read from the segment.
+        """
+        key = (distance, burn_rate, average_speed)
+        if key not in self.shared:
+            table = FlightProfile.compute(*key)
+            try:
+                segment = shared_memory.SharedMemory(name=segment_name(*key), create=True, size=len(table))
+            except FileExistsError:
+                # Another session already shares this configuration.
+                return self.get(*key)
+            segment.buf[len(PROFILE_MAGIC):len(table)] = table[len(PROFILE_MAGIC):]
+            segment.buf[:len(PROFILE_MAGIC)] = PROFILE_MAGIC
+            self.shared[key] = segment
+            self._profiles[key] = FlightProfile(segment.buf)
+        return self._profiles[key]
+
+    def close(self):
+        """
+        Releases the profiles, removing the segments shared by this process. Runs when the process exits;
+        rockets still holding a profile cannot read it afterwards.
+        """
+        for profile in self._profiles.values():
+            profile.release()
+        self._profiles.clear()
+        for segment in self._attached:
+            segment.close()
+        for segment in self.shared.values():
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                # Removed from outside, e.g. by hand; the tracker still expects it.
+                resource_tracker.unregister(segment._name, "shared_memory")
+        self._attached.clear()
+        self.shared.clear()
+
+
+# The profiles of the current process, used by Rocket.
+profiles = ProfileCache()
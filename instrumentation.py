@@ -0,0 +1,314 @@
+import atexit
+import bisect
+import functools
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# Upper bounds of the latency histogram buckets in seconds, from a microsecond to a minute.
+BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_registry = None
+
+
+class Histogram:
+    """
+    Counts observed durations in fixed latency buckets.
+
+    Attributes:
+        counts (list): The number of observations per bucket, with a last bucket for larger values.
+        total (float): The sum of the observed durations.
+        count (int): The number of observations.
+
+    Methods:
+        observe(seconds): Adds an observed duration.
+        merge(other): Adds the observations of another histogram.
+        cumulative(): Retrieves the cumulative bucket counts, as Prometheus expects them.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new Histogram object with no observations.
+        """
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        """
+        Adds an observed duration.
+
+        Args:
+            seconds (float): The duration in seconds.
+        """
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def merge(self, other):
+        """
+        Adds the observations of another histogram.
+
+        Args:
+            other (Histogram): The histogram to add.
+        """
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.count += other.count
+
+    def cumulative(self):
+        """
+        Retrieves the cumulative bucket counts, as Prometheus expects them.
+
+        Returns:
+            list: (upper bound, count) pairs, ending with ("+Inf", count).
+        """
+        pairs = []
+        running = 0
+        for bound, count in zip((*BUCKETS, "+Inf"), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+class MetricsRegistry:
+    """
+    Collects the counters and latency histograms emitted by the instrumented code.
+
+    Attributes:
+        counters (dict): Event names mapped to the number of times they happened.
+        histograms (dict): Span names mapped to a Histogram of their durations.
+
+    Methods:
+        count(name, amount): Increments a counter.
+        observe(name, seconds): Records the duration of a span.
+        span(name): Context manager recording the duration of its block.
+        merge(other): Adds the metrics of another registry, e.g. one sent back by a worker process.
+        snapshot(): Retrieves the metrics as a JSON-serializable dict.
+        to_prometheus(): Renders the metrics in the Prometheus text exposition format.
+        write(path): Writes the metrics to a .json snapshot or a Prometheus text file.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new MetricsRegistry object with no metrics.
+        """
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name, amount=1):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): The name of the event.
+            amount (int): The increment (default: 1).
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        """
+        Records the duration of a span.
+
+        Args:
+            name (str): The name of the span.
+            seconds (float): The duration in seconds.
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def merge(self, other):
+        """
+        Adds the counters and histograms of another registry.
+
+        Args:
+            other (MetricsRegistry): The registry to add.
+        """
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        for name, histogram in other.histograms.items():
+            merged = self.histograms.get(name)
+            if merged is None:
+                merged = self.histograms[name] = Histogram()
+            merged.merge(histogram)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Context manager recording the duration of its block.
+
+        Args:
+            name (str): The name of the span.
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started_at)
+
+    def snapshot(self):
+        """
+        Retrieves the metrics as a JSON-serializable dict.
+
+        Returns:
+            dict: The counters, and per span the count, sum, mean and bucket counts.
+        """
+        spans = {}
+        for name, histogram in sorted(self.histograms.items()):
+            spans[name] = {
+                "count": histogram.count,
+                "sum": histogram.total,
+                "mean": histogram.total / histogram.count if histogram.count else 0.0,
+                "buckets": {str(bound): count for bound, count in histogram.cumulative()},
+            }
+        return {"counters": dict(sorted(self.counters.items())), "spans": spans}
+
+    def to_prometheus(self):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics text.
+        """
+        lines = ["# TYPE mission_control_events_total counter"]
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'mission_control_events_total{{event="{name}"}} {value}')
+
+        lines.append("# TYPE mission_control_span_seconds histogram")
+        for name, histogram in sorted(self.histograms.items()):
+            for bound, count in histogram.cumulative():
+                lines.append(f'mission_control_span_seconds_bucket{{span="{name}",le="{bound}"}} {count}')
+            lines.append(f'mission_control_span_seconds_sum{{span="{name}"}} {histogram.total}')
+            lines.append(f'mission_control_span_seconds_count{{span="{name}"}} {histogram.count}')
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Writes the metrics to a JSON snapshot if the path ends in .json, or to a Prometheus text file otherwise.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        with open(path, "w") as metrics_file:
+            if path.endswith(".json"):
+                json.dump(self.snapshot(), metrics_file, indent=2)
+            else:
+                metrics_file.write(self.to_prometheus())
+
+
+def enable():
+    """
+    Turns instrumentation on, keeping the current registry if there is one.
+
+    Returns:
+        MetricsRegistry: The active registry.
+    """
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def disable():
+    """
+    Turns instrumentation off and drops the active registry.
+    """
+    global _registry
+    _registry = None
+
+
+def active():
+    """
+    Retrieves the active registry. Hot loops call this once and then only test the result for None, so
+    disabled instrumentation costs a single comparison per iteration.
+
+    Returns:
+        MetricsRegistry: The active registry, or None if instrumentation is disabled.
+    """
+    return _registry
+
+
+@contextmanager
+def collect():
+    """
+    Records the metrics of a block into a fresh registry, whether instrumentation is enabled or not, and
+    restores the active registry afterwards. Worker processes use it to send the metrics of their work
+    back to the parent, which merges them, since a registry only covers its own process.
+
+    Yields:
+        MetricsRegistry: The registry of the block.
+    """
+    global _registry
+    previous = _registry
+    _registry = MetricsRegistry()
+    try:
+        yield _registry
+    finally:
+        _registry = previous
+
+
+def instrumented(name):
+    """
+    Decorator recording the duration of every call of a function, or coroutine function, as a span.
+
+    Args:
+        name (str): The name of the span.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorate(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                if _registry is None:
+                    return await function(*args, **kwargs)
+                started_at = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    if _registry is not None:
+                        _registry.observe(name, time.perf_counter() - started_at)
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if _registry is None:
+                    return function(*args, **kwargs)
+                started_at = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    if _registry is not None:
+                        _registry.observe(name, time.perf_counter() - started_at)
+
+        return wrapper
+
+    return decorate
+
+
+def count(name, amount=1):
+    """
+    Increments a counter of the active registry, if instrumentation is enabled.
+
+    Args:
+        name (str): The name of the event.
+        amount (int): The increment (default: 1).
+    """
+    if _registry is not None:
+        _registry.count(name, amount)
+
+
+# Setting MISSION_CONTROL_METRICS to a file path enables instrumentation for the whole process and writes
+# the metrics there on exit, as JSON for a .json path and in the Prometheus text format otherwise. Worker
+# processes never write it: they exit without running atexit handlers, and MissionControl.run_missions
+# merges their metrics into those of the parent instead.
+if os.environ.get("MISSION_CONTROL_METRICS"):
+    atexit.register(enable().write, os.environ["MISSION_CONTROL_METRICS"])
@@ -1,35 +1,71 @@
+import math
 import random
 
+import instrumentation
+import launch_sequence
+from decisions import InteractiveDecisions
+from instrumentation import instrumented
+from launch_sequence import AFTERBURNER, CROSS_CHECKS, LAUNCH, LAUNCHED, PREPARED, RELEASE_STRUCTURE, STAGE_ENDS
+
 
 class LaunchControl:
     """
     Manages the launch process and control for a space mission.
 
+    The launch stages run through the transition table of launch_sequence, which holds the stage order and
+    the abort and retry edges; the methods below run the part of the sequence they are named after. Every
+    transition is timed by launch_sequence as a stage.<state> span, e.g. stage.afterburner.
+
     Attributes:
+        rng (random.Random): The random number generator used for the launch decisions.
+        decisions (DecisionProvider): Answers the stage questions and receives the stage announcements.
         aborted (bool): Indicates if the launch has been aborted.
         abort_count (int): The number of times the launch has been aborted and retried.
         explode_result (bool): Indicates the result of the explosion check.
+        state (int): The current state of the launch sequence, one of the launch_sequence states.
 
     Methods:
         prepare_for_launch(): Performs pre-launch checks and preparations.
+        prepare_for_launch_async(): Performs pre-launch checks and preparations with awaitable decisions.
         launch(): Determines if the launch should proceed or be aborted.
+        launch_async(): Determines if the launch should proceed or be aborted with an awaitable decision.
         explode(): Checks if the mission should result in an explosion.
         rand_launch_iteration(distance, current_speed): Generates a random launch iteration based on the distance and current speed.
+        explosion_iteration(distance, current_speed, iterations): Draws the iteration at which the flight explodes, if any.
         abort_and_retry(): Determines if the launch should be aborted and retried.
         abort_launch(): Aborts the launch process and increments the abort count.
+        safe_abort(): Safely aborts the afterburner before it is retried.
         disengage_release_structure(): Checks if the support structures should be released.
         engage_afterburner(): Checks if the afterburner should be engaged.
         perform_cross_checks(): Checks if cross-checks should be performed.
     """
 
-    def __init__(self):
+    def __init__(self, rng=None, decisions=None):
         """
         Initializes a new LaunchControl object with default attributes.
-        """
+
+        Args:
+            rng (random.Random): The random number generator to use (default: the global random module).
+            decisions (DecisionProvider): Answers the stage questions (default: the operator on the terminal).
+        """
+        self.rng = random if rng is None else rng
+        # A generator recording or replaying its draws per call site, e.g. tape.RecordingRandom, binds every
+        # call site once instead of finding it on every draw.
+        bind = getattr(self.rng, "bind", None)
+        if bind is None:
+            self._explode_rng = self._launch_iteration_rng = self._explosion_rng = self._abort_rng = self.rng
+        else:
+            self._explode_rng = bind("explode")
+            self._launch_iteration_rng = bind("rand_launch_iteration")
+            self._explosion_rng = bind("explosion_iteration")
+            self._abort_rng = bind("abort_and_retry")
+        self.decisions = InteractiveDecisions() if decisions is None else decisions
         self.aborted = False
         self.abort_count = 0
         self.explode_result = None
+        self.state = AFTERBURNER
 
+    @instrumented("stage.prepare_for_launch")
     def prepare_for_launch(self):
         """
         Performs pre-launch checks and preparations.
@@ -37,12 +73,35 @@ class LaunchControl:
         Returns:
             bool: True if preparation is successful, False otherwise.
         """
-        if self.engage_afterburner() and self.disengage_release_structure() and self.perform_cross_checks():
-            return True
-        else:
-            self.abort_launch()
+        self.state = AFTERBURNER
+        return launch_sequence.run(self, PREPARED) == LAUNCH
+
+    @instrumented("stage.prepare_for_launch_async")
+    async def prepare_for_launch_async(self):
+        """
+        Performs the same pre-launch checks and preparations as prepare_for_launch, awaiting each
+        decision instead of blocking on it.
+
+        Returns:
+            bool: True if preparation is successful, False otherwise.
+        """
+        self.state = AFTERBURNER
+        return await launch_sequence.run_async(self, PREPARED) == LAUNCH
+
+    async def launch_async(self):
+        """
+        Determines if the launch should proceed or be aborted, awaiting the decision instead of
+        blocking on it.
+
+        Returns:
+            bool: True if the launch proceeds, False otherwise.
+        """
+        if self.aborted:
             return False
 
+        self.state = LAUNCH
+        return await launch_sequence.run_async(self) == LAUNCHED
+
     def launch(self):
         """
         Determines if the launch should proceed or be aborted.
@@ -53,15 +112,8 @@ class LaunchControl:
         if self.aborted:
             return False
 
-        launch_decision = input("Launch? (yes/no): ").strip().lower()
-        if launch_decision == "yes":
-            if self.abort_and_retry() and self.abort_launch():
-                return False
-            else:
-                print("Launched!")
-                return True
-        else:
-            return False
+        self.state = LAUNCH
+        return launch_sequence.run(self) == LAUNCHED
 
     def explode(self):
         """
@@ -76,7 +128,7 @@ class LaunchControl:
         if self.explode_result:
             return self.explode_result
 
-        self.explode_result = random.randint(0, 1) == 0
+        self.explode_result = self._explode_rng.randint(0, 1) == 0
         return self.explode_result
 
     def rand_launch_iteration(self, distance, current_speed):
@@ -91,7 +143,37 @@ class LaunchControl:
             int: A random launch iteration.
         """
         total_iterations = (distance / current_speed).__ceil__()
-        return random.randint(0, total_iterations - 2)
+        return self._launch_iteration_rng.randint(0, total_iterations - 2)
+
+    def explosion_iteration(self, distance, current_speed, iterations):
+        """
+        Draws the iteration at which the flight explodes, if any, in a single step.
+
+        Rocket.launch explodes at iteration n when a fresh rand_launch_iteration draw equals n, which
+        happens with the same probability at every iteration the draw can reach. The first match is
+        therefore geometrically distributed and can be drawn directly from one uniform number.
+
+        Args:
+            distance (float): The total distance the rocket needs to travel.
+            current_speed (float): The current speed of the rocket.
+            iterations (int): The number of iterations the flight lasts without an explosion.
+
+        Returns:
+            int: The iteration at which the flight explodes, or None if it reaches its destination.
+        """
+        total_iterations = (distance / current_speed).__ceil__()
+        if total_iterations < 2:
+            raise ValueError(f"empty range for explosion iteration (0, {total_iterations - 2})")
+
+        probability = 1 / (total_iterations - 1)
+        if probability == 1:
+            iteration = 0
+        else:
+            iteration = int(math.log(1 - self._explosion_rng.random()) / math.log(1 - probability))
+
+        if iteration < min(iterations, total_iterations - 1):
+            return iteration
+        return None
 
     def abort_and_retry(self):
         """
@@ -100,7 +182,10 @@ class LaunchControl:
         Returns:
             bool: True if the launch should be aborted and retried, False otherwise.
         """
-        return random.randint(0, 2) == 0
+        if self._abort_rng.randint(0, 2) == 0:
+            instrumentation.count("abort_and_retry")
+            return True
+        return False
 
     def abort_launch(self):
         """
@@ -109,9 +194,22 @@ class LaunchControl:
         Returns:
             bool: Always returns True.
         """
-        print("Mission aborted!")
+        self.decisions.announce("Mission aborted!")
         self.aborted = True
         self.abort_count += 1
+        instrumentation.count("abort_launch")
+        return True
+
+    def safe_abort(self):
+        """
+        Safely aborts the afterburner before it is retried, which counts as an abort and retry.
+
+        Returns:
+            bool: Always returns True.
+        """
+        self.decisions.announce("Safe Abort!")
+        self.abort_count += 1
+        instrumentation.count("safe_abort")
         return True
 
     def disengage_release_structure(self):
@@ -121,32 +219,18 @@ class LaunchControl:
         Returns:
             bool: True if the support structures are released, False otherwise.
         """
-        release_decision = input("Release support structures? (yes/no): ").strip().lower()
-        if release_decision == "yes":
-            print("Support structures released!")
-            return True
-        else:
-            return False
+        self.state = RELEASE_STRUCTURE
+        return launch_sequence.run(self, STAGE_ENDS[RELEASE_STRUCTURE]) == CROSS_CHECKS
 
     def engage_afterburner(self):
         """
-        Checks if the afterburner should be engaged.
+        Checks if the afterburner should be engaged, asking to retry as long as it is not.
 
         Returns:
             bool: True if the afterburner is engaged, False otherwise.
         """
-        engage_decision = input("Engage afterburner? (yes/no): ").strip().lower()
-        if engage_decision == "yes":
-            print("Afterburner engaged!")
-            return True
-        else:
-            retry_decision = input("Retry? (yes/no): ").strip().lower()
-            if retry_decision == "yes":
-                print("Safe Abort!")
-                self.abort_count += 1
-                return self.engage_afterburner()
-            else:
-                return False
+        self.state = AFTERBURNER
+        return launch_sequence.run(self, STAGE_ENDS[AFTERBURNER]) == RELEASE_STRUCTURE
 
     def perform_cross_checks(self):
         """
@@ -155,9 +239,5 @@ class LaunchControl:
         Returns:
             bool: True if cross-checks are performed, False otherwise.
         """
-        cross_check_decision = input("Perform cross-checks? (yes/no): ").strip().lower()
-        if cross_check_decision == "yes":
-            print("Cross-checks performed!")
-            return True
-        else:
-            return False
+        self.state = CROSS_CHECKS
+        return launch_sequence.run(self, STAGE_ENDS[CROSS_CHECKS]) == LAUNCH
@@ -0,0 +1,194 @@
+import time
+
+import instrumentation
+
+# States of a launch sequence. LAUNCHED, ABORTED and DECLINED end the sequence; ABORT and SAFE_ABORT
+# perform the abort before moving on.
+(
+    AFTERBURNER,
+    RETRY_AFTERBURNER,
+    SAFE_ABORT,
+    RELEASE_STRUCTURE,
+    CROSS_CHECKS,
+    LAUNCH,
+    ABORT_CHECK,
+    ABORT,
+    LAUNCHED,
+    ABORTED,
+    DECLINED,
+) = range(11)
+
+STATE_NAMES = (
+    "afterburner",
+    "retry_afterburner",
+    "safe_abort",
+    "release_structure",
+    "cross_checks",
+    "launch",
+    "abort_check",
+    "abort",
+    "launched",
+    "aborted",
+    "declined",
+)
+FINAL_STATES = frozenset((LAUNCHED, ABORTED, DECLINED))
+
+# Span names of the transitions out of every state, e.g. "stage.afterburner", which time each stage,
+# including its decision and announcement, whichever method runs the sequence.
+SPANS = tuple(f"stage.{name}" for name in STATE_NAMES)
+
+# Stop sets for running part of a sequence, each including the final states. The preparation stops once the
+# launch is next; a single stage stops at the start of the next stage, or before aborting, which is then
+# left to the caller.
+PREPARED = frozenset((LAUNCH,)) | FINAL_STATES
+STAGE_ENDS = {
+    AFTERBURNER: frozenset((RELEASE_STRUCTURE, ABORT)) | FINAL_STATES,
+    RELEASE_STRUCTURE: frozenset((CROSS_CHECKS, ABORT)) | FINAL_STATES,
+    CROSS_CHECKS: frozenset((LAUNCH, ABORT)) | FINAL_STATES,
+}
+
+# How a state is decided: CONFIRM asks the decision provider the question of the state, CALL calls the
+# LaunchControl method named by the key, e.g. the random abort after stage 1, and takes its result.
+CONFIRM, CALL = 0, 1
+
+# The transition table, indexed by state: how the state is decided, the decision key or method, the
+# question, then the next state and announcement if the decision is yes, and if it is no.
+TRANSITIONS = (
+    (CONFIRM, "engage_afterburner", "Engage afterburner? (yes/no): ",
+     RELEASE_STRUCTURE, "Afterburner engaged!", RETRY_AFTERBURNER, None),
+    (CONFIRM, "retry_afterburner", "Retry? (yes/no): ", SAFE_ABORT, None, ABORT, None),
+    (CALL, "safe_abort", None, AFTERBURNER, None, AFTERBURNER, None),
+    (CONFIRM, "release_structure", "Release support structures? (yes/no): ",
+     CROSS_CHECKS, "Support structures released!", ABORT, None),
+    (CONFIRM, "cross_checks", "Perform cross-checks? (yes/no): ", LAUNCH, "Cross-checks performed!", ABORT, None),
+    (CONFIRM, "launch", "Launch? (yes/no): ", ABORT_CHECK, None, DECLINED, None),
+    (CALL, "abort_and_retry", None, ABORT, None, LAUNCHED, "Launched!"),
+    (CALL, "abort_launch", None, ABORTED, None, ABORTED, None),
+)
+
+
+def step(control):
+    """
+    Performs the transition out of the current state of a launch sequence.
+
+    Args:
+        control (LaunchControl): The launch control running the sequence, in a state that is not final.
+
+    Returns:
+        int: The new state.
+    """
+    current = control.state
+    kind, key, question, yes, yes_message, no, no_message = TRANSITIONS[current]
+    registry = instrumentation.active()
+    if registry is not None:
+        started_at = time.perf_counter()
+    try:
+        if kind == CONFIRM:
+            decided = control.decisions.confirm(key, question)
+        else:
+            decided = getattr(control, key)()
+
+        if decided:
+            state, message = yes, yes_message
+        else:
+            state, message = no, no_message
+        if message is not None:
+            control.decisions.announce(message)
+    finally:
+        if registry is not None:
+            registry.observe(SPANS[current], time.perf_counter() - started_at)
+    control.state = state
+    return state
+
+
+async def step_async(control):
+    """
+    Performs the transition out of the current state of a launch sequence like step, awaiting the
+    decision instead of blocking on it.
+
+    Args:
+        control (LaunchControl): The launch control running the sequence, in a state that is not final.
+
+    Returns:
+        int: The new state.
+    """
+    current = control.state
+    kind, key, question, yes, yes_message, no, no_message = TRANSITIONS[current]
+    registry = instrumentation.active()
+    if registry is not None:
+        started_at = time.perf_counter()
+    try:
+        if kind == CONFIRM:
+            decided = await control.decisions.confirm_async(key, question)
+        else:
+            decided = getattr(control, key)()
+
+        if decided:
+            state, message = yes, yes_message
+        else:
+            state, message = no, no_message
+        if message is not None:
+            control.decisions.announce(message)
+    finally:
+        if registry is not None:
+            registry.observe(SPANS[current], time.perf_counter() - started_at)
+    control.state = state
+    return state
+
+
+def run(control, stops=FINAL_STATES):
+    """
+    Runs a launch sequence from its current state until it reaches one of the given states. Retries loop
+    through the table, so the stack depth does not grow with the number of retries.
+
+    Args:
+        control (LaunchControl): The launch control running the sequence.
+        stops (frozenset): The states to stop at, which include FINAL_STATES, e.g. PREPARED (default: the
+            final states).
+
+    Returns:
+        int: The state the sequence stopped at.
+    """
+    state = control.state
+    while state not in stops:
+        state = step(control)
+    return state
+
+
+async def run_async(control, stops=FINAL_STATES):
+    """
+    Runs a launch sequence like run, awaiting every decision instead of blocking on it.
+
+    Args:
+        control (LaunchControl): The launch control running the sequence.
+        stops (frozenset): The states to stop at, which include FINAL_STATES (default: the final states).
+
+    Returns:
+        int: The state the sequence stopped at.
+    """
+    state = control.state
+    while state not in stops:
+        state = await step_async(control)
+    return state
+
+
+def run_batch(controls, stops=FINAL_STATES):
+    """
+    Runs many launch sequences side by side, one transition of every running sequence per round, until
+    each has reached one of the given states.
+
+    Args:
+        controls (list): The launch controls running the sequences.
+        stops (frozenset): The states to stop at, which include FINAL_STATES (default: the final states).
+
+    Returns:
+        int: The number of transitions performed.
+    """
+    running = [control for control in controls if control.state not in stops]
+    transitions = 0
+    while running:
+        for control in running:
+            step(control)
+        transitions += len(running)
+        running = [control for control in running if control.state not in stops]
+    return transitions
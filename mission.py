@@ -1,3 +1,9 @@
+import random
+import time
+
+from decisions import InteractiveDecisions
+from flight_profile import profiles
+from instrumentation import instrumented
 from rocket import Rocket
 
 
@@ -11,13 +17,27 @@ class Mission:
         fuel_capacity (int): The fuel capacity of the rocket (default: 1514100 liters).
         burn_rate (int): The fuel burn rate of the rocket (default: 168233 liters/min).
         average_speed (int): The average speed of the rocket (default: 1500 km/h).
+        random_seed (int): The seed of the mission random number generator (default: 12).
+        mission_name (str): The name of the mission.
+        clock (Clock): The clock the mission's rocket flies on.
+        decisions (DecisionProvider): Answers the mission and launch stage questions.
+        renderer (StatusRenderer): Coalesces the status output into frames, or None to print every status.
+        bus (TelemetryBus): Receives the live status of the mission's rocket for monitor processes, or None.
+        started_at (float): The wall-clock time the mission started at as a Unix timestamp, or None.
 
     Methods:
         print_plan(): Prints the mission plan with the configured parameters.
-        fetch_mission_name(): Asks for user input to set the mission name.
-        proceed(): Asks for user confirmation to proceed with the mission.
-        start(): Initiates the rocket launch and displays the mission status.
+        fetch_mission_name(): Asks the decision provider to set the mission name.
+        proceed(): Asks the decision provider for confirmation to proceed with the mission.
+        start(recorder, checkpointer): Initiates the rocket launch and displays the mission status.
+        resume(rocket, recorder, checkpointer): Resumes the flight of a rocket restored from a checkpoint.
+        fly(statuses, recorder, checkpointer, rocket): Displays, archives and checkpoints the statuses of a flight.
+        start_async(statuses): Initiates the rocket launch on the event loop and publishes the mission status.
+        publish_on_bus(rocket): Claims a telemetry bus slot for the flight of a rocket.
+        route_announcements(decisions): Writes the announcements of a flight through the renderer.
+        simulate(decisions, rng): Flies the mission at machine speed, without real-time waits.
         display_mission_status(status): Displays the current status of the mission.
+        format_mission_status(status): Formats the current status of the mission.
         format_time(time): Formats the elapsed time into HH:MM:SS format.
     """
 
@@ -28,6 +48,12 @@ class Mission:
         fuel_capacity=1514100,
         burn_rate=168233,
         average_speed=1500,
+        random_seed=12,
+        mission_name=None,
+        clock=None,
+        decisions=None,
+        renderer=None,
+        bus=None,
     ):
         """
         Initializes a new Mission object with default or provided parameters.
@@ -38,13 +64,28 @@ class Mission:
             fuel_capacity (int): The fuel capacity of the rocket (default: 1514100 liters).
             burn_rate (int): The fuel burn rate of the rocket (default: 168233 liters/min).
             average_speed (int): The average speed of the rocket (default: 1500 km/h).
+            random_seed (int): The seed of the mission random number generator (default: 12).
+            mission_name (str): The name of the mission (default: None).
+            clock (Clock): The clock the mission's rocket flies on (default: real time).
+            decisions (DecisionProvider): Answers the mission and launch stage questions (default: the operator
+                on the terminal).
+            renderer (StatusRenderer): Coalesces the status output into frames, e.g. one shared by
+                concurrent missions (default: None, every status is printed).
+            bus (TelemetryBus): Receives the live status of the mission's rocket, e.g. one shared by every
+                mission of a session (default: None).
         """
         self.travel_distance = travel_distance
         self.payload_capacity = payload_capacity
         self.fuel_capacity = fuel_capacity
         self.burn_rate = burn_rate
         self.average_speed = average_speed
-        self.random_seed = 12
+        self.random_seed = random_seed
+        self.mission_name = mission_name
+        self.clock = clock
+        self.decisions = InteractiveDecisions() if decisions is None else decisions
+        self.renderer = renderer
+        self.bus = bus
+        self.started_at = None
         self.summary = {}
 
     def print_plan(self):
@@ -61,44 +102,213 @@ class Mission:
 
     def fetch_mission_name(self):
         """
-        Asks for user input to set the mission name.
+        Asks the decision provider to set the mission name.
         """
-        self.mission_name = input("What is the name of this mission? ")
+        self.mission_name = self.decisions.answer("mission_name", "What is the name of this mission? ")
 
     def proceed(self):
         """
-        Asks for user confirmation to proceed with the mission.
+        Asks the decision provider for confirmation to proceed with the mission.
 
         Returns:
             bool: True if user wants to proceed, False otherwise.
         """
-        return input("Would you like to proceed? (y/n): ").strip().lower() == "y"
+        return self.decisions.confirm("proceed", "Would you like to proceed? (y/n): ", accept="y")
 
-    def start(self):
+    @instrumented("mission.start")
+    def start(self, recorder=None, checkpointer=None):
         """
         Initiates the rocket launch and displays the mission status.
+
+        Args:
+            recorder (TelemetryRecorder): Archives every status of the flight, if given (default: None).
+            checkpointer (Checkpointer): Periodically checkpoints the rocket in flight, if given (default: None).
+        """
+        self.started_at = time.time()
+        rng = random.Random(self.random_seed)
+        self.route_announcements(self.decisions)
+        rocket = Rocket.prepare_for_launch(
+            self.travel_distance,
+            self.burn_rate,
+            self.average_speed,
+            rng=rng,
+            clock=self.clock,
+            decisions=self.decisions,
+        )
+
+        if rocket.launch_control.launch():
+            self.publish_on_bus(rocket)
+            self.fly(rocket.launch(), recorder, checkpointer, rocket)
+        else:
+            self.fly((), recorder, checkpointer, rocket)
+        self.summary = rocket.summary()
+
+    def resume(self, rocket, recorder=None, checkpointer=None):
+        """
+        Resumes the flight of a rocket restored from a checkpoint and displays the rest of the mission status.
+
+        Args:
+            rocket (Rocket): The restored rocket, e.g. returned by checkpoint.read_checkpoint.
+            recorder (TelemetryRecorder): Archives every remaining status of the flight, if given (default: None).
+            checkpointer (Checkpointer): Periodically checkpoints the rocket in flight, if given (default: None).
+        """
+        self.route_announcements(rocket.launch_control.decisions)
+        self.publish_on_bus(rocket)
+        self.fly(rocket.launch(resume=True), recorder, checkpointer, rocket)
+        self.summary = rocket.summary()
+
+    def fly(self, statuses, recorder, checkpointer, rocket):
+        """
+        Displays, archives and checkpoints the statuses of a flight, and removes the checkpoint once the
+        flight has ended.
+
+        Args:
+            statuses (iterable): The statuses yielded by the flight.
+            recorder (TelemetryRecorder): Archives every status, or None.
+            checkpointer (Checkpointer): Periodically checkpoints the rocket after a status, or None.
+            rocket (Rocket): The rocket in flight.
+        """
+        if recorder is not None:
+            recorder.begin_mission(self.mission_name)
+
+        for status in statuses:
+            if recorder is not None:
+                recorder.record(status)
+            self.display_mission_status(status)
+            if checkpointer is not None:
+                checkpointer.checkpoint({self.mission_name or "": rocket})
+
+        if recorder is not None:
+            recorder.end_mission()
+        if checkpointer is not None:
+            checkpointer.clear()
+        if self.renderer is not None:
+            self.renderer.finish(self)
+            self.renderer.render()
+
+    @instrumented("mission.start_async")
+    async def start_async(self, statuses=None):
+        """
+        Initiates the rocket launch like start, but awaits the stage decisions and the flight so many
+        missions can run concurrently on one event loop.
+
+        Args:
+            statuses (asyncio.Queue): A bounded queue receiving (mission, status) pairs. Putting into a
+                full queue waits, which slows the flight down to the pace of the status consumers.
+                Statuses are displayed directly if no queue is given (default: None).
+        """
+        self.started_at = time.time()
+        rng = random.Random(self.random_seed)
+        self.route_announcements(self.decisions)
+        rocket = Rocket(
+            self.travel_distance, self.burn_rate, self.average_speed, rng=rng, clock=self.clock, decisions=self.decisions
+        )
+        await rocket.launch_control.prepare_for_launch_async()
+
+        if await rocket.launch_control.launch_async():
+            self.publish_on_bus(rocket)
+            async for status in rocket.launch_async():
+                if statuses is None:
+                    self.display_mission_status(status)
+                else:
+                    await statuses.put((self, status))
+
+        if statuses is None and self.renderer is not None:
+            self.renderer.finish(self)
+        self.summary = rocket.summary()
+
+    def publish_on_bus(self, rocket):
+        """
+        Claims a telemetry bus slot for the flight of a rocket, if the mission has a bus.
+
+        Args:
+            rocket (Rocket): The rocket about to fly.
+        """
+        if self.bus is not None:
+            rocket.publisher = self.bus.publisher(self.mission_name or f"Mission {self.random_seed}")
+
+    def route_announcements(self, decisions):
+        """
+        Has a decision provider write its announcements through the renderer, if the mission has one, so
+        the next frame does not draw over them.
+
+        Args:
+            decisions (DecisionProvider): The decision provider of the flight.
+        """
+        if self.renderer is not None:
+            decisions.renderer = self.renderer
+
+    @instrumented("mission.simulate")
+    def simulate(self, decisions=None, rng=None):
+        """
+        Flies the mission at machine speed, without real-time waits.
+
+        The full launch sequence runs against the decision provider, and the flight is resolved in one step
+        on a virtual clock, from the shared trajectory table of the mission configuration. All random
+        draws come from the mission random seed, so with a non-interactive decision provider the summary
+        only depends on the mission parameters, the decisions and the seed.
+
+        Args:
+            decisions (DecisionProvider): Answers the launch stage questions (default: the mission decision
+                provider).
+            rng (random.Random): The random number generator of the flight (default: one seeded with the
+                mission random seed).
+
+        Returns:
+            dict: The summary of the mission.
         """
-        rocket = Rocket.prepare_for_launch(distance=160, burn_rate=168240, average_speed=1500)
+        self.started_at = time.time()
+        rng = random.Random(self.random_seed) if rng is None else rng
+        decisions = self.decisions if decisions is None else decisions
+        rocket = Rocket.prepare_for_launch(
+            self.travel_distance,
+            self.burn_rate,
+            self.average_speed,
+            rng=rng,
+            decisions=decisions,
+            profile=profiles.get(self.travel_distance, self.burn_rate, self.average_speed),
+        )
 
-        if rocket.launch():
-            for status in rocket.launch():
-                self.display_mission_status(status)
+        if rocket.launch_control.launch():
+            rocket.resolve_flight()
 
         self.summary = rocket.summary()
+        return self.summary
 
     def display_mission_status(self, status):
         """
-        Displays the current status of the mission.
+        Displays the current status of the mission, through the renderer if the mission has one.
 
         Args:
             status (dict): Dictionary containing status information.
         """
-        print("Mission status:")
-        print(f"  Current fuel burn rate: {status['current_fuel_burn_rate']} liters/min")
-        print(f"  Current speed: {status['current_speed']} km/h")
-        print(f"  Current distance traveled: {status['distance_traveled']} km")
-        print(f"  Elapsed time: {self.format_time(status['elapsed_time'])}")
-        print(f"  Time to destination: {self.format_time(status['time_to_destination'])}")
+        if self.renderer is None:
+            print(self.format_mission_status(status))
+        else:
+            self.renderer.update(self, self.format_mission_status(status))
+
+    def format_mission_status(self, status):
+        """
+        Formats the current status of the mission. With a renderer, the mission name heads the status so
+        concurrent missions sharing a frame can be told apart.
+
+        Args:
+            status (dict): Dictionary containing status information.
+
+        Returns:
+            str: The status lines, without a trailing newline.
+        """
+        header = "Mission status:"
+        if self.renderer is not None and self.mission_name:
+            header = f"Mission status ({self.mission_name}):"
+        return "\n".join((
+            header,
+            f"  Current fuel burn rate: {status['current_fuel_burn_rate']} liters/min",
+            f"  Current speed: {status['current_speed']} km/h",
+            f"  Current distance traveled: {status['distance_traveled']} km",
+            f"  Elapsed time: {self.format_time(status['elapsed_time'])}",
+            f"  Time to destination: {self.format_time(status['time_to_destination'])}",
+        ))
 
     @staticmethod
     def format_time(time):
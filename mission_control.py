@@ -1,5 +1,72 @@
+import os
+
+import instrumentation
+from clock import VirtualClock
+from decisions import InteractiveDecisions, PolicyDecisions
+from flight_profile import profiles
 from mission import Mission
-import pdb
+from mission_statistics import MissionStatistics
+from mission_store import MissionStore
+
+# The number of recent missions kept in memory when a history persists every mission, unless a window is
+# given.
+HISTORY_WINDOW = 1000
+
+
+def simulate_mission(mission):
+    """
+    Flies a single mission without operator input. Runs inside the worker processes of
+    MissionControl.run_missions, so it has to live at module level.
+
+    Args:
+        mission (Mission): The mission to fly.
+
+    Returns:
+        dict: The summary of the mission.
+    """
+    return mission.simulate()
+
+
+def simulate_missions(missions, metrics=False):
+    """
+    Flies a chunk of missions without operator input, inside a worker process of simulate_in_pool. A
+    registry only covers its own process, so the metrics the chunk records are returned with its summaries.
+
+    Args:
+        missions (list): The missions to fly.
+        metrics (bool): Whether to record the metrics of the chunk (default: False).
+
+    Returns:
+        tuple: The summaries of the missions, and the MetricsRegistry of the chunk or None.
+    """
+    if not metrics:
+        return [mission.simulate() for mission in missions], None
+    with instrumentation.collect() as registry:
+        summaries = [mission.simulate() for mission in missions]
+    return summaries, registry
+
+
+def simulate_in_pool(executor, missions, workers):
+    """
+    Flies missions without operator input across a process pool. When instrumentation is enabled in the
+    current process, the metrics recorded by the workers are merged into its registry as the chunks
+    complete.
+
+    Args:
+        executor (ProcessPoolExecutor): The process pool.
+        missions (list): The missions to fly.
+        workers (int): The number of worker processes of the pool.
+
+    Yields:
+        dict: The summary of every mission, in order.
+    """
+    registry = instrumentation.active()
+    size = max(1, len(missions) // (workers * 4))
+    chunks = [missions[start:start + size] for start in range(0, len(missions), size)]
+    for summaries, metrics in executor.map(simulate_missions, chunks, [registry is not None] * len(chunks)):
+        if metrics is not None:
+            registry.merge(metrics)
+        yield from summaries
 
 
 class MissionControl:
@@ -7,30 +74,94 @@ class MissionControl:
     Represents a control center for managing space missions.
 
     Attributes:
-        missions (list): A list to store instances of Mission class representing active missions.
+        missions (MissionStore): The finished missions, indexed by outcome, name and start time.
+        random_seed (int): The base seed from which the random seed of every mission is derived.
+        clock (Clock): The clock interactive missions fly on.
+        decisions (DecisionProvider): Answers the session and interactive mission questions.
+        retain_missions (bool): Whether finished missions are kept in the mission store.
+        mission_count (int): The number of missions run so far, whether retained or not.
+        statistics (MissionStatistics): The running statistics of all finished missions.
+        renderer (StatusRenderer): Coalesces the status output of the missions into frames, or None.
+        history (MissionHistory): Persists every finished mission across sessions, or None.
+        bus (TelemetryBus): Receives the live status of every rocket in flight for monitor processes, or None.
 
     Methods:
         start(): Static method to start the Mission Control.
         start_control(): Initiates the Mission Control loop for managing multiple missions.
+        create_missions(count, clock): Creates the next non-interactive missions of the session, each with its own random seed.
+        run_missions(count, workers, batch_size, on_mission): Runs missions without operator input across a process pool.
+        run_missions_async(count, concurrency, consumer, consumers, queue_size): Flies missions without operator input concurrently on one event loop.
+        display_status(mission, status): Displays a status published by a mission flying on the event loop.
         run_mission(): Runs a single mission by creating a new Mission instance, printing the mission plan, fetching mission name, starting the mission, and displaying the mission summary.
+        store_missions(missions, summaries, on_mission): Records missions together with their summaries.
+        record_mission(mission): Adds a finished mission to the mission store.
         display_mission_summary(summary): Displays the summary of a single mission.
         display_summary(): Displays the summary for all missions combined.
         format_time(time): Formats the given time in seconds into HH:MM:SS format.
-        prompt(message): Static method to prompt the user for input and return True for 'yes' responses, False otherwise.
+        prompt(message): Asks the decision provider whether to run another mission.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        random_seed=12,
+        clock=None,
+        retain_missions=True,
+        decisions=None,
+        renderer=None,
+        history=None,
+        window=None,
+        bus=None,
+    ):
         """
-        Initializes a new MissionControl object with an empty list of missions.
+        Initializes a new MissionControl object with an empty mission store.
+
+        Args:
+            random_seed (int): The base seed from which the random seed of every mission is derived (default: 12).
+            clock (Clock): The clock interactive missions fly on (default: real time).
+            retain_missions (bool): Whether finished missions are kept in the mission store. Long batch
+                sessions can turn this off to keep memory flat; the counters and statistics are kept either way
+                (default: True).
+            decisions (DecisionProvider): Answers the session and interactive mission questions (default: the
+                operator on the terminal).
+            renderer (StatusRenderer): Coalesces the status output of the missions into frames (default: None,
+                every status is printed).
+            history (MissionHistory): Persists every finished mission, in which case the final summary
+                covers every session in the history (default: None).
+            window (int): The number of most recent missions kept in the mission store at least (default:
+                HISTORY_WINDOW with a history, otherwise None, every mission).
+            bus (TelemetryBus): Receives the live status of every rocket in flight (default: None).
         """
-        self.missions = []
+        if window is None and history is not None:
+            window = HISTORY_WINDOW
+        self.missions = MissionStore(retain=retain_missions, window=window)
+        self.random_seed = random_seed
+        self.clock = clock
+        self.decisions = InteractiveDecisions() if decisions is None else decisions
+        self.retain_missions = retain_missions
+        self.mission_count = 0
+        self.statistics = self.missions.statistics
+        self.renderer = renderer
+        self.history = history
+        self.bus = bus
 
     @staticmethod
-    def start():
+    def start(clock=None, decisions=None, renderer=None, history=None, window=None, bus=None):
         """
         Static method to start the Mission Control.
+
+        Args:
+            clock (Clock): The clock interactive missions fly on (default: real time).
+            decisions (DecisionProvider): Answers the session and mission questions (default: the operator on
+                the terminal).
+            renderer (StatusRenderer): Coalesces the status output into frames (default: None).
+            history (MissionHistory): Persists every finished mission across sessions (default: None).
+            window (int): The number of most recent missions kept in memory at least (default: HISTORY_WINDOW
+                with a history, otherwise None, every mission).
+            bus (TelemetryBus): Receives the live status of every rocket in flight (default: None).
         """
-        MissionControl().start_control()
+        MissionControl(
+            clock=clock, decisions=decisions, renderer=renderer, history=history, window=window, bus=bus
+        ).start_control()
 
     def start_control(self):
         """
@@ -45,6 +176,171 @@ class MissionControl:
         self.display_summary()
         print("Exiting Mission Control. Goodbye!")
 
+    def create_missions(self, count, clock=None):
+        """
+        Creates the next missions of the session, answered by a PolicyDecisions that approves every stage.
+        The n-th mission of a session is seeded with random_seed + n, so every mission draws from its own
+        reproducible random stream.
+
+        Args:
+            count (int): The number of missions to create.
+            clock (Clock): The clock the missions fly on (default: None).
+
+        Returns:
+            list: The new Mission instances, in order.
+        """
+        first = self.mission_count
+        return [
+            Mission(
+                random_seed=self.random_seed + first + index,
+                mission_name=f"Mission {first + index + 1}",
+                clock=clock,
+                decisions=PolicyDecisions(),
+            )
+            for index in range(count)
+        ]
+
+    def run_missions(self, count, workers=None, batch_size=10000, on_mission=None):
+        """
+        Runs missions without operator input across a process pool and records them with their summaries.
+
+        Seeds are assigned before the missions are distributed, so the results for a given random seed
+        are the same whatever the number of workers. Missions are created and recorded in batches, so
+        memory stays bounded when missions are not retained. The trajectory table of every configuration
+        is shared with the workers before its missions are distributed.
+
+        Args:
+            count (int): The number of missions to run.
+            workers (int): The number of worker processes (default: the number of CPUs). With a single
+                worker the missions run in the current process.
+            batch_size (int): The number of missions created and distributed at once (default: 10000).
+            on_mission (callable): Called with every mission as soon as it is recorded, in seed order
+                (default: None).
+        """
+        workers = workers or os.cpu_count() or 1
+        executor = None
+        if workers > 1:
+            # Imported here so single-process batch runs do not load multiprocessing.
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(max_workers=workers)
+
+        try:
+            for start in range(0, count, batch_size):
+                missions = self.create_missions(min(batch_size, count - start))
+                if executor is None:
+                    summaries = map(simulate_mission, missions)
+                else:
+                    for mission in missions:
+                        profiles.share(mission.travel_distance, mission.burn_rate, mission.average_speed)
+                    summaries = simulate_in_pool(executor, missions, workers)
+                self.store_missions(missions, summaries, on_mission)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    async def run_missions_async(self, count, concurrency=1000, consumer=None, consumers=1, queue_size=1000):
+        """
+        Flies missions without operator input concurrently on one event loop and records them with their
+        summaries.
+
+        Statuses flow through a bounded queue to the consumer tasks. When the consumers fall behind, the
+        queue fills up and the rockets wait before emitting their next status.
+
+        Missions fly on the Mission Control clock, which has to be shared safely, i.e. real time or
+        scaled. Without one, every mission gets its own VirtualClock and finishes instantly.
+
+        With a renderer, the statuses shown by the consumers are drawn as frames shared by every mission in
+        flight, and a finished mission is moved out of the frame once its last status has been consumed.
+
+        Args:
+            count (int): The number of missions to fly.
+            concurrency (int): The maximum number of missions in flight at once (default: 1000).
+            consumer (coroutine function): Receives each (mission, status) pair (default: display_status).
+            consumers (int): The number of consumer tasks (default: 1).
+            queue_size (int): The maximum number of statuses waiting for a consumer (default: 1000).
+        """
+        import asyncio
+
+        consumer = consumer or self.display_status
+        statuses = asyncio.Queue(maxsize=queue_size)
+        slots = asyncio.Semaphore(concurrency)
+
+        missions = self.create_missions(count, clock=self.clock)
+        for mission in missions:
+            mission.clock = mission.clock or VirtualClock()
+            mission.renderer = self.renderer
+            mission.bus = self.bus
+
+        async def fly(mission):
+            async with slots:
+                await mission.start_async(statuses=statuses)
+                if self.renderer is not None:
+                    # Marks the end of the flight, behind its last status.
+                    await statuses.put((mission, None))
+
+        async def consume():
+            while True:
+                mission, status = await statuses.get()
+                try:
+                    if status is None:
+                        self.renderer.finish(mission)
+                    else:
+                        await consumer(mission, status)
+                finally:
+                    statuses.task_done()
+
+        tasks = [asyncio.create_task(consume()) for _ in range(consumers)]
+        try:
+            await asyncio.gather(*(fly(mission) for mission in missions))
+            await statuses.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if self.renderer is not None:
+                self.renderer.close()
+
+        self.store_missions(missions, (mission.summary for mission in missions))
+
+    @staticmethod
+    async def display_status(mission, status):
+        """
+        Displays a status published by a mission flying on the event loop.
+
+        Args:
+            mission (Mission): The mission the status belongs to.
+            status (dict): Dictionary containing status information.
+        """
+        mission.display_mission_status(status)
+
+    def store_missions(self, missions, summaries, on_mission=None):
+        """
+        Records missions together with their summaries, as the summaries arrive.
+
+        Args:
+            missions (list): The missions to store.
+            summaries (iterable): The summary of each mission, in the same order.
+            on_mission (callable): Called with every mission once it is recorded (default: None).
+        """
+        for mission, summary in zip(missions, summaries):
+            mission.summary = summary
+            self.record_mission(mission)
+            if on_mission is not None:
+                on_mission(mission)
+
+    def record_mission(self, mission):
+        """
+        Adds a finished mission to the mission store, which updates the statistics and, if missions are
+        retained, the indexes, and to the history if there is one.
+
+        Args:
+            mission (Mission): The finished mission.
+        """
+        self.mission_count += 1
+        self.missions.add(mission)
+        if self.history is not None:
+            self.history.add(mission)
+
     def run_mission(self):
         """
         Runs a single mission by creating a new Mission instance, printing the mission plan, fetching mission name,
@@ -53,15 +349,21 @@ class MissionControl:
         Returns:
             bool: True if the user wants to run another mission, False otherwise.
         """
-        mission = Mission()
+        mission = Mission(
+            random_seed=self.random_seed + self.mission_count,
+            clock=self.clock,
+            decisions=self.decisions,
+            renderer=self.renderer,
+            bus=self.bus,
+        )
         mission.print_plan()
         mission.fetch_mission_name()
 
         if mission.proceed():
-            mission.start()
+            mission.start(recorder=self.history if self.history is not None and self.history.telemetry else None)
             self.display_mission_summary(mission.summary)
 
-        self.missions.append(mission)
+        self.record_mission(mission)
         return self.prompt("Would you like to run another mission? (y/n): ")
 
     def display_mission_summary(self, summary):
@@ -71,8 +373,6 @@ class MissionControl:
         Args:
             summary (dict): Dictionary containing summary information for the mission.
         """
-        print(summary)
-        pdb.set_trace()
         print("Mission summary:")
         print(f"  Total distance traveled: {summary['total_distance']:.2f} km")
         print(f"  Number of abort and retries: {summary['no_abort_retries']}")
@@ -82,20 +382,37 @@ class MissionControl:
 
     def display_summary(self):
         """
-        Displays the summary for all missions combined.
+        Displays the summary for all missions combined, from the running statistics, or from the aggregates
+        of the history across every session if there is one.
         """
-        print("Final Summary:")
-        total_distance = sum(mission.summary["total_distance"] for mission in self.missions)
-        total_abort_retries = sum(mission.summary["no_abort_retries"] for mission in self.missions)
-        total_explosions = sum(mission.summary["no_explosions"] for mission in self.missions)
-        total_fuel_burned = sum(mission.summary["total_fuel_burned"] for mission in self.missions)
-        total_flight_time = sum(mission.summary["flight_time"] for mission in self.missions)
+        if self.history is None:
+            print("Final Summary:")
+            statistics = self.statistics
+            totals = {field: getattr(statistics, field).total for field in statistics.FIELDS}
+            mean, stddev = statistics.flight_time.mean, statistics.flight_time.stddev()
+            quantile = statistics.flight_time_quantile
+        else:
+            totals = self.history.totals()
+            print(f"Final Summary ({totals['missions']} missions over {totals['sessions']} sessions):")
+            mean, stddev = self.history.flight_time_moments()
+            quantile = self.history.flight_time_quantile
+        total_distance = totals["total_distance"]
+        total_abort_retries = totals["no_abort_retries"]
+        total_explosions = totals["no_explosions"]
+        total_fuel_burned = totals["total_fuel_burned"]
+        total_flight_time = totals["flight_time"]
 
         print(f"  Total distance traveled (for all missions combined): {total_distance:.2f} km")
         print(f"  Number of abort and retries (for all missions combined): {total_abort_retries}")
         print(f"  Number of explosions (for all missions combined): {total_explosions}")
         print(f"  Total fuel burned (for all missions combined): {total_fuel_burned} liters")
         print(f"  Total flight time (for all missions combined): {self.format_time(total_flight_time)}")
+        print(f"  Average flight time: {mean:.2f} s (stddev {stddev:.2f} s)")
+        print(
+            "  Flight time p50/p95/p99: "
+            + "/".join(f"{quantile(level):.2f}" for level in MissionStatistics.QUANTILES)
+            + " s"
+        )
 
     @staticmethod
     def format_time(time):
@@ -103,20 +420,20 @@ class MissionControl:
         Formats the given time in seconds into HH:MM:SS format.
 
         Args:
-            time (int): Time in seconds.
+            time (float): Time in seconds, truncated to whole seconds, e.g. a total summed by SQLite.
 
         Returns:
             str: Formatted time string in HH:MM:SS format.
         """
+        time = int(time)
         hours = time // 3600
         minutes = (time % 3600) // 60
         seconds = time % 60
         return f"{hours}:{minutes}:{seconds}"
 
-    @staticmethod
-    def prompt(message):
+    def prompt(self, message):
         """
-        Static method to prompt the user for input and return True for 'yes' responses, False otherwise.
+        Asks the decision provider whether to run another mission.
 
         Args:
             message (str): The message to display to the user.
@@ -124,5 +441,4 @@ class MissionControl:
         Returns:
             bool: True if the user responds with 'yes', False otherwise.
         """
-        response = input(message).strip().lower()
-        return response == "y"  # Assuming 'y' indicates Yes, and anything else indicates No
+        return self.decisions.confirm("another_mission", message, accept="y")
@@ -0,0 +1,255 @@
+import sqlite3
+import time
+
+from mission_statistics import MissionStatistics
+from mission_store import classify
+from telemetry import FIELDS as TELEMETRY_FIELDS
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY,
+        started_at REAL NOT NULL,
+        random_seed INTEGER
+    )
+    """,
+    # Missions that never flew keep NULL summary fields, which the aggregates skip.
+    """
+    CREATE TABLE IF NOT EXISTS missions (
+        id INTEGER PRIMARY KEY,
+        session_id INTEGER NOT NULL REFERENCES sessions (id),
+        name TEXT,
+        random_seed INTEGER,
+        outcome TEXT NOT NULL,
+        started_at REAL,
+        total_distance REAL,
+        no_abort_retries INTEGER,
+        no_explosions INTEGER,
+        total_fuel_burned REAL,
+        flight_time REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS missions_outcome ON missions (outcome)",
+    "CREATE INDEX IF NOT EXISTS missions_started_at ON missions (started_at)",
+    "CREATE INDEX IF NOT EXISTS missions_flight_time ON missions (flight_time)",
+    # Covers the totals, so they scan a narrow index instead of the table.
+    f"CREATE INDEX IF NOT EXISTS missions_totals ON missions ({', '.join(MissionStatistics.FIELDS)})",
+    f"""
+    CREATE TABLE IF NOT EXISTS telemetry (
+        mission_id INTEGER NOT NULL REFERENCES missions (id),
+        {', '.join(TELEMETRY_FIELDS)}
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS telemetry_mission ON telemetry (mission_id, elapsed_time)",
+)
+
+MISSION_COLUMNS = ("session_id", "name", "random_seed", "outcome", "started_at", *MissionStatistics.FIELDS)
+INSERT_MISSION = f"INSERT INTO missions ({', '.join(MISSION_COLUMNS)}) VALUES ({', '.join('?' * len(MISSION_COLUMNS))})"
+INSERT_TELEMETRY = (
+    f"INSERT INTO telemetry (mission_id, {', '.join(TELEMETRY_FIELDS)}) "
+    f"VALUES ({', '.join('?' * (len(TELEMETRY_FIELDS) + 1))})"
+)
+
+
+class MissionHistory:
+    """
+    Persists finished missions, and optionally their telemetry, to a SQLite file, so the mission history of
+    every session survives Mission Control exiting.
+
+    Rows are buffered and written in one transaction per batch, on a database in WAL mode, so recording a
+    mission costs an append in the common case. The cross-session totals are SQL aggregates over indexes
+    of the missions table.
+
+    The history also has the begin_mission, record and end_mission methods of a TelemetryRecorder, so it
+    can be handed to Mission.start as its recorder. The statuses are stored with the next mission added,
+    under the id SQLite assigns to it when the batch is written, so sessions sharing a database never
+    reuse each other's ids.
+
+    Attributes:
+        path (str): The path of the SQLite file.
+        batch_size (int): The number of buffered rows that triggers a write.
+        telemetry (bool): Whether mission telemetry is persisted.
+        session_id (int): The id of the current session.
+
+    Methods:
+        add(mission): Buffers a finished mission.
+        begin_mission(name): Starts recording the telemetry of the next mission.
+        record(status): Buffers a status of the current mission.
+        end_mission(): Ends the current mission.
+        flush(): Writes the buffered rows.
+        totals(): Calculates the totals of every mission of every session.
+        flight_time_moments(): Calculates the mean and standard deviation of the flight time.
+        flight_time_quantile(quantile): Retrieves a flight time quantile.
+        count(outcome): Counts the missions of every session with an outcome.
+        close(): Writes the buffered rows and closes the database.
+    """
+
+    def __init__(self, path, batch_size=500, telemetry=False, random_seed=None):
+        """
+        Initializes a new MissionHistory object, creating the database if needed and starting a new session.
+
+        Args:
+            path (str): The path of the SQLite file.
+            batch_size (int): The number of buffered rows that triggers a write (default: 500).
+            telemetry (bool): Whether mission telemetry is persisted (default: False).
+            random_seed (int): The base random seed of the session, stored with it (default: None).
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.telemetry = telemetry
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+            cursor = self._connection.execute(
+                "INSERT INTO sessions (started_at, random_seed) VALUES (?, ?)", (time.time(), random_seed)
+            )
+        self.session_id = cursor.lastrowid
+        # Buffered missions, each with the statuses recorded for it, and the number of buffered rows.
+        self._missions = []
+        self._rows = 0
+        self._recording = None
+        self._recorded = None
+
+    def add(self, mission):
+        """
+        Buffers a finished mission with the statuses recorded since begin_mission, writing the buffer once it
+        holds batch_size rows.
+
+        Args:
+            mission (Mission): The finished mission.
+        """
+        statuses = self._recorded or ()
+        self._recorded = None
+        summary = mission.summary
+        self._missions.append(
+            (
+                (
+                    self.session_id,
+                    mission.mission_name,
+                    mission.random_seed,
+                    classify(summary),
+                    mission.started_at,
+                    *(summary.get(field) for field in MissionStatistics.FIELDS),
+                ),
+                statuses,
+            )
+        )
+        self._rows += 1 + len(statuses)
+        if self._rows >= self.batch_size:
+            self.flush()
+
+    def begin_mission(self, name):
+        """
+        Starts recording the telemetry of the next mission added.
+
+        Args:
+            name (str): The name of the mission, unused; the statuses are stored under the mission id.
+        """
+        self._recording = [] if self.telemetry else None
+
+    def record(self, status):
+        """
+        Buffers a status of the current mission, if telemetry is persisted.
+
+        Args:
+            status (dict): Dictionary containing status information.
+        """
+        if self._recording is not None:
+            self._recording.append(tuple(status[field] for field in TELEMETRY_FIELDS))
+
+    def end_mission(self):
+        """
+        Ends the current mission, keeping its statuses for the next mission added.
+        """
+        self._recorded, self._recording = self._recording, None
+
+    def flush(self):
+        """
+        Writes the buffered rows in a single transaction. Missions are inserted one by one, so their
+        statuses can be stored under the id SQLite assigned them.
+        """
+        if not self._missions:
+            return
+        with self._connection:
+            for mission, statuses in self._missions:
+                mission_id = self._connection.execute(INSERT_MISSION, mission).lastrowid
+                if statuses:
+                    self._connection.executemany(INSERT_TELEMETRY, [(mission_id, *status) for status in statuses])
+        self._missions.clear()
+        self._rows = 0
+
+    def totals(self):
+        """
+        Calculates the totals of every mission of every session, including the buffered ones.
+
+        Returns:
+            dict: The number of sessions and missions, and the total of every summary field.
+        """
+        self.flush()
+        sums = ", ".join(f"COALESCE(SUM({field}), 0)" for field in MissionStatistics.FIELDS)
+        row = self._connection.execute(f"SELECT COUNT(*), {sums} FROM missions").fetchone()
+        (sessions,) = self._connection.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return {"sessions": sessions, "missions": row[0], **dict(zip(MissionStatistics.FIELDS, row[1:]))}
+
+    def flight_time_moments(self):
+        """
+        Calculates the mean and sample standard deviation of the flight time of every flown mission.
+
+        Returns:
+            tuple: The mean and standard deviation in seconds, 0.0 when there are too few missions.
+        """
+        self.flush()
+        count, total, squares = self._connection.execute(
+            "SELECT COUNT(flight_time), SUM(flight_time), SUM(flight_time * flight_time) FROM missions"
+        ).fetchone()
+        if not count:
+            return 0.0, 0.0
+        mean = total / count
+        if count < 2:
+            return mean, 0.0
+        return mean, max(0.0, (squares - count * mean * mean) / (count - 1)) ** 0.5
+
+    def flight_time_quantile(self, quantile):
+        """
+        Retrieves a flight time quantile of every flown mission, by seeking into the flight time index.
+
+        Args:
+            quantile (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The flight time quantile in seconds, or 0.0 if no mission has flown.
+        """
+        self.flush()
+        (count,) = self._connection.execute("SELECT COUNT(flight_time) FROM missions").fetchone()
+        if not count:
+            return 0.0
+        row = self._connection.execute(
+            "SELECT flight_time FROM missions WHERE flight_time IS NOT NULL ORDER BY flight_time LIMIT 1 OFFSET ?",
+            (round(quantile * (count - 1)),),
+        ).fetchone()
+        return float(row[0])
+
+    def count(self, outcome=None):
+        """
+        Counts the missions of every session, optionally only those with an outcome.
+
+        Args:
+            outcome (str): One of mission_store.OUTCOMES (default: None, any outcome).
+
+        Returns:
+            int: The number of missions.
+        """
+        self.flush()
+        if outcome is None:
+            return self._connection.execute("SELECT COUNT(*) FROM missions").fetchone()[0]
+        return self._connection.execute("SELECT COUNT(*) FROM missions WHERE outcome = ?", (outcome,)).fetchone()[0]
+
+    def close(self):
+        """
+        Writes the buffered rows and closes the database.
+        """
+        self.flush()
+        self._connection.close()
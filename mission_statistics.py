@@ -0,0 +1,218 @@
+import math
+
+
+class RunningStatistic:
+    """
+    Keeps the count, total, mean and variance of a stream of values in constant memory, using
+    Welford's online algorithm.
+
+    Attributes:
+        count (int): The number of values added.
+        total (float): The sum of the values added.
+        mean (float): The mean of the values added.
+
+    Methods:
+        add(value): Adds a value to the statistic.
+        variance(): Calculates the sample variance of the values added.
+        stddev(): Calculates the sample standard deviation of the values added.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new RunningStatistic object with no values.
+        """
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self._squared_deviations = 0.0
+
+    def add(self, value):
+        """
+        Adds a value to the statistic.
+
+        Args:
+            value (float): The value to add.
+        """
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squared_deviations += delta * (value - self.mean)
+
+    def variance(self):
+        """
+        Calculates the sample variance of the values added.
+
+        Returns:
+            float: The sample variance, or 0.0 for fewer than two values.
+        """
+        if self.count < 2:
+            return 0.0
+        return self._squared_deviations / (self.count - 1)
+
+    def stddev(self):
+        """
+        Calculates the sample standard deviation of the values added.
+
+        Returns:
+            float: The sample standard deviation, or 0.0 for fewer than two values.
+        """
+        return math.sqrt(self.variance())
+
+
+class QuantileSketch:
+    """
+    Estimates a single quantile of a stream of values in constant memory, using the P-square
+    algorithm of Jain and Chlamtac, which tracks five markers around the quantile.
+
+    Attributes:
+        quantile (float): The quantile being estimated, between 0 and 1.
+        count (int): The number of values added.
+
+    Methods:
+        add(value): Adds a value to the sketch.
+        value(): Retrieves the current estimate of the quantile.
+    """
+
+    def __init__(self, quantile):
+        """
+        Initializes a new QuantileSketch object.
+
+        Args:
+            quantile (float): The quantile to estimate, between 0 and 1.
+        """
+        self.quantile = quantile
+        self.count = 0
+        self._heights = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4]
+        self._increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value):
+        """
+        Adds a value to the sketch.
+
+        Args:
+            value (float): The value to add.
+        """
+        self.count += 1
+        heights = self._heights
+
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+        for index in range(5):
+            self._desired[index] += self._increments[index]
+
+        for index in range(1, 4):
+            offset = self._desired[index] - positions[index]
+            if (offset >= 1 and positions[index + 1] - positions[index] > 1) or (
+                offset <= -1 and positions[index - 1] - positions[index] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = self._linear(index, step)
+                heights[index] = height
+                positions[index] += step
+
+    def value(self):
+        """
+        Retrieves the current estimate of the quantile.
+
+        Returns:
+            float: The estimated quantile, or 0.0 if no values have been added.
+        """
+        if not self._heights:
+            return 0.0
+        if self.count <= 5:
+            return self._heights[round(self.quantile * (self.count - 1))]
+        return self._heights[2]
+
+    def _parabolic(self, index, step):
+        q, n = self._heights, self._positions
+        return q[index] + step / (n[index + 1] - n[index - 1]) * (
+            (n[index] - n[index - 1] + step) * (q[index + 1] - q[index]) / (n[index + 1] - n[index])
+            + (n[index + 1] - n[index] - step) * (q[index] - q[index - 1]) / (n[index] - n[index - 1])
+        )
+
+    def _linear(self, index, step):
+        q, n = self._heights, self._positions
+        return q[index] + step * (q[index + step] - q[index]) / (n[index + step] - n[index])
+
+
+class MissionStatistics:
+    """
+    Aggregates mission summaries incrementally, so the combined summary of a session is available in
+    constant time and memory however many missions have finished.
+
+    Attributes:
+        missions (int): The number of missions added.
+        total_distance (RunningStatistic): The distance traveled per mission.
+        no_abort_retries (RunningStatistic): The number of abort and retries per mission.
+        no_explosions (RunningStatistic): The number of explosions per mission.
+        total_fuel_burned (RunningStatistic): The fuel burned per mission.
+        flight_time (RunningStatistic): The flight time per mission.
+        flight_time_quantiles (dict): A QuantileSketch of the flight time for p50, p95 and p99.
+
+    Methods:
+        add(summary): Adds a mission summary to the statistics.
+        flight_time_quantile(quantile): Retrieves the estimated flight time quantile.
+    """
+
+    FIELDS = ("total_distance", "no_abort_retries", "no_explosions", "total_fuel_burned", "flight_time")
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        """
+        Initializes a new MissionStatistics object with no missions.
+        """
+        self.missions = 0
+        for field in self.FIELDS:
+            setattr(self, field, RunningStatistic())
+        self.flight_time_quantiles = {quantile: QuantileSketch(quantile) for quantile in self.QUANTILES}
+
+    def add(self, summary):
+        """
+        Adds a mission summary to the statistics. Empty summaries, left by missions that were never
+        started, are ignored.
+
+        Args:
+            summary (dict): Dictionary containing summary information for the mission.
+        """
+        if not summary:
+            return
+
+        self.missions += 1
+        for field in self.FIELDS:
+            getattr(self, field).add(summary[field])
+        for sketch in self.flight_time_quantiles.values():
+            sketch.add(summary["flight_time"])
+
+    def flight_time_quantile(self, quantile):
+        """
+        Retrieves the estimated flight time quantile.
+
+        Args:
+            quantile (float): One of QUANTILES.
+
+        Returns:
+            float: The estimated flight time quantile in seconds.
+        """
+        return self.flight_time_quantiles[quantile].value()
@@ -0,0 +1,239 @@
+import bisect
+import time
+from array import array
+
+from mission_statistics import MissionStatistics
+
+# The outcome follows how the flight ended, as recorded in the arrived entry of the summary: completed if the
+# rocket reached its destination, exploded if it did not. A mission that never flew is aborted if its launch
+# was aborted, and declined otherwise, e.g. if the operator did not proceed, which leaves its summary empty.
+# Aborts followed by a successful retry do not change the outcome; MissionStore.aborts counts them.
+OUTCOMES = ("declined", "aborted", "exploded", "completed")
+
+
+def classify(summary):
+    """
+    Determines the final outcome of a mission from its summary.
+
+    Args:
+        summary (dict): The summary of the mission, empty if it never flew.
+
+    Returns:
+        str: One of OUTCOMES.
+    """
+    if not summary:
+        return "declined"
+    arrived = summary.get("arrived")
+    if arrived is None:
+        return "aborted" if summary["no_abort_retries"] else "declined"
+    return "completed" if arrived else "exploded"
+
+
+class MissionStore:
+    """
+    An in-memory repository of finished missions with secondary indexes on outcome, name and start time,
+    and aggregates maintained as missions are added, so queries never scan the whole store.
+
+    Every mission gets a sequential id. The indexes are arrays of ids, and the outcome and start time of
+    every id are kept in columns, so combined filters walk the smallest matching index and check the other
+    conditions by id.
+
+    With a window, only the most recent missions are kept: once twice the window has been retained, the
+    older half is evicted from the columns and the indexes at once, which keeps eviction amortized constant
+    time per mission. The counts and statistics still cover every mission added, while get, query and the
+    name and time filters of count only see the retained ones.
+
+    Attributes:
+        retain (bool): Whether missions are kept and indexed; otherwise only the aggregates are maintained.
+        window (int): The number of most recent missions kept at least, or None to keep every mission.
+        counts (dict): The number of missions per outcome.
+        aborts (int): The number of missions with at least one abort, whatever their outcome.
+        statistics (MissionStatistics): The running statistics of the summaries of every flown mission.
+
+    Methods:
+        add(mission, started_at): Adds a finished mission.
+        get(mission_id): Retrieves a mission by id.
+        query(outcome, name, since, until): Retrieves the missions matching every given condition.
+        count(outcome, name, since, until): Counts the missions matching every given condition.
+    """
+
+    def __init__(self, retain=True, window=None):
+        """
+        Initializes a new, empty MissionStore object.
+
+        Args:
+            retain (bool): Whether missions are kept and indexed (default: True).
+            window (int): The number of most recent missions kept at least (default: None, every mission).
+        """
+        self.retain = retain
+        self.window = window
+        self.counts = dict.fromkeys(OUTCOMES, 0)
+        self.aborts = 0
+        self.statistics = MissionStatistics()
+        self._missions = []
+        self._outcomes = array("b")
+        self._started = array("d")
+        self._by_outcome = {outcome: array("q") for outcome in OUTCOMES}
+        self._by_name = {}
+        self._by_start = array("q")
+        self._start_keys = array("d")
+        self._first = 0
+
+    def __len__(self):
+        return len(self._missions)
+
+    def __iter__(self):
+        return iter(self._missions)
+
+    def __getitem__(self, index):
+        return self._missions[index]
+
+    def add(self, mission, started_at=None):
+        """
+        Adds a finished mission, updating the aggregates and, if missions are retained, the indexes.
+
+        Args:
+            mission (Mission): The finished mission.
+            started_at (float): The wall-clock start time of the mission as a Unix timestamp (default: the
+                mission's started_at, or now if the mission did not record it).
+
+        Returns:
+            int: The id of the mission, or None if missions are not retained.
+        """
+        outcome = classify(mission.summary)
+        self.counts[outcome] += 1
+        if mission.summary.get("no_abort_retries"):
+            self.aborts += 1
+        self.statistics.add(mission.summary)
+        if not self.retain:
+            return None
+
+        if started_at is None:
+            started_at = mission.started_at if mission.started_at is not None else time.time()
+
+        mission_id = self._first + len(self._missions)
+        self._missions.append(mission)
+        self._outcomes.append(OUTCOMES.index(outcome))
+        self._started.append(started_at)
+        self._by_outcome[outcome].append(mission_id)
+        self._by_name.setdefault(mission.mission_name, array("q")).append(mission_id)
+
+        if not self._start_keys or started_at >= self._start_keys[-1]:
+            self._start_keys.append(started_at)
+            self._by_start.append(mission_id)
+        else:
+            position = bisect.bisect_right(self._start_keys, started_at)
+            self._start_keys.insert(position, started_at)
+            self._by_start.insert(position, mission_id)
+
+        if self.window is not None and len(self._missions) >= 2 * self.window:
+            self._evict(len(self._missions) - self.window)
+        return mission_id
+
+    def get(self, mission_id):
+        """
+        Retrieves a mission by id.
+
+        Args:
+            mission_id (int): The id returned by add.
+
+        Returns:
+            Mission: The mission.
+
+        Raises:
+            KeyError: If the mission has been evicted from the window.
+        """
+        if mission_id < self._first:
+            raise KeyError(f"mission {mission_id} has been evicted")
+        return self._missions[mission_id - self._first]
+
+    def query(self, outcome=None, name=None, since=None, until=None):
+        """
+        Retrieves the missions matching every given condition.
+
+        Args:
+            outcome (str): One of OUTCOMES (default: None, any outcome).
+            name (str): The mission name (default: None, any name).
+            since (float): The earliest start time, inclusive (default: None).
+            until (float): The latest start time, exclusive (default: None).
+
+        Returns:
+            list: The matching missions, in the order they were added.
+        """
+        first = self._first
+        return [self._missions[mission_id - first] for mission_id in self._ids(outcome, name, since, until)]
+
+    def count(self, outcome=None, name=None, since=None, until=None):
+        """
+        Counts the missions matching every given condition. A single outcome is answered from the maintained
+        counters, so it also works when missions are not retained and counts evicted missions.
+
+        Args:
+            outcome (str): One of OUTCOMES (default: None, any outcome).
+            name (str): The mission name (default: None, any name).
+            since (float): The earliest start time, inclusive (default: None).
+            until (float): The latest start time, exclusive (default: None).
+
+        Returns:
+            int: The number of matching missions.
+        """
+        timed = since is not None or until is not None
+        if name is None and not timed:
+            return sum(self.counts.values()) if outcome is None else self.counts[outcome]
+        if outcome is None and not timed:
+            return len(self._by_name.get(name, ()))
+        if outcome is None and name is None:
+            start, stop = self._time_range(since, until)
+            return stop - start
+        return len(self._ids(outcome, name, since, until))
+
+    def _time_range(self, since, until):
+        start = 0 if since is None else bisect.bisect_left(self._start_keys, since)
+        stop = len(self._start_keys) if until is None else bisect.bisect_left(self._start_keys, until)
+        return start, max(start, stop)
+
+    def _ids(self, outcome, name, since, until):
+        candidates = []
+        timed = None
+        if outcome is not None:
+            candidates.append(self._by_outcome[outcome])
+        if name is not None:
+            candidates.append(self._by_name.get(name, ()))
+        if since is not None or until is not None:
+            start, stop = self._time_range(since, until)
+            timed = self._by_start[start:stop]
+            candidates.append(timed)
+        if not candidates:
+            return range(self._first, self._first + len(self._missions))
+
+        smallest = min(candidates, key=len)
+        if smallest is timed:
+            # The start time index is in time order; the results are in id order.
+            smallest = sorted(timed)
+        code = None if outcome is None else OUTCOMES.index(outcome)
+        first = self._first
+        return [
+            mission_id
+            for mission_id in smallest
+            if (code is None or self._outcomes[mission_id - first] == code)
+            and (name is None or self._missions[mission_id - first].mission_name == name)
+            and (since is None or self._started[mission_id - first] >= since)
+            and (until is None or self._started[mission_id - first] < until)
+        ]
+
+    def _evict(self, count):
+        # The outcome and name indexes are in id order, so the evicted ids are a prefix of each of them.
+        self._first += count
+        first = self._first
+        del self._missions[:count]
+        del self._outcomes[:count]
+        del self._started[:count]
+        for ids in self._by_outcome.values():
+            del ids[: bisect.bisect_left(ids, first)]
+        for name, ids in list(self._by_name.items()):
+            del ids[: bisect.bisect_left(ids, first)]
+            if not ids:
+                del self._by_name[name]
+        kept = [position for position, mission_id in enumerate(self._by_start) if mission_id >= first]
+        self._by_start = array("q", (self._by_start[position] for position in kept))
+        self._start_keys = array("d", (self._start_keys[position] for position in kept))
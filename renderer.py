@@ -0,0 +1,135 @@
+import math
+import sys
+import time
+
+
+class StatusRenderer:
+    """
+    Coalesces status updates into frames and writes each frame with a single write.
+
+    On a terminal, the latest status of every live rocket is redrawn in place at most max_fps times per
+    second; updates arriving between two frames replace each other and the intermediate ones are dropped.
+    When the stream is not a terminal, every update is kept as plain lines, batched into one write per frame.
+
+    Attributes:
+        stream (file): The stream the frames are written to.
+        interval (float): The minimum number of seconds between two frames.
+        tty (bool): Whether frames are redrawn in place.
+        frames (int): The number of frames written.
+        dropped (int): The number of updates replaced before they were drawn.
+
+    Methods:
+        update(key, text): Sets the latest status text of a rocket.
+        finish(key): Stops tracking a rocket, whose final status stays above the live frame.
+        note(text): Writes a line above the live frame.
+        render(): Writes a frame with the pending updates.
+        close(): Writes the last frame.
+    """
+
+    def __init__(self, stream=None, max_fps=10, tty=None):
+        """
+        Initializes a new StatusRenderer object.
+
+        Args:
+            stream (file): The stream the frames are written to (default: sys.stdout).
+            max_fps (float): The maximum number of frames per second, or 0 for no limit (default: 10).
+            tty (bool): Whether frames are redrawn in place (default: whether the stream is a terminal).
+        """
+        self.stream = sys.stdout if stream is None else stream
+        self.interval = 1 / max_fps if max_fps else 0
+        self.tty = self.stream.isatty() if tty is None else tty
+        self.frames = 0
+        self.dropped = 0
+        self._live = {}
+        self._drawn = set()
+        self._committed = []
+        self._pending = []
+        self._height = 0
+        self._last_frame = -math.inf
+
+    def update(self, key, text):
+        """
+        Sets the latest status text of a rocket, and writes a frame if the last one is old enough.
+
+        Args:
+            key (Hashable): Identifies the rocket, e.g. its Mission.
+            text (str): The status text, without a trailing newline.
+        """
+        if self.tty:
+            if key in self._live and key not in self._drawn:
+                self.dropped += 1
+            self._live[key] = text
+            self._drawn.discard(key)
+        else:
+            self._pending.append(text)
+
+        now = time.monotonic()
+        if now - self._last_frame >= self.interval:
+            self.render(now)
+
+    def finish(self, key):
+        """
+        Stops tracking a rocket. Its final status is drawn above the live frame by the next frame, and stays
+        there.
+
+        Args:
+            key (Hashable): Identifies the rocket.
+        """
+        text = self._live.pop(key, None)
+        self._drawn.discard(key)
+        if text is not None:
+            self._committed.append(text)
+
+        now = time.monotonic()
+        if now - self._last_frame >= self.interval:
+            self.render(now)
+
+    def note(self, text):
+        """
+        Writes a line above the live frame right away, e.g. an announcement made during a flight. Anything
+        printed directly would be drawn over by the next frame.
+
+        Args:
+            text (str): The text, without a trailing newline.
+        """
+        if self.tty:
+            self._committed.append(text)
+        else:
+            self._pending.append(text)
+        self.render()
+
+    def render(self, now=None):
+        """
+        Writes a frame with the pending updates in a single write.
+
+        Args:
+            now (float): The current time.monotonic() value, if already known (default: None).
+        """
+        if self.tty:
+            parts = []
+            if self._height:
+                # Move to the start of the previous frame and clear it.
+                parts.append(f"\x1b[{self._height}F\x1b[J")
+            live = list(self._live.values())
+            parts.extend(f"{text}\n" for text in self._committed + live)
+            self._height = sum(text.count("\n") + 1 for text in live)
+            self._committed = []
+            self._drawn.update(self._live)
+        else:
+            parts = [f"{text}\n" for text in self._pending]
+            self._pending = []
+
+        if parts:
+            self.stream.write("".join(parts))
+            self.stream.flush()
+            self.frames += 1
+        self._last_frame = time.monotonic() if now is None else now
+
+    def close(self):
+        """
+        Writes the last frame, leaving every rocket still tracked on screen.
+        """
+        self._committed.extend(self._live.values())
+        self._live = {}
+        self.render()
+        self._height = 0
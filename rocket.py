@@ -1,5 +1,22 @@
+import math
+import random
+import struct
 import time
+from array import array
+
+import instrumentation
+from clock import RealTimeClock, VirtualClock
 from launch_control import LaunchControl
+from telemetry import TelemetryRecord, TelemetryRing
+from ticker import TickScheduler
+
+# Layout of a rocket snapshot: a magic tag, a bit mask of the values below that are integers, the flight
+# parameters and progress, the flight time so far (NaN before launch), the landing flag, the LaunchControl
+# state, and the cached Gaussian of the random number generator (NaN if none). The Mersenne Twister state
+# and the serialized telemetry ring follow.
+SNAPSHOT_MAGIC = b"RKT1"
+SNAPSHOT_HEADER = struct.Struct("<4sBddddqd??bqd")
+RNG_STATE_SIZE = 625 * 4
 
 
 class Rocket:
@@ -13,12 +30,30 @@ class Rocket:
         average_speed (float): The average speed of the rocket in kilometers per hour.
         distance_traveled (float): The distance traveled by the rocket.
         elapsed_time (int): The elapsed time since launch in seconds.
+        clock (Clock): The clock providing the simulated time of the flight.
+        telemetry (TelemetryRing): The most recent status samples of the flight.
+        profile (FlightProfile): The precomputed trajectory of the flight configuration, or None.
+        tick_policy (str): What happens to the ticks missed when the flight falls behind its clock, one of
+            ticker.POLICIES.
+        tick_metrics (TickMetrics): Collects the lateness and jitter of the ticks, or None.
+        publisher (BusPublisher): Publishes the latest status of the flight on a telemetry bus, or None.
         __flight_time (float): The start time of the rocket's flight.
+        __landing_time (float): The time at which the rocket's flight ended.
 
     Methods:
         prepare_for_launch(): Prepares the rocket for launch by initializing LaunchControl.
-        launch(): Initiates the rocket launch process and yields status information.
+        start_flight(): Resets the flight progress and records the start time of the flight.
+        resume_flight(resume): Starts the flight, unless a restored flight is being resumed.
+        finish_flight(): Records the time at which the flight ended.
+        launch(resume): Initiates the rocket launch process and yields status information.
+        launch_async(resume): Initiates the rocket launch process and yields status information without blocking the event loop.
+        tick_scheduler(): Creates the scheduler pacing the ticks of a flight.
+        run_ticks(ticks): Runs ticks of the flight back to back.
+        resolve_flight(): Flies the whole flight in one step, without statuses.
+        advance(elapsed_time): Moves the rocket to the state it has after the given number of ticks.
+        arrival_iteration(): Calculates the tick at which the rocket reaches its destination.
         summary(): Retrieves the summary of the mission after completion.
+        flight_result(): Tells how the flight ended.
         explode_iteration(): Calculates the iteration at which the rocket will explode, if applicable.
         flight_time(): Calculates the elapsed flight time of the rocket.
         status(): Retrieves the current status of the rocket.
@@ -27,9 +62,24 @@ class Rocket:
         calculate_time_to_destination(): Calculates the estimated time remaining to reach the destination.
         calculate_distance_traveled(): Calculates the distance traveled by the rocket.
         calculate_total_fuel_burned(): Calculates the total amount of fuel burned by the rocket.
+        snapshot(): Serializes the state of the rocket into a compact binary snapshot.
+        from_snapshot(data, rng, clock, decisions): Restores a rocket from a snapshot.
     """
 
-    def __init__(self, distance, burn_rate, average_speed):
+    def __init__(
+        self,
+        distance,
+        burn_rate,
+        average_speed,
+        rng=None,
+        clock=None,
+        telemetry_capacity=60,
+        decisions=None,
+        profile=None,
+        tick_policy="coalesce",
+        tick_metrics=None,
+        publisher=None,
+    ):
         """
         Initializes a new Rocket object with provided parameters.
 
@@ -37,17 +87,38 @@ class Rocket:
             distance (float): The total distance the rocket needs to travel.
             burn_rate (float): The fuel burn rate of the rocket in liters per minute.
             average_speed (float): The average speed of the rocket in kilometers per hour.
+            rng (random.Random): The random number generator used by LaunchControl (default: None).
+            clock (Clock): The clock providing the simulated time of the flight (default: real time).
+            telemetry_capacity (int): The number of recent status samples kept (default: 60).
+            decisions (DecisionProvider): Answers the launch stage questions (default: the operator on the terminal).
+            profile (FlightProfile): The precomputed trajectory of the configuration, e.g. from
+                flight_profile.profiles (default: None, the trajectory is calculated).
+            tick_policy (str): What happens to the ticks missed when the flight falls behind its clock: they
+                are run at once with "coalesce" or dropped with "skip" (default: "coalesce").
+            tick_metrics (TickMetrics): Collects the lateness and jitter of the ticks, e.g. one shared by
+                every rocket of a session (default: None).
+            publisher (BusPublisher): Publishes the latest status of every flight, e.g. claimed from a
+                telemetry_bus.TelemetryBus watched by a monitor process (default: None).
         """
-        self.launch_control = LaunchControl()
+        self.launch_control = LaunchControl(rng, decisions)
         self.distance = distance
         self.burn_rate = burn_rate
         self.average_speed = average_speed
         self.distance_traveled = 0
         self.elapsed_time = 0
+        self.clock = RealTimeClock() if clock is None else clock
+        self.telemetry = TelemetryRing(telemetry_capacity)
+        self.profile = profile
+        self.tick_policy = tick_policy
+        self.tick_metrics = tick_metrics
+        self.publisher = publisher
         self.__flight_time = None
+        self.__landing_time = None
 
     @classmethod
-    def prepare_for_launch(cls, distance, burn_rate, average_speed):
+    def prepare_for_launch(
+        cls, distance, burn_rate, average_speed, rng=None, clock=None, decisions=None, profile=None
+    ):
         """
         Creates a new instance of the Rocket class and prepares it for launch.
 
@@ -55,11 +126,15 @@ class Rocket:
             distance (float): The total distance the rocket needs to travel.
             burn_rate (float): The fuel burn rate of the rocket in liters per minute.
             average_speed (float): The average speed of the rocket in kilometers per hour.
+            rng (random.Random): The random number generator used by LaunchControl (default: None).
+            clock (Clock): The clock providing the simulated time of the flight (default: real time).
+            decisions (DecisionProvider): Answers the launch stage questions (default: the operator on the terminal).
+            profile (FlightProfile): The precomputed trajectory of the configuration (default: None).
 
         Returns:
             Rocket: A new instance of the Rocket class.
         """
-        rocket = cls(distance, burn_rate, average_speed)
+        rocket = cls(distance, burn_rate, average_speed, rng, clock, decisions=decisions, profile=profile)
         rocket()
 
         return rocket
@@ -70,33 +145,206 @@ class Rocket:
         """
         self.launch_control.prepare_for_launch()
 
-    def launch(self):
+    def start_flight(self):
+        """
+        Resets the flight progress and records the start time of the flight.
+        """
+        self.elapsed_time = 0
+        self.distance_traveled = 0
+        self.telemetry.clear()
+        self.__flight_time = self.clock.now()
+        self.__landing_time = None
+
+    def resume_flight(self, resume):
+        """
+        Starts the flight, unless a flight restored from a snapshot is being resumed.
+
+        Args:
+            resume (bool): Whether a restored flight is being resumed.
+
+        Returns:
+            bool: True if the flight has to go on, False if the resumed flight has already ended.
+        """
+        if not resume or self.__flight_time is None:
+            self.start_flight()
+            return True
+        return self.__landing_time is None
+
+    def finish_flight(self):
+        """
+        Records the time at which the flight ended, so later summaries do not keep counting.
+        """
+        self.__landing_time = self.clock.now()
+
+    def launch(self, resume=False):
         """
         Initiates the rocket launch process and yields status information.
 
+        Args:
+            resume (bool): Continues a flight restored by from_snapshot instead of starting over (default: False).
+
         Yields:
-            dict: Status information containing current rocket parameters.
+            TelemetryRecord: Status information containing current rocket parameters.
         """
-        self.elapsed_time = 0
-        self.distance_traveled = 0
-        self.__flight_time = time.time()
+        publisher = self.publisher
+        try:
+            if not self.resume_flight(resume):
+                return
+            scheduler = self.tick_scheduler()
+            ticks = 1
+            if resume and self.elapsed_time:
+                # The snapshot was taken after a status, before waiting for the next tick.
+                ticks = scheduler.wait()
+            metrics = instrumentation.active()
+
+            while not self.reached_destination():
+                if metrics is not None:
+                    tick_started_at = time.perf_counter()
+
+                status = self.run_ticks(ticks)
+                if status is None:
+                    self.launch_control.decisions.announce("Exploded!")
+                    if metrics is not None:
+                        metrics.count("explosion")
+                    break
+
+                if publisher is not None:
+                    publisher.publish(status)
+                if metrics is not None:
+                    metrics.observe("flight.tick", time.perf_counter() - tick_started_at)
+                    metrics.count("ticks")
+                yield status
+
+                if metrics is not None:
+                    sleep_started_at = time.perf_counter()
+                ticks = scheduler.wait()
+                if metrics is not None:
+                    metrics.observe("flight.sleep", time.perf_counter() - sleep_started_at)
+
+            if metrics is not None and self.reached_destination():
+                metrics.count("arrival")
+            self.finish_flight()
+        finally:
+            # Hands the bus slot back however the flight ends, including when it is closed or cancelled.
+            if publisher is not None:
+                publisher.finish(self.flight_result(), self.status())
+
+    async def launch_async(self, resume=False):
+        """
+        Initiates the rocket launch process like launch, but waits on the clock asynchronously so many
+        rockets can fly concurrently on one event loop.
+
+        Args:
+            resume (bool): Continues a flight restored by from_snapshot instead of starting over (default: False).
+
+        Yields:
+            TelemetryRecord: Status information containing current rocket parameters.
+        """
+        publisher = self.publisher
+        try:
+            if not self.resume_flight(resume):
+                return
+            scheduler = self.tick_scheduler()
+            ticks = 1
+            if resume and self.elapsed_time:
+                ticks = await scheduler.wait_async()
+            metrics = instrumentation.active()
+
+            while not self.reached_destination():
+                if metrics is not None:
+                    tick_started_at = time.perf_counter()
+
+                status = self.run_ticks(ticks)
+                if status is None:
+                    self.launch_control.decisions.announce("Exploded!")
+                    if metrics is not None:
+                        metrics.count("explosion")
+                    break
+
+                if publisher is not None:
+                    publisher.publish(status)
+                if metrics is not None:
+                    metrics.observe("flight.tick", time.perf_counter() - tick_started_at)
+                    metrics.count("ticks")
+                yield status
+
+                if metrics is not None:
+                    sleep_started_at = time.perf_counter()
+                ticks = await scheduler.wait_async()
+                if metrics is not None:
+                    metrics.observe("flight.sleep", time.perf_counter() - sleep_started_at)
+
+            if metrics is not None and self.reached_destination():
+                metrics.count("arrival")
+            self.finish_flight()
+        finally:
+            # Hands the bus slot back however the flight ends, including when it is closed or cancelled.
+            if publisher is not None:
+                publisher.finish(self.flight_result(), self.status())
+
+    def tick_scheduler(self):
+        """
+        Creates the scheduler pacing the ticks of a flight, anchored at the current time.
+
+        Returns:
+            TickScheduler: The scheduler.
+        """
+        scheduler = TickScheduler(self.clock, policy=self.tick_policy, metrics=self.tick_metrics)
+        scheduler.start()
+        return scheduler
+
+    def run_ticks(self, ticks):
+        """
+        Runs ticks of the flight back to back, stopping at an explosion or at the destination. Every tick is
+        kept in the telemetry ring; more than one tick runs at once when missed ticks are coalesced.
+
+        Args:
+            ticks (int): The number of ticks to run.
 
-        while not self.reached_destination():
+        Returns:
+            TelemetryRecord: The status after the last tick, or None if the rocket exploded.
+        """
+        for _ in range(ticks):
             if self.explode_iteration() == self.elapsed_time:
-                print("Exploded!")
-                break
+                return None
 
             self.elapsed_time += 1
             self.distance_traveled += self.calculate_distance_traveled()
-            yield self.status()
-            time.sleep(1)
+            status = self.status()
+            self.telemetry.append(status)
+            if self.reached_destination():
+                break
+        return status
+
+    def resolve_flight(self):
+        """
+        Flies the whole flight in one step on a VirtualClock: draws the explosion iteration like
+        FlightScheduler.schedule, then jumps to the explosion or the arrival. With a profile, the end of the
+        flight is a single table lookup.
+
+        Returns:
+            bool: True if the rocket reached its destination, False if it exploded.
+        """
+        self.clock = VirtualClock()
+        self.start_flight()
+        arrival = self.arrival_iteration()
+        explosion = self.launch_control.explosion_iteration(self.distance, self.current_speed(), arrival)
+        end = arrival if explosion is None else explosion
+
+        self.advance(end)
+        self.clock.sleep(end)
+        self.finish_flight()
+        instrumentation.count("arrival" if explosion is None else "explosion")
+        return explosion is None
 
     def summary(self):
         """
         Retrieves the summary of the mission after completion.
 
         Returns:
-            dict: A dictionary containing summary information of the mission.
+            dict: A dictionary containing summary information of the mission. Its arrived entry is how the
+                flight ended: True if the rocket reached its destination, False if it exploded on the way,
+                None if it never flew or is still flying.
         """
         return {
             "total_distance": self.distance_traveled,
@@ -104,8 +352,21 @@ class Rocket:
             "no_explosions": 1 if self.launch_control.explode() else 0,
             "total_fuel_burned": self.calculate_total_fuel_burned(),
             "flight_time": self.flight_time,
+            "arrived": self.flight_result(),
         }
 
+    def flight_result(self):
+        """
+        Tells how the flight ended.
+
+        Returns:
+            bool: True if the rocket reached its destination, False if it exploded on the way, None if it
+                never flew or its flight has not ended, e.g. because it was interrupted.
+        """
+        if self.__landing_time is None:
+            return None
+        return self.reached_destination()
+
     def explode_iteration(self):
         """
         Calculates the iteration at which the rocket will explode, if applicable.
@@ -115,30 +376,74 @@ class Rocket:
         """
         return self.launch_control.rand_launch_iteration(self.distance, self.current_speed())
 
+    def advance(self, elapsed_time):
+        """
+        Moves the rocket to the state it has after the given number of ticks without stepping
+        through the ticks in between.
+
+        Each tick adds current_speed() * elapsed_time, so after n ticks the rocket has traveled
+        current_speed() * n * (n + 1) / 2. With a profile, the distance is read from the table instead, which
+        holds the exact sums Rocket.launch accumulates.
+
+        Args:
+            elapsed_time (int): The number of ticks since launch.
+        """
+        self.elapsed_time = elapsed_time
+        profile = self.profile
+        if profile is not None and elapsed_time <= profile.arrival:
+            self.distance_traveled = profile.distance_traveled[elapsed_time]
+        else:
+            self.distance_traveled = self.current_speed() * elapsed_time * (elapsed_time + 1) / 2
+
+    def arrival_iteration(self):
+        """
+        Calculates the tick at which the rocket reaches its destination.
+
+        Returns:
+            int: The smallest number of ticks after which the rocket has reached its destination.
+        """
+        if self.profile is not None:
+            return self.profile.arrival
+
+        ratio = self.distance / self.current_speed()
+        iteration = max(0, math.ceil((math.sqrt(1 + 8 * ratio) - 1) / 2))
+
+        while iteration > 0 and (iteration - 1) * iteration / 2 >= ratio:
+            iteration -= 1
+        while iteration * (iteration + 1) / 2 < ratio:
+            iteration += 1
+
+        return iteration
+
     @property
     def flight_time(self):
         """
-        Calculates the elapsed flight time of the rocket.
+        Calculates the elapsed flight time of the rocket on its clock.
 
         Returns:
-            float: The elapsed flight time in seconds.
+            float: The elapsed flight time in simulated seconds, or 0 if the rocket has not been launched.
         """
-        return time.time() - self.__flight_time
+        if self.__flight_time is None:
+            return 0
+        if self.__landing_time is None:
+            return self.clock.now() - self.__flight_time
+        return self.__landing_time - self.__flight_time
 
     def status(self):
         """
         Retrieves the current status of the rocket.
 
         Returns:
-            dict: Current status information including elapsed time, distance traveled, etc.
+            TelemetryRecord: Current status information including elapsed time, distance traveled, etc.,
+                readable by key like a dict.
         """
-        return {
-            "elapsed_time": self.elapsed_time,
-            "distance_traveled": self.distance_traveled,
-            "current_fuel_burn_rate": self.burn_rate / 60,
-            "current_speed": self.average_speed,
-            "time_to_destination": self.calculate_time_to_destination(),
-        }
+        return TelemetryRecord(
+            self.elapsed_time,
+            self.distance_traveled,
+            self.burn_rate / 60,
+            self.average_speed,
+            self.calculate_time_to_destination(),
+        )
 
     def reached_destination(self):
         """
@@ -186,3 +491,87 @@ class Rocket:
             float: The total amount of fuel burned by the rocket in liters.
         """
         return (self.burn_rate * self.elapsed_time) / 60
+
+    def snapshot(self):
+        """
+        Serializes the state of the rocket and of its LaunchControl, including the random number generator
+        and the telemetry ring, into a compact binary snapshot. Taken between two statuses of a flight, e.g.
+        right after launch yields one, it lets from_snapshot resume the flight with exactly the same
+        remaining statuses and outcome.
+
+        Returns:
+            bytes: The snapshot.
+
+        Raises:
+            NotImplementedError: If the random number generator cannot save its state, like tape.RecordingRandom.
+        """
+        values = (self.distance, self.burn_rate, self.average_speed, self.distance_traveled)
+        integers = sum(1 << index for index, value in enumerate(values) if isinstance(value, int))
+        launch_control = self.launch_control
+        explode_result = -1 if launch_control.explode_result is None else int(launch_control.explode_result)
+        _, state, gauss_next = launch_control.rng.getstate()
+
+        header = SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC,
+            integers,
+            *values,
+            self.elapsed_time,
+            math.nan if self.__flight_time is None else self.flight_time,
+            self.__landing_time is not None,
+            launch_control.aborted,
+            explode_result,
+            launch_control.abort_count,
+            math.nan if gauss_next is None else gauss_next,
+        )
+        return b"".join((header, array("I", state).tobytes(), self.telemetry.to_bytes()))
+
+    @classmethod
+    def from_snapshot(cls, data, rng=None, clock=None, decisions=None):
+        """
+        Restores a rocket from a snapshot. The flight time already flown is carried over to the new clock,
+        and launch(resume=True) continues the flight where the snapshot was taken.
+
+        Args:
+            data (bytes-like): The snapshot, as returned by snapshot.
+            rng (random.Random): The random number generator receiving the snapshot state (default: a new one).
+            clock (Clock): The clock the rest of the flight runs on (default: real time).
+            decisions (DecisionProvider): Answers the launch stage questions (default: the operator on the terminal).
+
+        Returns:
+            Rocket: The restored rocket.
+        """
+        data = memoryview(data)
+        (
+            magic, integers, distance, burn_rate, average_speed, distance_traveled, elapsed_time,
+            flight_time, landed, aborted, explode_result, abort_count, gauss_next,
+        ) = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a rocket snapshot")
+
+        distance, burn_rate, average_speed, distance_traveled = (
+            int(value) if integers >> index & 1 else value
+            for index, value in enumerate((distance, burn_rate, average_speed, distance_traveled))
+        )
+
+        offset = SNAPSHOT_HEADER.size
+        state = array("I")
+        state.frombytes(data[offset:offset + RNG_STATE_SIZE])
+        rng = random.Random() if rng is None else rng
+        rng.setstate((rng.VERSION, tuple(state), None if math.isnan(gauss_next) else gauss_next))
+
+        rocket = cls(distance, burn_rate, average_speed, rng, clock, decisions=decisions)
+        rocket.distance_traveled = distance_traveled
+        rocket.elapsed_time = elapsed_time
+        rocket.telemetry = TelemetryRing.from_bytes(data[offset + RNG_STATE_SIZE:])
+
+        launch_control = rocket.launch_control
+        launch_control.aborted = aborted
+        launch_control.abort_count = abort_count
+        launch_control.explode_result = None if explode_result < 0 else bool(explode_result)
+
+        if not math.isnan(flight_time):
+            now = rocket.clock.now()
+            rocket.__flight_time = now - flight_time
+            if landed:
+                rocket.__landing_time = now
+        return rocket
@@ -0,0 +1,135 @@
+import heapq
+import itertools
+from collections import namedtuple
+
+import instrumentation
+from clock import VirtualClock
+
+
+class FlightEvent(namedtuple("FlightEvent", ["time", "kind", "rocket"])):
+    """
+    Represents a meaningful moment in the flight of a rocket.
+
+    Attributes:
+        time (float): The scheduler time at which the event happens, in seconds.
+        kind (str): One of FlightScheduler.STATUS, FlightScheduler.EXPLOSION or FlightScheduler.ARRIVAL.
+        rocket (Rocket): The rocket the event belongs to, already advanced to the event time.
+    """
+
+    __slots__ = ()
+
+
+class FlightScheduler:
+    """
+    Flies many rockets on one priority queue, jumping straight from one flight event to the next.
+
+    Rocket.launch ticks once per simulated second and draws a random number on every tick. The scheduler
+    instead draws the explosion iteration of each rocket once when it is scheduled, and only wakes up for
+    status emissions, explosions and arrivals. Its cost depends on the number of events, not on the
+    number of simulated seconds.
+
+    Scheduled rockets are moved onto the scheduler clock. With the default VirtualClock the events are
+    processed as fast as possible; with a real-time or scaled clock the scheduler waits for each event.
+
+    Attributes:
+        clock (Clock): The clock the scheduled rockets fly on.
+        now (float): The current scheduler time in seconds.
+
+    Methods:
+        schedule(rocket, status_interval): Starts the flight of a rocket at the current scheduler time.
+        run(): Processes the scheduled events in time order and yields them.
+    """
+
+    STATUS = "status"
+    EXPLOSION = "explosion"
+    ARRIVAL = "arrival"
+
+    # Status emissions sort before the explosion or arrival happening at the same time.
+    PRIORITIES = {STATUS: 0, EXPLOSION: 1, ARRIVAL: 1}
+
+    def __init__(self, clock=None):
+        """
+        Initializes a new FlightScheduler object with an empty event queue.
+
+        Args:
+            clock (Clock): The clock the scheduled rockets fly on (default: a new VirtualClock).
+        """
+        self.clock = VirtualClock() if clock is None else clock
+        self.now = self.clock.now()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._flights = {}
+
+    def __len__(self):
+        """
+        Returns:
+            int: The number of rockets still in flight.
+        """
+        return len(self._flights)
+
+    def schedule(self, rocket, status_interval=1):
+        """
+        Starts the flight of a rocket at the current scheduler time.
+
+        Args:
+            rocket (Rocket): A rocket that has been prepared for launch.
+            status_interval (int): The number of seconds between status emissions, or None for no status
+                emissions (default: 1, matching the rate at which Rocket.launch yields).
+        """
+        rocket.clock = self.clock
+        rocket.start_flight()
+        arrival = rocket.arrival_iteration()
+        explosion = rocket.launch_control.explosion_iteration(rocket.distance, rocket.current_speed(), arrival)
+
+        if explosion is None:
+            kind, end = self.ARRIVAL, arrival
+        else:
+            kind, end = self.EXPLOSION, explosion
+
+        flight = (self.now, end, status_interval)
+        self._flights[id(rocket)] = flight
+        self._push(self.now + end, kind, rocket)
+        self._push_status(rocket, flight, 0)
+
+    def run(self):
+        """
+        Processes the scheduled events in time order and yields them.
+
+        Rockets may be scheduled while the events are being consumed; they start at the time of the
+        event being processed.
+
+        Yields:
+            FlightEvent: The next event, with its rocket advanced to the event time.
+        """
+        while self._queue:
+            time, _, _, kind, rocket = heapq.heappop(self._queue)
+            flight = self._flights[id(rocket)]
+            start = flight[0]
+
+            delay = time - self.clock.now()
+            if delay > 0:
+                self.clock.sleep(delay)
+
+            self.now = time
+            rocket.advance(time - start)
+
+            if kind == self.STATUS:
+                self._push_status(rocket, flight, time - start)
+            else:
+                rocket.finish_flight()
+                del self._flights[id(rocket)]
+                instrumentation.count(kind)
+
+            yield FlightEvent(time, kind, rocket)
+
+    def _push(self, time, kind, rocket):
+        heapq.heappush(self._queue, (time, self.PRIORITIES[kind], next(self._sequence), kind, rocket))
+
+    def _push_status(self, rocket, flight, elapsed_time):
+        start, end, status_interval = flight
+        if status_interval is None:
+            return
+
+        next_status = elapsed_time + status_interval
+        if next_status <= end:
+            self._push(start + next_status, self.STATUS, rocket)
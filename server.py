@@ -0,0 +1,676 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import deque
+
+from clock import create_clock
+from decisions import DecisionProvider
+from mission import Mission
+from mission_control import MissionControl
+from rocket import Rocket
+
+# Launch stages in the order they have to be confirmed, with the LaunchControl method each one runs.
+STAGES = {
+    "afterburner": "engage_afterburner",
+    "release_structure": "disengage_release_structure",
+    "cross_checks": "perform_cross_checks",
+    "launch": "launch",
+}
+STAGE_ORDER = tuple(STAGES)
+
+# The Mission keyword arguments a client can set when creating a mission.
+MISSION_PARAMETERS = (
+    "travel_distance", "payload_capacity", "fuel_capacity", "burn_rate", "average_speed", "random_seed", "mission_name",
+)
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict"}
+
+
+class HTTPError(Exception):
+    """
+    Raised while handling a request to answer it with an error status.
+
+    Attributes:
+        status (int): The HTTP status code.
+        message (str): The error message sent to the client.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SessionDecisions(DecisionProvider):
+    """
+    Answers the questions of a stage transition with the answer sent by the client, and publishes the
+    announcements to the telemetry stream of the session.
+    """
+
+    def __init__(self, session):
+        """
+        Initializes a new SessionDecisions object.
+
+        Args:
+            session (MissionSession): The session receiving the announcements.
+        """
+        super().__init__(echo=False)
+        self.session = session
+        self.reply = "no"
+
+    def answer(self, key, question):
+        return self.reply
+
+    def announce(self, message):
+        self.session.publish({"event": message})
+
+
+class MissionSession:
+    """
+    A mission driven over the network. Its launch stages are confirmed one request at a time, in order,
+    and its flight runs as a task on the server event loop, publishing every status to the subscribers of
+    its telemetry stream.
+
+    Attributes:
+        id (int): The id of the session.
+        mission (Mission): The mission.
+        rocket (Rocket): The rocket of the mission.
+        stage (int): The position in STAGE_ORDER of the next stage to confirm.
+        state (str): "preparing", "flying", "aborted" or "finished".
+        touched_at (float): The monotonic time of the last request about the session.
+        finished_at (float): The monotonic time the mission was aborted or finished, or None.
+
+    Methods:
+        describe(): Retrieves the state of the session as a JSON-serializable dict.
+        transition(stage, confirm): Answers the next launch stage.
+        publish(event): Sends an event to the telemetry subscribers.
+        stream(): Yields the telemetry events of the session, starting with the recent ones.
+    """
+
+    def __init__(self, session_id, mission, clock, on_finish, history=64, backlog=256):
+        """
+        Initializes a new MissionSession object.
+
+        Args:
+            session_id (int): The id of the session.
+            mission (Mission): The mission, which gets the session decision provider.
+            clock (Clock): The clock the flight runs on.
+            on_finish (callable): Called with the mission once it has a summary.
+            history (int): The number of recent events replayed to a new subscriber (default: 64).
+            backlog (int): The number of events a slow subscriber can fall behind before the oldest are
+                dropped (default: 256).
+        """
+        self.id = session_id
+        self.mission = mission
+        self.mission.decisions = SessionDecisions(self)
+        self.rocket = Rocket(
+            mission.travel_distance,
+            mission.burn_rate,
+            mission.average_speed,
+            rng=random.Random(mission.random_seed),
+            clock=clock,
+            decisions=mission.decisions,
+        )
+        self.stage = 0
+        self.state = "preparing"
+        self.touched_at = time.monotonic()
+        self.finished_at = None
+        self._on_finish = on_finish
+        self._history = deque(maxlen=history)
+        self._backlog = backlog
+        self._subscribers = set()
+        self._task = None
+
+    def describe(self):
+        """
+        Retrieves the state of the session.
+
+        Returns:
+            dict: The id, mission name, state, next stage and summary of the session.
+        """
+        return {
+            "id": self.id,
+            "mission_name": self.mission.mission_name,
+            "state": self.state,
+            "next_stage": STAGE_ORDER[self.stage] if self.stage < len(STAGE_ORDER) else None,
+            "summary": self.mission.summary,
+        }
+
+    def transition(self, stage, confirm):
+        """
+        Answers the next launch stage. A declined stage can be answered again; a confirmed launch starts the
+        flight, unless LaunchControl aborts it.
+
+        Args:
+            stage (str): The stage, which has to be the next one in STAGE_ORDER.
+            confirm (bool): Whether the operator confirms the stage.
+
+        Returns:
+            dict: The stage, whether it was confirmed, and the new state of the session.
+        """
+        if stage not in STAGES:
+            raise HTTPError(404, f"unknown stage {stage!r}")
+        if self.state != "preparing":
+            raise HTTPError(409, f"mission is {self.state}")
+        if stage != STAGE_ORDER[self.stage]:
+            raise HTTPError(409, f"expected stage {STAGE_ORDER[self.stage]!r}")
+
+        launch_control = self.rocket.launch_control
+        self.mission.decisions.reply = "yes" if confirm else "no"
+        confirmed = getattr(launch_control, STAGES[stage])()
+
+        if confirmed:
+            self.stage += 1
+            if stage == "launch":
+                self.state = "flying"
+                self.mission.started_at = time.time()
+                self._task = asyncio.get_running_loop().create_task(self._fly())
+        elif launch_control.aborted:
+            self._finish("aborted")
+
+        return {"stage": stage, "confirmed": confirmed, "state": self.state}
+
+    def publish(self, event):
+        """
+        Sends an event to the telemetry subscribers, dropping the oldest event of a subscriber that fell
+        too far behind.
+
+        Args:
+            event (dict): The event, or None to end the streams.
+        """
+        if event is not None:
+            self._history.append(event)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def stream(self):
+        """
+        Yields the telemetry events of the session: the recent ones first, then the live ones until the
+        mission ends.
+
+        Yields:
+            dict: A {"status": ...}, {"event": ...} or, last, a {"summary": ...} event.
+        """
+        history = list(self._history)
+        if self.state in ("aborted", "finished"):
+            for event in history:
+                yield event
+            return
+
+        queue = asyncio.Queue(maxsize=self._backlog)
+        self._subscribers.add(queue)
+        try:
+            for event in history:
+                yield event
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _fly(self):
+        async for status in self.rocket.launch_async():
+            self.publish({"status": dict(status)})
+        self._finish("finished")
+
+    def _finish(self, state):
+        self.state = state
+        self.finished_at = time.monotonic()
+        self.mission.summary = self.rocket.summary()
+        self.publish({"summary": self.mission.summary})
+        self.publish(None)
+        self._on_finish(self.mission)
+
+
+class MissionServer:
+    """
+    Serves Mission Control over HTTP/1.1 on an asyncio event loop, so many operators and automated
+    clients can run missions at once over keep-alive connections.
+
+    Routes:
+        POST /missions: Creates a mission from optional JSON Mission parameters.
+        GET /missions/{id}: Retrieves the state of a mission.
+        POST /missions/{id}/stages/{stage}: Answers a launch stage with {"confirm": true or false}.
+        GET /missions/{id}/telemetry: Streams the mission events as chunked JSON lines.
+        GET /summary: Retrieves the outcome counts and totals of the finished missions.
+
+    Attributes:
+        host (str): The interface the server listens on.
+        port (int): The port the server listens on; 0 picks a free one when the server starts.
+        clock (str): The clock mode of the flights: "real", "instant" or a time-warp factor like "100x".
+        control (MissionControl): Records the finished missions.
+        sessions (dict): Session ids mapped to their MissionSession, for the sessions not evicted yet.
+        finished_ttl (float): The number of seconds a finished or aborted session stays readable.
+        idle_ttl (float): The number of seconds a session can wait for its next launch stage before it is
+            abandoned.
+
+    Methods:
+        start(): Starts listening.
+        serve_forever(): Starts listening and serves until cancelled.
+        close(): Stops listening and closes the open connections.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8080,
+        clock="real",
+        random_seed=12,
+        retain_missions=True,
+        finished_ttl=60,
+        idle_ttl=600,
+    ):
+        """
+        Initializes a new MissionServer object.
+
+        Args:
+            host (str): The interface to listen on (default: "127.0.0.1").
+            port (int): The port to listen on, or 0 for a free one (default: 8080).
+            clock (str): The clock mode of the flights (default: "real").
+            random_seed (int): The base seed of the missions created without a random_seed (default: 12).
+            retain_missions (bool): Whether finished missions are kept in the mission store (default: True).
+            finished_ttl (float): The number of seconds a finished or aborted session stays readable, e.g.
+                for its summary and telemetry (default: 60).
+            idle_ttl (float): The number of seconds a session can wait for its next launch stage before it
+                is abandoned (default: 600).
+        """
+        self.host = host
+        self.port = port
+        self.clock = clock
+        self.control = MissionControl(random_seed=random_seed, retain_missions=retain_missions)
+        self.sessions = {}
+        self.finished_ttl = finished_ttl
+        self.idle_ttl = idle_ttl
+        self._session_ids = itertools.count(1)
+        self._swept_at = time.monotonic()
+        self._server = None
+        self._connections = set()
+
+    async def start(self):
+        """
+        Starts listening, and sets port to the actual port.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Starts listening and serves until cancelled.
+        """
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening, closes the open connections and waits for the listening socket to close.
+        """
+        self._server.close()
+        for writer in self._connections:
+            writer.close()
+        await self._server.wait_closed()
+
+    def create_session(self, parameters):
+        """
+        Creates a mission session.
+
+        Args:
+            parameters (dict): Mission keyword arguments from MISSION_PARAMETERS.
+
+        Returns:
+            MissionSession: The new session.
+        """
+        unknown = set(parameters) - set(MISSION_PARAMETERS)
+        if unknown:
+            raise HTTPError(400, f"unknown mission parameters: {', '.join(sorted(unknown))}")
+        for name, value in parameters.items():
+            expected = str if name == "mission_name" else (int, float)
+            if not isinstance(value, expected) or isinstance(value, bool):
+                raise HTTPError(400, f"invalid value for {name}: {value!r}")
+
+        self._evict()
+        session_id = next(self._session_ids)
+        parameters = {
+            "random_seed": self.control.random_seed + session_id - 1,
+            "mission_name": f"Mission {session_id}",
+            **parameters,
+        }
+        session = MissionSession(session_id, Mission(**parameters), create_clock(self.clock), self.control.record_mission)
+        self.sessions[session_id] = session
+        return session
+
+    def summary(self):
+        """
+        Retrieves the outcome counts and totals of the finished missions.
+
+        Returns:
+            dict: The number of missions, the count per outcome, the number of missions with an abort and
+                the total of every summary field.
+        """
+        statistics = self.control.statistics
+        return {
+            "missions": self.control.mission_count,
+            "outcomes": self.control.missions.counts,
+            "aborts": self.control.missions.aborts,
+            "totals": {field: getattr(statistics, field).total for field in statistics.FIELDS},
+        }
+
+    def route(self, method, path, body):
+        """
+        Handles a request.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path.
+            body (bytes): The request body.
+
+        Returns:
+            tuple: The status code and either a JSON-serializable payload or an async iterator of events.
+        """
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+
+        if parts == ["summary"]:
+            self._allow(method, "GET")
+            return 200, self.summary()
+
+        if not parts or parts[0] != "missions":
+            raise HTTPError(404, f"no route for {path}")
+
+        if len(parts) == 1:
+            self._allow(method, "POST")
+            return 201, self.create_session(self._json(body)).describe()
+
+        session = self._session(parts[1])
+        if len(parts) == 2:
+            self._allow(method, "GET")
+            return 200, session.describe()
+        if len(parts) == 3 and parts[2] == "telemetry":
+            self._allow(method, "GET")
+            return 200, session.stream()
+        if len(parts) == 4 and parts[2] == "stages":
+            self._allow(method, "POST")
+            return 200, session.transition(parts[3], bool(self._json(body).get("confirm", True)))
+
+        raise HTTPError(404, f"no route for {path}")
+
+    async def _handle(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    body = await reader.readexactly(int(headers.get("content-length", 0)))
+                    status, payload = self.route(method, path, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+                except ValueError:
+                    status, payload = 400, {"error": "malformed request"}
+
+                if hasattr(payload, "__aiter__"):
+                    await self._stream(writer, payload)
+                else:
+                    self._respond(writer, status, payload)
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _respond(writer, status, payload):
+        body = json.dumps(payload).encode()
+        head = f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        writer.write(head.encode() + body)
+
+    @staticmethod
+    async def _stream(writer, events):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n")
+        async for event in events:
+            line = json.dumps(event).encode() + b"\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def _allow(method, allowed):
+        if method != allowed:
+            raise HTTPError(405, f"use {allowed}")
+
+    @staticmethod
+    def _json(body):
+        if not body:
+            return {}
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            raise HTTPError(400, "the body is not valid JSON") from None
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "the body must be a JSON object")
+        return payload
+
+    def _session(self, session_id):
+        try:
+            session = self.sessions[int(session_id)]
+        except (KeyError, ValueError):
+            raise HTTPError(404, f"no mission {session_id}") from None
+        session.touched_at = time.monotonic()
+        return session
+
+    def _evict(self):
+        # Scans the sessions at most once a second, so a burst of new missions does not pay for it each time.
+        # Flying sessions stay until they finish.
+        now = time.monotonic()
+        if now - self._swept_at < 1:
+            return
+        self._swept_at = now
+        expired = [
+            session_id
+            for session_id, session in self.sessions.items()
+            if (session.finished_at is not None and now - session.finished_at > self.finished_ttl)
+            or (session.state == "preparing" and now - session.touched_at > self.idle_ttl)
+        ]
+        for session_id in expired:
+            del self.sessions[session_id]
+
+
+class HTTPClient:
+    """
+    A minimal HTTP/1.1 client keeping one connection to a MissionServer open.
+
+    Methods:
+        connect(host, port): Opens a connection.
+        request(method, path, payload): Sends a request and reads a JSON response.
+        stream(path): Sends a GET request and yields the events of a chunked JSON-lines response.
+        close(): Closes the connection.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host, port):
+        """
+        Opens a connection.
+
+        Args:
+            host (str): The server host.
+            port (int): The server port.
+
+        Returns:
+            HTTPClient: The connected client.
+        """
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, method, path, payload=None):
+        """
+        Sends a request and reads a JSON response.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path.
+            payload (dict): The JSON body (default: None).
+
+        Returns:
+            tuple: The status code and the decoded JSON payload.
+        """
+        self._send(method, path, payload)
+        status, headers = await self._read_head()
+        body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, json.loads(body) if body else None
+
+    async def stream(self, path):
+        """
+        Sends a GET request and yields the events of a chunked JSON-lines response.
+
+        Args:
+            path (str): The request path.
+
+        Yields:
+            dict: The events.
+        """
+        self._send("GET", path, None)
+        await self._read_head()
+        while size := int((await self.reader.readline()).strip(), 16):
+            chunk = await self.reader.readexactly(size + 2)
+            yield json.loads(chunk[:-2])
+        await self.reader.readline()
+
+    async def close(self):
+        """
+        Closes the connection.
+        """
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    def _send(self, method, path, payload):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+        self.writer.write(head.encode() + body)
+
+    async def _read_head(self):
+        status = int((await self.reader.readline()).split(b" ", 2)[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+
+async def generate_load(host, port, clients=100, missions=20, telemetry=False):
+    """
+    Runs missions against a server from many concurrent clients and measures the request latencies. Every
+    client keeps one connection open and, for each mission, creates it, confirms its launch stages, reads
+    its telemetry stream if asked and fetches its final state.
+
+    Args:
+        host (str): The server host.
+        port (int): The server port.
+        clients (int): The number of concurrent clients (default: 100).
+        missions (int): The number of missions run by each client (default: 20).
+        telemetry (bool): Whether the clients read the telemetry stream of every mission (default: False).
+
+    Returns:
+        dict: The number of requests and errors, the duration, the requests per second and the p50 and p99
+            latencies in milliseconds.
+    """
+    latencies = []
+    errors = 0
+
+    async def timed(call):
+        nonlocal errors
+        started_at = time.perf_counter()
+        status, payload = await call
+        latencies.append(time.perf_counter() - started_at)
+        if status >= 400:
+            errors += 1
+        return payload
+
+    async def client():
+        connection = await HTTPClient.connect(host, port)
+        try:
+            for _ in range(missions):
+                mission = await timed(connection.request("POST", "/missions", {}))
+                for stage in STAGE_ORDER:
+                    result = await timed(connection.request("POST", f"/missions/{mission['id']}/stages/{stage}"))
+                    if result.get("state") != "preparing":
+                        break
+                if telemetry:
+                    started_at = time.perf_counter()
+                    async for _ in connection.stream(f"/missions/{mission['id']}/telemetry"):
+                        pass
+                    latencies.append(time.perf_counter() - started_at)
+                await timed(connection.request("GET", f"/missions/{mission['id']}"))
+        finally:
+            await connection.close()
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    duration = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": duration,
+        "requests_per_second": len(latencies) / duration,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Mission Control over HTTP, or generate load against it.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the server")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    serve_parser.add_argument("--clock", default="real", help="flight clock: real, instant or a factor like 100x")
+    serve_parser.add_argument("--seed", type=int, default=12, help="base random seed of the missions (default: 12)")
+    serve_parser.add_argument(
+        "--finished-ttl", type=float, default=60, help="seconds finished missions stay readable (default: 60)"
+    )
+    serve_parser.add_argument(
+        "--idle-ttl", type=float, default=600, help="seconds before an idle mission is abandoned (default: 600)"
+    )
+
+    load_parser = commands.add_parser("load", help="generate load against a running server")
+    load_parser.add_argument("--host", default="127.0.0.1", help="server host (default: 127.0.0.1)")
+    load_parser.add_argument("--port", type=int, default=8080, help="server port (default: 8080)")
+    load_parser.add_argument("--clients", type=int, default=100, help="concurrent clients (default: 100)")
+    load_parser.add_argument("--missions", type=int, default=20, help="missions per client (default: 20)")
+    load_parser.add_argument("--telemetry", action="store_true", help="also read every telemetry stream")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        server = MissionServer(
+            args.host, args.port, args.clock, args.seed, finished_ttl=args.finished_ttl, idle_ttl=args.idle_ttl
+        )
+        print(f"Mission Control listening on http://{args.host}:{args.port}")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(generate_load(args.host, args.port, args.clients, args.missions, args.telemetry))
+        print(f"Requests: {report['requests']:,} in {report['seconds']:.2f} s ({report['errors']} errors)")
+        print(f"Throughput: {report['requests_per_second']:,.0f} requests/s")
+        print(f"Latency p50/p99: {report['p50_ms']:.2f}/{report['p99_ms']:.2f} ms")
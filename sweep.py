@@ -0,0 +1,264 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import shelve
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from decisions import PolicyDecisions
+from flight_profile import profiles
+from mission import Mission
+from mission_control import simulate_in_pool, simulate_mission
+from mission_statistics import MissionStatistics
+
+# The Mission keyword arguments a sweep can vary.
+PARAMETERS = ("travel_distance", "payload_capacity", "fuel_capacity", "burn_rate", "average_speed")
+
+# Part of every cache key, so results cached by an older simulation are never reused. Bump it whenever a
+# change to the flight, the decisions or the summary fields changes the summary of a mission.
+CACHE_VERSION = 1
+
+
+def grid(**axes):
+    """
+    Builds every combination of the given parameter values.
+
+    Args:
+        **axes (list): Mission parameter names mapped to the values to sweep.
+
+    Returns:
+        list: The configurations as dicts of Mission keyword arguments.
+    """
+    names = sorted(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def sample(count, seed=None, **axes):
+    """
+    Draws a random sample of distinct configurations from the grid of the given parameter values.
+
+    Args:
+        count (int): The number of configurations, capped at the size of the grid.
+        seed (int): The seed of the sampling (default: None).
+        **axes (list): Mission parameter names mapped to the values to sweep.
+
+    Returns:
+        list: The configurations as dicts of Mission keyword arguments.
+    """
+    configurations = grid(**axes)
+    return random.Random(seed).sample(configurations, min(count, len(configurations)))
+
+
+class ResultCache:
+    """
+    Memoizes mission summaries per (parameters, seed): recently used results stay in an in-memory LRU
+    cache, and every result is also kept in an on-disk shelf so later sweeps can reuse it.
+
+    Attributes:
+        capacity (int): The number of results kept in memory.
+        hits (int): The number of lookups answered from memory or disk.
+        misses (int): The number of lookups that found nothing.
+
+    Methods:
+        key(parameters, seed): Builds the cache key of a mission.
+        get(parameters, seed): Looks a result up.
+        put(parameters, seed, summary): Stores a result.
+        close(): Closes the on-disk cache.
+    """
+
+    def __init__(self, path=None, capacity=4096):
+        """
+        Initializes a new ResultCache object.
+
+        Args:
+            path (str): The file of the on-disk cache, without extension (default: None, memory only).
+            capacity (int): The number of results kept in memory (default: 4096).
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._disk = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._disk = shelve.open(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def key(parameters, seed):
+        """
+        Builds the cache key of a mission, which does not depend on the order of the parameters nor on their
+        numeric type: 160 and 160.0 fly the same mission.
+
+        Args:
+            parameters (dict): The Mission keyword arguments.
+            seed (int): The mission random seed.
+
+        Returns:
+            str: The key.
+        """
+        parameters = {name: float(value) if isinstance(value, int) else value for name, value in parameters.items()}
+        return json.dumps([CACHE_VERSION, parameters, seed], sort_keys=True)
+
+    def get(self, parameters, seed):
+        """
+        Looks a result up in memory, then on disk.
+
+        Args:
+            parameters (dict): The Mission keyword arguments.
+            seed (int): The mission random seed.
+
+        Returns:
+            dict: The cached summary, or None if the mission has not been run yet.
+        """
+        key = self.key(parameters, seed)
+        summary = self._memory.get(key)
+        if summary is not None:
+            self._memory.move_to_end(key)
+        elif self._disk is not None and key in self._disk:
+            summary = self._disk[key]
+            self._remember(key, summary)
+
+        if summary is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return summary
+
+    def put(self, parameters, seed, summary):
+        """
+        Stores a result in memory and on disk.
+
+        Args:
+            parameters (dict): The Mission keyword arguments.
+            seed (int): The mission random seed.
+            summary (dict): The summary of the mission.
+        """
+        key = self.key(parameters, seed)
+        self._remember(key, summary)
+        if self._disk is not None:
+            self._disk[key] = summary
+
+    def close(self):
+        """
+        Closes the on-disk cache.
+        """
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def _remember(self, key, summary):
+        self._memory[key] = summary
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+
+class ParameterSweep:
+    """
+    Runs non-interactive missions for every configuration of a sweep across a range of seeds, computing
+    only the (parameters, seed) points missing from the result cache.
+
+    Attributes:
+        configurations (list): The configurations as dicts of Mission keyword arguments.
+        seeds (range): The mission random seeds every configuration is run with.
+        cache (ResultCache): The memoized results.
+        workers (int): The number of worker processes computing the missing points.
+
+    Methods:
+        run(): Runs the sweep and aggregates the results per configuration.
+    """
+
+    def __init__(self, configurations, seeds, cache=None, workers=1):
+        """
+        Initializes a new ParameterSweep object.
+
+        Args:
+            configurations (list): The configurations, e.g. built by grid or sample.
+            seeds (iterable): The mission random seeds every configuration is run with.
+            cache (ResultCache): The memoized results (default: a new in-memory ResultCache).
+            workers (int): The number of worker processes; with one the missions run in the current process
+                (default: 1).
+        """
+        self.configurations = configurations
+        self.seeds = seeds
+        self.cache = ResultCache() if cache is None else cache
+        self.workers = workers
+
+    def run(self):
+        """
+        Runs the sweep, computing the missing points and reusing the cached ones.
+
+        Returns:
+            list: (configuration, MissionStatistics) pairs, in configuration order.
+        """
+        missing = []
+        results = []
+        for parameters in self.configurations:
+            summaries = {}
+            for seed in self.seeds:
+                summary = self.cache.get(parameters, seed)
+                if summary is None:
+                    missing.append((parameters, seed))
+                else:
+                    summaries[seed] = summary
+            results.append((parameters, summaries))
+
+        computed = {}
+        missions = [Mission(random_seed=seed, decisions=PolicyDecisions(), **parameters) for parameters, seed in missing]
+        if self.workers > 1 and len(missions) > 1:
+            for mission in missions:
+                profiles.share(mission.travel_distance, mission.burn_rate, mission.average_speed)
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                summaries = list(simulate_in_pool(executor, missions, self.workers))
+        else:
+            summaries = [simulate_mission(mission) for mission in missions]
+
+        for (parameters, seed), summary in zip(missing, summaries):
+            self.cache.put(parameters, seed, summary)
+            computed[ResultCache.key(parameters, seed)] = summary
+
+        aggregated = []
+        for parameters, summaries in results:
+            statistics = MissionStatistics()
+            for seed in self.seeds:
+                summary = summaries.get(seed) or computed[ResultCache.key(parameters, seed)]
+                statistics.add(summary)
+            aggregated.append((parameters, statistics))
+        return aggregated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep mission parameters across seeds, reusing cached results.")
+    for name in PARAMETERS:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, nargs="+", help=f"values of {name}")
+    parser.add_argument("--seeds", type=int, default=100, help="missions per configuration (default: 100)")
+    parser.add_argument("--first-seed", type=int, default=12, help="seed of the first mission (default: 12)")
+    parser.add_argument("--sample", type=int, help="run a random sample of this many configurations")
+    parser.add_argument("--cache", default=".sweep-cache/results", help="on-disk cache file (default: .sweep-cache/results)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    args = parser.parse_args()
+
+    axes = {name: getattr(args, name) for name in PARAMETERS if getattr(args, name)}
+    if args.sample:
+        configurations = sample(args.sample, args.first_seed, **axes)
+    else:
+        configurations = grid(**axes)
+
+    with ResultCache(args.cache) as cache:
+        sweep = ParameterSweep(configurations, range(args.first_seed, args.first_seed + args.seeds), cache, args.workers)
+        for parameters, statistics in sweep.run():
+            settings = ", ".join(f"{name}={value:g}" for name, value in parameters.items())
+            print(
+                f"{settings or 'defaults'}: explosions {statistics.no_explosions.mean:.3f}, "
+                f"distance {statistics.total_distance.mean:.1f} km, fuel {statistics.total_fuel_burned.mean:.1f} liters, "
+                f"flight time {statistics.flight_time.mean:.2f} s"
+            )
+        print(f"{cache.misses:,} missions computed, {cache.hits:,} reused from the cache")
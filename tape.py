@@ -0,0 +1,430 @@
+import argparse
+import json
+import random
+import struct
+import sys
+from array import array
+
+from decisions import PolicyDecisions
+from mission import Mission
+
+# A tape file is a magic tag, the length of a JSON header holding the call site names, the header, the
+# number of draws, one call site id byte per draw and one signed 64-bit value per draw. randint draws keep
+# their result; random() draws keep the 53-bit integer j of the float j / 2**53.
+TAPE_MAGIC = b"TAP1"
+TAPE_HEADER = struct.Struct("<4sI")
+DRAW_COUNT = struct.Struct("<Q")
+
+RANDOM_SCALE = 1.0 / 9007199254740992.0
+
+
+class RandomTape:
+    """
+    A compact log of random draws, each tagged with the call site that made it.
+
+    Attributes:
+        sites (list): The call site names; a draw stores the position of its call site in this list.
+        site_ids (array): The call site id of every draw, in draw order.
+        values (array): The value of every draw, in draw order.
+
+    Methods:
+        site(name): Retrieves the id of a call site, registering it if needed.
+        append(site_id, value): Records a draw.
+        counts(): Counts the draws per call site.
+        save(path): Writes the tape to a file.
+        load(path): Reads a tape from a file.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new, empty RandomTape object.
+        """
+        self.sites = []
+        self.site_ids = array("B")
+        self.values = array("q")
+        self._site_ids = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def site(self, name):
+        """
+        Retrieves the id of a call site, registering it if needed.
+
+        Args:
+            name (str): The name of the call site, e.g. the function making the draw.
+
+        Returns:
+            int: The id of the call site.
+        """
+        site_id = self._site_ids.get(name)
+        if site_id is None:
+            site_id = self._site_ids[name] = len(self.sites)
+            self.sites.append(name)
+        return site_id
+
+    def append(self, site_id, value):
+        """
+        Records a draw.
+
+        Args:
+            site_id (int): The id of the call site, as returned by site.
+            value (int): The value drawn.
+        """
+        self.site_ids.append(site_id)
+        self.values.append(value)
+
+    def counts(self):
+        """
+        Counts the draws per call site.
+
+        Returns:
+            dict: Call site names mapped to their number of draws.
+        """
+        counts = dict.fromkeys(self.sites, 0)
+        for site_id in self.site_ids:
+            counts[self.sites[site_id]] += 1
+        return counts
+
+    def save(self, path):
+        """
+        Writes the tape to a file.
+
+        Args:
+            path (str): The path of the tape file.
+        """
+        header = json.dumps({"sites": self.sites}).encode()
+        with open(path, "wb") as tape_file:
+            tape_file.write(TAPE_HEADER.pack(TAPE_MAGIC, len(header)))
+            tape_file.write(header)
+            tape_file.write(DRAW_COUNT.pack(len(self)))
+            self.site_ids.tofile(tape_file)
+            self.values.tofile(tape_file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a tape from a file.
+
+        Args:
+            path (str): The path of the tape file.
+
+        Returns:
+            RandomTape: The tape.
+        """
+        tape = cls()
+        with open(path, "rb") as tape_file:
+            magic, header_size = TAPE_HEADER.unpack(tape_file.read(TAPE_HEADER.size))
+            if magic != TAPE_MAGIC:
+                raise ValueError(f"{path} is not a random tape")
+            for name in json.loads(tape_file.read(header_size))["sites"]:
+                tape.site(name)
+            (count,) = DRAW_COUNT.unpack(tape_file.read(DRAW_COUNT.size))
+            tape.site_ids.fromfile(tape_file, count)
+            tape.values.fromfile(tape_file, count)
+        return tape
+
+
+class SiteRandom:
+    """
+    The draws of one call site from a RecordingRandom or ReplayRandom, bound once so that the draws do not have
+    to find out where they come from.
+
+    Attributes:
+        site (str): The name of the call site.
+        randint (callable): Draws an integer like random.Random.randint.
+        random (callable): Draws a float like random.Random.random.
+    """
+
+    __slots__ = ("site", "randint", "random")
+
+    def __init__(self, site, randint, random):
+        """
+        Initializes a new SiteRandom object.
+
+        Args:
+            site (str): The name of the call site.
+            randint (callable): Draws an integer for the call site.
+            random (callable): Draws a float for the call site.
+        """
+        self.site = site
+        self.randint = randint
+        self.random = random
+
+
+class RecordingRandom(random.Random):
+    """
+    A random.Random recording every randint and random() draw on a RandomTape, tagged with its call site.
+
+    The Mersenne Twister output is fetched in blocks with a single getrandbits call, and randint and
+    random() are derived from the block exactly like random.Random derives them from single outputs, so a
+    recorded run draws the same values as an unrecorded one with the same seed.
+
+    Only randint, random() and the methods built on random(), like uniform, are recorded and match
+    random.Random. The methods drawing raw bits, like choice, shuffle, randrange and getrandbits, would
+    bypass the block and the tape, so they raise NotImplementedError. So does getstate: the generator state
+    is ahead of the draws by the rest of the block, so it cannot describe the next draw, and a rocket drawing
+    from a RecordingRandom cannot be snapshotted. setstate drops the rest of the block.
+
+    Callers bind each of their call sites once, like LaunchControl does. The draws of a bound site are
+    closures over the block and over preallocated lists that are moved onto the tape at every new block, so
+    recording a draw costs less than a plain random.Random.randint. randint and random() called directly
+    find their call site from the calling frame, which is slower.
+
+    Attributes:
+        tape (RandomTape): The tape the draws are recorded on, up to the last draw.
+        block_size (int): The number of 32-bit outputs fetched at once.
+
+    Methods:
+        bind(site): Binds the draws of a call site.
+    """
+
+    def __init__(self, seed=None, tape=None, block_size=1024):
+        """
+        Initializes a new RecordingRandom object.
+
+        Args:
+            seed (int): The seed of the generator (default: None).
+            tape (RandomTape): The tape to record on (default: a new RandomTape).
+            block_size (int): The number of 32-bit outputs fetched at once (default: 1024).
+        """
+        self._tape = RandomTape() if tape is None else tape
+        self.block_size = block_size
+        self._sites = {}
+        self.bind, self._restart, self._flush = self._stream()
+        super().__init__(seed)
+
+    @property
+    def tape(self):
+        self._flush()
+        return self._tape
+
+    def seed(self, *args, **kwargs):
+        super().seed(*args, **kwargs)
+        self._restart()
+
+    def getstate(self):
+        raise NotImplementedError("RecordingRandom is ahead of its draws, so its state cannot be saved")
+
+    def setstate(self, state):
+        super().setstate(state)
+        self._restart()
+
+    def getrandbits(self, k):
+        raise NotImplementedError("RecordingRandom only records randint and random() draws")
+
+    def _randbelow(self, n):
+        raise NotImplementedError("RecordingRandom only records randint and random() draws")
+
+    def random(self):
+        return self._site(sys._getframe(1).f_code).random()
+
+    def randint(self, a, b):
+        return self._site(sys._getframe(1).f_code).randint(a, b)
+
+    def _site(self, code):
+        site = self._sites.get(code)
+        if site is None:
+            site = self._sites[code] = self.bind(code.co_name)
+        return site
+
+    def _stream(self):
+        # The block and the pending draws live in closure cells shared by the draws of every bound site, which
+        # are cheaper to reach than attributes.
+        getrandbits = super().getrandbits
+        block_size = self.block_size
+        tape = self._tape
+        words = []
+        position = 0
+        site_ids = [0] * block_size
+        values = [0] * block_size
+        pending = 0
+
+        def flush():
+            # Converting the pending draws in bulk is much cheaper than extending the arrays from the lists.
+            nonlocal pending
+            tape.site_ids.frombytes(bytes(site_ids[:pending]))
+            tape.values.frombytes(struct.pack(f"{pending}q", *values[:pending]))
+            pending = 0
+
+        def refill():
+            nonlocal words, position
+            flush()
+            block = array("I", getrandbits(32 * block_size).to_bytes(4 * block_size, "little"))
+            if sys.byteorder == "big":
+                block.byteswap()
+            words = block.tolist()
+            position = 0
+
+        def restart():
+            nonlocal words, position
+            flush()
+            words = []
+            position = 0
+
+        def word():
+            nonlocal position
+            if position == len(words):
+                refill()
+            position += 1
+            return words[position - 1]
+
+        def bind(site):
+            """
+            Binds the draws of a call site.
+
+            Args:
+                site (str): The name of the call site, e.g. the function making the draws.
+
+            Returns:
+                SiteRandom: The draws of the call site.
+            """
+            site_id = tape.site(site)
+            # A call site usually draws from the same range every time, so its bounds are checked once.
+            last_a = last_b = None
+            n = shift = 0
+
+            def randint(a, b):
+                # random.Random._randbelow: take the top n.bit_length() bits of an output, rejecting values of
+                # n or more. A draw consumes at least one word, so a block never holds more draws than the
+                # pending lists have room for.
+                nonlocal position, pending, last_a, last_b, n, shift
+                if b != last_b or a != last_a:
+                    n = b - a + 1
+                    shift = 32 - n.bit_length()
+                    if n <= 0 or shift < 0:
+                        raise ValueError(f"RecordingRandom records ranges of 1 to 2**32 values, not [{a}, {b}]")
+                    last_a, last_b = a, b
+                try:
+                    r = words[position] >> shift
+                except IndexError:
+                    refill()
+                    r = words[0] >> shift
+                position += 1
+                while r >= n:
+                    try:
+                        r = words[position] >> shift
+                    except IndexError:
+                        refill()
+                        r = words[0] >> shift
+                    position += 1
+                r += a
+                site_ids[pending] = site_id
+                values[pending] = r
+                pending += 1
+                return r
+
+            def random():
+                nonlocal pending
+                value = (word() >> 5) * 67108864 + (word() >> 6)
+                site_ids[pending] = site_id
+                values[pending] = value
+                pending += 1
+                return value * RANDOM_SCALE
+
+            return SiteRandom(site, randint, random)
+
+        return bind, restart, flush
+
+
+class ReplayRandom(random.Random):
+    """
+    A random.Random feeding back the draws of a RandomTape, bit for bit. Every draw has to come from the
+    same call site as on the tape, so a build whose draws diverge from the recorded run is reported at the
+    first differing draw.
+
+    Attributes:
+        tape (RandomTape): The tape replayed.
+        position (int): The number of draws replayed so far.
+
+    Methods:
+        bind(site): Binds the draws of a call site.
+    """
+
+    def __init__(self, tape):
+        """
+        Initializes a new ReplayRandom object.
+
+        Args:
+            tape (RandomTape): The tape to replay.
+        """
+        self.tape = tape
+        self.position = 0
+        super().__init__(0)
+
+    def random(self):
+        return self._replay(sys._getframe(1).f_code.co_name) * RANDOM_SCALE
+
+    def randint(self, a, b):
+        return self._replay_int(sys._getframe(1).f_code.co_name, a, b)
+
+    def bind(self, site):
+        """
+        Binds the draws of a call site, like RecordingRandom.bind.
+
+        Args:
+            site (str): The name of the call site.
+
+        Returns:
+            SiteRandom: The draws of the call site.
+        """
+
+        def randint(a, b):
+            return self._replay_int(site, a, b)
+
+        def random():
+            return self._replay(site) * RANDOM_SCALE
+
+        return SiteRandom(site, randint, random)
+
+    def _replay_int(self, site, a, b):
+        value = self._replay(site)
+        if not a <= value <= b:
+            raise ValueError(f"tape diverged at draw {self.position - 1}: {value} is outside [{a}, {b}]")
+        return value
+
+    def _replay(self, site):
+        position = self.position
+        if position >= len(self.tape):
+            raise EOFError(f"tape exhausted after {position} draws, at {site}")
+        recorded = self.tape.sites[self.tape.site_ids[position]]
+        if recorded != site:
+            raise ValueError(f"tape diverged at draw {position}: recorded at {recorded}, requested at {site}")
+        self.position = position + 1
+        return self.tape.values[position]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay the random draws of a mission.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="fly a mission and record its draws")
+    record_parser.add_argument("path", help="tape file to write")
+    record_parser.add_argument("--seed", type=int, default=12, help="mission random seed (default: 12)")
+    record_parser.add_argument("--distance", type=float, default=160, help="travel distance (default: 160)")
+
+    replay_parser = commands.add_parser("replay", help="fly a mission from a recorded tape")
+    replay_parser.add_argument("path", help="tape file to replay")
+    replay_parser.add_argument("--distance", type=float, default=160, help="travel distance (default: 160)")
+
+    show_parser = commands.add_parser("show", help="count the draws of a tape per call site")
+    show_parser.add_argument("path", help="tape file to read")
+
+    args = parser.parse_args()
+    if args.command == "show":
+        tape = RandomTape.load(args.path)
+        print(f"{len(tape)} draws")
+        for site, count in tape.counts().items():
+            print(f"  {site}: {count}")
+    else:
+        if args.command == "record":
+            rng = RecordingRandom(args.seed)
+        else:
+            rng = ReplayRandom(RandomTape.load(args.path))
+        mission = Mission(travel_distance=args.distance, random_seed=getattr(args, "seed", 0), decisions=PolicyDecisions())
+        print(mission.simulate(rng=rng))
+        if args.command == "record":
+            rng.tape.save(args.path)
+            print(f"Recorded {len(rng.tape)} draws to {args.path}")
+        else:
+            print(f"Replayed {rng.position} of {len(rng.tape)} draws")
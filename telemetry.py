@@ -0,0 +1,284 @@
+import argparse
+import struct
+import sys
+import tracemalloc
+from array import array
+from collections.abc import Mapping
+
+FIELDS = ("elapsed_time", "distance_traveled", "current_fuel_burn_rate", "current_speed", "time_to_destination")
+
+# Array typecodes of the ring buffer columns: whole seconds are stored as integers, the rest as doubles.
+TYPECODES = {
+    "elapsed_time": "q",
+    "distance_traveled": "d",
+    "current_fuel_burn_rate": "d",
+    "current_speed": "d",
+    "time_to_destination": "q",
+}
+
+# Header of a serialized TelemetryRing: its capacity and the number of samples that follow.
+RING_HEADER = struct.Struct("<II")
+
+
+class TelemetryRecord(Mapping):
+    """
+    Represents a single status sample of a rocket, stored in slots instead of a per-sample dict.
+
+    The record behaves like the dict Rocket.status used to return, so consumers can
+    keep reading it by key, while attribute access avoids the key lookup altogether.
+
+    Attributes:
+        elapsed_time (int): The elapsed time since launch in seconds.
+        distance_traveled (float): The distance traveled by the rocket.
+        current_fuel_burn_rate (float): The current fuel burn rate of the rocket.
+        current_speed (float): The current speed of the rocket.
+        time_to_destination (int): The estimated time remaining to reach the destination in seconds.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, elapsed_time, distance_traveled, current_fuel_burn_rate, current_speed, time_to_destination):
+        """
+        Initializes a new TelemetryRecord object.
+
+        Args:
+            elapsed_time (int): The elapsed time since launch in seconds.
+            distance_traveled (float): The distance traveled by the rocket.
+            current_fuel_burn_rate (float): The current fuel burn rate of the rocket.
+            current_speed (float): The current speed of the rocket.
+            time_to_destination (int): The estimated time remaining to reach the destination in seconds.
+        """
+        self.elapsed_time = elapsed_time
+        self.distance_traveled = distance_traveled
+        self.current_fuel_burn_rate = current_fuel_burn_rate
+        self.current_speed = current_speed
+        self.time_to_destination = time_to_destination
+
+    def __getitem__(self, key):
+        if key not in TYPECODES:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class TelemetryView(Mapping):
+    """
+    A dict-compatible, read-only view of one slot of a TelemetryRing. The view reads the ring on every
+    access, so it shows newer data once the ring has wrapped around its slot.
+
+    Attributes:
+        ring (TelemetryRing): The ring the view reads from.
+        slot (int): The index of the slot in the ring columns.
+    """
+
+    __slots__ = ("ring", "slot")
+
+    def __init__(self, ring, slot):
+        self.ring = ring
+        self.slot = slot
+
+    def __getitem__(self, key):
+        return self.ring.columns[key][self.slot]
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class TelemetryRing:
+    """
+    A preallocated ring buffer keeping the last samples of a rocket in one array per status field, so
+    recording a sample writes five numbers in place instead of allocating anything.
+
+    Attributes:
+        capacity (int): The number of samples kept.
+        columns (dict): The array holding each status field, indexed by slot.
+
+    Methods:
+        append(record): Records a status sample, overwriting the oldest one when the ring is full.
+        latest(): Retrieves a view of the most recent sample.
+        clear(): Forgets all samples.
+        to_bytes(): Serializes the samples kept, oldest first.
+        from_bytes(data): Creates a ring from serialized samples.
+    """
+
+    def __init__(self, capacity=60):
+        """
+        Initializes a new TelemetryRing object.
+
+        Args:
+            capacity (int): The number of samples kept (default: 60, one minute at one sample per second).
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.columns = {field: array(TYPECODES[field], [0]) * capacity for field in FIELDS}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """
+        Retrieves a view of a sample, where 0 is the oldest sample kept and -1 the most recent one.
+
+        Args:
+            index (int): The position of the sample.
+
+        Returns:
+            TelemetryView: A view of the sample.
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("telemetry index out of range")
+        return TelemetryView(self, (self._next - self._count + index) % self.capacity)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def append(self, record):
+        """
+        Records a status sample, overwriting the oldest one when the ring is full.
+
+        Args:
+            record (TelemetryRecord): The sample to record.
+        """
+        slot = self._next
+        columns = self.columns
+        columns["elapsed_time"][slot] = record.elapsed_time
+        columns["distance_traveled"][slot] = record.distance_traveled
+        columns["current_fuel_burn_rate"][slot] = record.current_fuel_burn_rate
+        columns["current_speed"][slot] = record.current_speed
+        columns["time_to_destination"][slot] = record.time_to_destination
+
+        self._next = (slot + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def latest(self):
+        """
+        Retrieves a view of the most recent sample.
+
+        Returns:
+            TelemetryView: A view of the most recent sample, or None if nothing has been recorded.
+        """
+        if not self._count:
+            return None
+        return self[-1]
+
+    def clear(self):
+        """
+        Forgets all samples.
+        """
+        self._next = 0
+        self._count = 0
+
+    def to_bytes(self):
+        """
+        Serializes the samples kept, oldest first, as a header followed by one packed column per field.
+
+        Returns:
+            bytes: The serialized ring.
+        """
+        start = (self._next - self._count) % self.capacity
+        stop = start + self._count
+        parts = [RING_HEADER.pack(self.capacity, self._count)]
+        for field in FIELDS:
+            column = self.columns[field]
+            if stop <= self.capacity:
+                parts.append(column[start:stop].tobytes())
+            else:
+                parts.append(column[start:].tobytes())
+                parts.append(column[:stop - self.capacity].tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Creates a ring from samples serialized by to_bytes.
+
+        Args:
+            data (bytes-like): The serialized ring.
+
+        Returns:
+            TelemetryRing: A new ring holding the samples.
+        """
+        capacity, count = RING_HEADER.unpack_from(data)
+        ring = cls(capacity)
+        offset = RING_HEADER.size
+        for field in FIELDS:
+            column = array(TYPECODES[field])
+            column.frombytes(data[offset:offset + count * column.itemsize])
+            ring.columns[field][:count] = column
+            offset += count * column.itemsize
+
+        ring._next = count % capacity
+        ring._count = count
+        return ring
+
+
+def measure_allocations(samples):
+    """
+    Measures the memory needed to keep status samples as dicts, as TelemetryRecord objects and in a
+    TelemetryRing of the same capacity.
+
+    Args:
+        samples (int): The number of samples to create.
+
+    Returns:
+        dict: The bytes allocated by each representation, plus the size of a single dict and record.
+    """
+    values = (1, 25.0, 2804.0, 1500.0, 0)
+
+    def traced(build):
+        tracemalloc.start()
+        kept = build()
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return allocated
+
+    ring = TelemetryRing(samples)
+    record = TelemetryRecord(*values)
+
+    def fill_ring():
+        for _ in range(samples):
+            ring.append(record)
+        return ring
+
+    return {
+        "dict": traced(lambda: [dict(zip(FIELDS, values)) for _ in range(samples)]),
+        "record": traced(lambda: [TelemetryRecord(*values) for _ in range(samples)]),
+        "ring": traced(fill_ring),
+        "dict_size": sys.getsizeof(dict(zip(FIELDS, values))),
+        "record_size": sys.getsizeof(record),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the memory used by status dicts and telemetry records.")
+    parser.add_argument("--samples", type=int, default=100000, help="number of status samples to keep")
+    args = parser.parse_args()
+
+    results = measure_allocations(args.samples)
+    print(f"Keeping {args.samples} status samples:")
+    print(f"  dict:   {results['dict']:>12,} bytes ({results['dict_size']} bytes per sample)")
+    print(f"  record: {results['record']:>12,} bytes ({results['record_size']} bytes per sample)")
+    print(f"  ring:   {results['ring']:>12,} bytes allocated while recording (preallocated columns)")
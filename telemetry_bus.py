@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import random
+import struct
+import sys
+import time
+from collections import deque
+from multiprocessing import resource_tracker, shared_memory
+
+from clock import create_clock
+from decisions import PolicyDecisions
+from rocket import Rocket
+
+# Layout of the bus segment: a header with a magic tag, the number of slots and the size of a slot, followed
+# by the slots. A slot holds a sequence number, the name of the rocket publishing into it, and its latest
+# state and status. The sequence number is odd while the slot is being written, so readers retry until they
+# have read the slot between two equal, even sequence numbers.
+BUS_MAGIC = b"TBS1"
+BUS_HEADER = struct.Struct("<4sII4x")
+SEQUENCE = struct.Struct("<Q")
+NAME = struct.Struct("<32s")
+STATUS = struct.Struct("<B7xqdddq")
+SLOT_SIZE = SEQUENCE.size + NAME.size + STATUS.size
+
+DEFAULT_NAME = "mission-control-telemetry"
+
+# States of a slot. A finished rocket keeps its last status until its slot is reused; an interrupted one
+# stopped publishing before its flight ended, e.g. because the flight was cancelled.
+FREE, FLYING, ARRIVED, EXPLODED, INTERRUPTED = range(5)
+STATE_NAMES = ("free", "flying", "arrived", "exploded", "interrupted")
+
+
+class TelemetryBus:
+    """
+    A fixed-layout shared memory segment holding the latest status of every rocket in flight, so monitor
+    processes can watch the flights without parsing their output or slowing them down.
+
+    Each slot is guarded by a seqlock: the publishing process makes the sequence number odd, writes the
+    slot in place and makes it even again, without any lock, and readers unpack the slot straight from
+    the segment, retrying when the sequence number was odd or changed while they read. There is a single
+    publishing process per bus; any number of processes can read it.
+
+    Attributes:
+        name (str): The name of the shared memory segment.
+        slots (int): The number of slots, i.e. the number of rockets that can publish at once.
+        owner (bool): Whether this process created the segment and publishes into it.
+
+    Methods:
+        create(name, slots): Creates a bus to publish into.
+        attach(name): Attaches to an existing bus to read it.
+        publisher(name): Claims a slot for a rocket.
+        read(slot): Reads a slot consistently.
+        snapshot(): Reads every slot in use.
+        close(): Detaches from the bus, removing it if this process created it.
+    """
+
+    def __init__(self, segment, owner):
+        """
+        Initializes a new TelemetryBus object over a segment. Use create or attach instead.
+
+        Args:
+            segment (SharedMemory): The shared memory segment of the bus.
+            owner (bool): Whether this process created the segment.
+        """
+        magic, self.slots, slot_size = BUS_HEADER.unpack_from(segment.buf)
+        if magic != BUS_MAGIC or slot_size != SLOT_SIZE:
+            segment.close()
+            raise ValueError(f"{segment.name} is not a telemetry bus")
+
+        self.name = segment.name
+        self.owner = owner
+        self._segment = segment
+        self._buffer = segment.buf
+        self._sequences = [0] * self.slots
+        self._free = deque(range(self.slots))
+
+    @classmethod
+    def create(cls, name=DEFAULT_NAME, slots=1024):
+        """
+        Creates a bus to publish into.
+
+        Args:
+            name (str): The name of the shared memory segment (default: DEFAULT_NAME).
+            slots (int): The number of rockets that can publish at once (default: 1024).
+
+        Returns:
+            TelemetryBus: The bus, with every slot free.
+        """
+        segment = shared_memory.SharedMemory(name=name, create=True, size=BUS_HEADER.size + slots * SLOT_SIZE)
+        segment.buf[:] = bytes(segment.size)
+        BUS_HEADER.pack_into(segment.buf, 0, BUS_MAGIC, slots, SLOT_SIZE)
+        return cls(segment, owner=True)
+
+    @classmethod
+    def attach(cls, name=DEFAULT_NAME):
+        """
+        Attaches to an existing bus to read it.
+
+        Args:
+            name (str): The name of the shared memory segment (default: DEFAULT_NAME).
+
+        Returns:
+            TelemetryBus: The bus.
+        """
+        segment = shared_memory.SharedMemory(name=name)
+        # The resource tracker would remove the segment when this process exits; it belongs to the publisher.
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return cls(segment, owner=False)
+
+    def publisher(self, name):
+        """
+        Claims a slot for a rocket, preferring free slots over those of finished rockets.
+
+        Args:
+            name (str): The name shown for the rocket, truncated to 32 bytes of UTF-8.
+
+        Returns:
+            BusPublisher: The publisher of the slot.
+
+        Raises:
+            RuntimeError: If every slot is held by a rocket in flight.
+        """
+        if not self._free:
+            raise RuntimeError(f"all {self.slots} telemetry bus slots are in use")
+        slot = self._free.popleft()
+        offset = BUS_HEADER.size + slot * SLOT_SIZE
+        self._write(slot, offset, NAME, (name.encode()[:32],), offset + SEQUENCE.size)
+        self._write(slot, offset, STATUS, (FLYING, 0, 0.0, 0.0, 0.0, 0), offset + SEQUENCE.size + NAME.size)
+        return BusPublisher(self, slot)
+
+    def read(self, slot):
+        """
+        Reads a slot consistently, retrying while it is being written.
+
+        Args:
+            slot (int): The index of the slot.
+
+        Returns:
+            tuple: The rocket name, its state, and its elapsed time, distance traveled, fuel burn rate, speed
+                and time to destination.
+        """
+        buffer = self._buffer
+        offset = BUS_HEADER.size + slot * SLOT_SIZE
+        while True:
+            (sequence,) = SEQUENCE.unpack_from(buffer, offset)
+            if sequence & 1:
+                continue
+            (name,) = NAME.unpack_from(buffer, offset + SEQUENCE.size)
+            status = STATUS.unpack_from(buffer, offset + SEQUENCE.size + NAME.size)
+            if SEQUENCE.unpack_from(buffer, offset)[0] == sequence:
+                return (name.rstrip(b"\0").decode(errors="replace"), *status)
+
+    def snapshot(self):
+        """
+        Reads every slot in use.
+
+        Returns:
+            list: (slot, read result) pairs of the slots that are not free.
+        """
+        entries = []
+        for slot in range(self.slots):
+            entry = self.read(slot)
+            if entry[1] != FREE:
+                entries.append((slot, entry))
+        return entries
+
+    def close(self):
+        """
+        Detaches from the bus, removing it if this process created it.
+        """
+        self._buffer = None
+        self._segment.close()
+        if self.owner:
+            self._segment.unlink()
+
+    def _write(self, slot, offset, layout, values, at):
+        sequence = self._sequences[slot] + 1
+        SEQUENCE.pack_into(self._buffer, offset, sequence)
+        layout.pack_into(self._buffer, at, *values)
+        SEQUENCE.pack_into(self._buffer, offset, sequence + 1)
+        self._sequences[slot] = sequence + 1
+
+
+class BusPublisher:
+    """
+    Publishes the statuses of one rocket into its slot of a TelemetryBus.
+
+    Attributes:
+        bus (TelemetryBus): The bus.
+        slot (int): The slot of the rocket.
+
+    Methods:
+        publish(status): Publishes the latest status of the rocket.
+        finish(arrived, status): Publishes the end of the flight and hands the slot back, once.
+    """
+
+    def __init__(self, bus, slot):
+        """
+        Initializes a new BusPublisher object.
+
+        Args:
+            bus (TelemetryBus): The bus.
+            slot (int): The slot claimed for the rocket.
+        """
+        self.bus = bus
+        self.slot = slot
+        self._buffer = bus._buffer
+        self._offset = BUS_HEADER.size + slot * SLOT_SIZE
+        self._status_offset = self._offset + SEQUENCE.size + NAME.size
+        self._state = FLYING
+
+    def publish(self, status):
+        """
+        Publishes the latest status of the rocket. Runs on every tick, so the seqlock write is inlined.
+
+        Args:
+            status (TelemetryRecord): The status.
+        """
+        buffer = self._buffer
+        sequence = self.bus._sequences[self.slot] + 1
+        SEQUENCE.pack_into(buffer, self._offset, sequence)
+        STATUS.pack_into(
+            buffer,
+            self._status_offset,
+            self._state,
+            status.elapsed_time,
+            status.distance_traveled,
+            status.current_fuel_burn_rate,
+            status.current_speed,
+            status.time_to_destination,
+        )
+        SEQUENCE.pack_into(buffer, self._offset, sequence + 1)
+        self.bus._sequences[self.slot] = sequence + 1
+
+    def finish(self, arrived, status):
+        """
+        Publishes the end of the flight and hands the slot back; the final status stays visible until the
+        slot is claimed again. Later calls do nothing, so the slot is never handed back twice.
+
+        Args:
+            arrived (bool): True if the rocket reached its destination, False if it exploded, None if the
+                flight was interrupted, as returned by Rocket.flight_result.
+            status (TelemetryRecord): The last status of the flight.
+        """
+        if self._state != FLYING:
+            return
+        self._state = INTERRUPTED if arrived is None else ARRIVED if arrived else EXPLODED
+        self.publish(status)
+        self.bus._free.append(self.slot)
+
+
+def monitor(bus, interval, count=None):
+    """
+    Prints the live state of every rocket on a bus at a fixed interval.
+
+    Args:
+        bus (TelemetryBus): The bus to watch.
+        interval (float): The number of seconds between two refreshes.
+        count (int): The number of refreshes, or None to run until interrupted (default: None).
+    """
+    tty = sys.stdout.isatty()
+    refreshes = 0
+    while count is None or refreshes < count:
+        entries = bus.snapshot()
+        lines = [f"{len(entries)} rockets on {bus.name} at {time.strftime('%H:%M:%S')}"]
+        for slot, (name, state, elapsed_time, distance, burn_rate, speed, remaining) in entries:
+            lines.append(
+                f"  {slot:>4} {name:<24} {STATE_NAMES[state]:<11} {elapsed_time:>6} s  {distance:>12.2f} km  "
+                f"{speed:>8g} km/h  {burn_rate:>10.2f} liters/min  {remaining:>6} s to go"
+            )
+        sys.stdout.write(("\x1b[H\x1b[J" if tty else "") + "\n".join(lines) + "\n")
+        sys.stdout.flush()
+        refreshes += 1
+        if count is None or refreshes < count:
+            time.sleep(interval)
+
+
+async def fly(bus, rockets, distance, clock):
+    """
+    Flies rockets concurrently on one event loop, each publishing into the bus.
+
+    Args:
+        bus (TelemetryBus): The bus to publish into.
+        rockets (int): The number of rockets.
+        distance (float): The travel distance of every rocket.
+        clock (Clock): The clock the rockets fly on.
+    """
+
+    async def fly_rocket(seed):
+        rocket = Rocket(
+            distance,
+            168233,
+            1500,
+            rng=random.Random(seed),
+            clock=clock,
+            decisions=PolicyDecisions(),
+            publisher=bus.publisher(f"Rocket {seed + 1}"),
+        )
+        async for _ in rocket.launch_async():
+            pass
+
+    await asyncio.gather(*(fly_rocket(seed) for seed in range(rockets)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish or watch live rocket telemetry in shared memory.")
+    parser.add_argument("--name", default=DEFAULT_NAME, help=f"shared memory segment name (default: {DEFAULT_NAME})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    monitor_parser = commands.add_parser("monitor", help="watch the rockets publishing on a bus")
+    monitor_parser.add_argument("--interval", type=float, default=0.5, help="seconds between refreshes (default: 0.5)")
+    monitor_parser.add_argument("--count", type=int, help="number of refreshes (default: until interrupted)")
+
+    fly_parser = commands.add_parser("fly", help="fly rockets publishing on a new bus")
+    fly_parser.add_argument("--rockets", type=int, default=10, help="concurrent rockets (default: 10)")
+    fly_parser.add_argument("--distance", type=float, default=1000, help="travel distance (default: 1000)")
+    fly_parser.add_argument("--clock", default="real", help='"real" or a time-warp factor such as "10x" (default: real)')
+
+    args = parser.parse_args()
+    if args.command == "monitor":
+        telemetry_bus = TelemetryBus.attach(args.name)
+        try:
+            monitor(telemetry_bus, args.interval, args.count)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            telemetry_bus.close()
+    else:
+        telemetry_bus = TelemetryBus.create(args.name, slots=max(args.rockets, 1))
+        try:
+            asyncio.run(fly(telemetry_bus, args.rockets, args.distance, create_clock(args.clock)))
+        finally:
+            telemetry_bus.close()
@@ -0,0 +1,243 @@
+import argparse
+import random
+import time
+
+import instrumentation
+from clock import create_clock
+from decisions import PolicyDecisions
+from instrumentation import Histogram
+
+# What a TickScheduler does with the deadlines it missed by a whole interval or more: "coalesce" runs the
+# missed ticks at once, so the flight stays in step with the clock, and "skip" drops them, so every tick
+# still gets its own status but the flight falls behind the clock.
+POLICIES = ("coalesce", "skip")
+
+
+class TickMetrics:
+    """
+    Collects the timing of the ticks of one or more TickSchedulers, e.g. every rocket of a session.
+
+    Attributes:
+        lateness (Histogram): How long after its deadline every tick fired, in clock seconds.
+        jitter (Histogram): How much the lateness of every tick differed from that of the previous tick.
+        ticks (int): The number of ticks fired.
+        coalesced (int): The number of missed ticks run together with a later one.
+        skipped (int): The number of missed ticks dropped.
+        max_lateness (float): The largest lateness observed.
+
+    Methods:
+        observe(lateness, jitter, missed, policy): Records a tick.
+        quantile(histogram, quantile): Retrieves the bucket bound below which a quantile of a histogram lies.
+        report(): Formats the metrics for the terminal.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new TickMetrics object with no ticks.
+        """
+        self.lateness = Histogram()
+        self.jitter = Histogram()
+        self.ticks = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+
+    def observe(self, lateness, jitter, missed, policy):
+        """
+        Records a tick.
+
+        Args:
+            lateness (float): How long after its deadline the tick fired.
+            jitter (float): How much the lateness differed from that of the previous tick.
+            missed (int): The number of deadlines missed by a whole interval before this tick.
+            policy (str): One of POLICIES.
+        """
+        self.ticks += 1
+        self.lateness.observe(lateness)
+        self.max_lateness = max(self.max_lateness, lateness)
+        self.jitter.observe(jitter)
+        if policy == "skip":
+            self.skipped += missed
+        else:
+            self.coalesced += missed
+
+    @staticmethod
+    def quantile(histogram, quantile):
+        """
+        Retrieves the upper bound of the bucket holding a quantile of a histogram.
+
+        Args:
+            histogram (Histogram): The histogram.
+            quantile (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The bucket bound in seconds, inf for the overflow bucket, or 0.0 for an empty histogram.
+        """
+        if not histogram.count:
+            return 0.0
+        rank = quantile * histogram.count
+        for bound, count in histogram.cumulative():
+            if count >= rank:
+                return float("inf") if bound == "+Inf" else bound
+        return float("inf")
+
+    def report(self):
+        """
+        Formats the metrics for the terminal.
+
+        Returns:
+            str: The report lines, without a trailing newline.
+        """
+        lines = [f"{self.ticks} ticks, {self.coalesced} coalesced, {self.skipped} skipped"]
+        for name in ("lateness", "jitter"):
+            histogram = getattr(self, name)
+            mean = histogram.total / histogram.count if histogram.count else 0.0
+            bounds = "/".join(f"{self.quantile(histogram, quantile) * 1000:g}" for quantile in (0.5, 0.99))
+            lines.append(f"  {name}: mean {mean * 1000:.3f} ms, p50/p99 <= {bounds} ms")
+        lines.append(f"  max lateness: {self.max_lateness * 1000:.3f} ms")
+        return "\n".join(lines)
+
+
+class TickScheduler:
+    """
+    Paces a periodic loop on a clock with absolute deadlines, so the time the loop body and its consumers
+    take between two waits does not add up into drift.
+
+    The n-th tick is due n intervals after start. A tick that fires a whole interval or more after its
+    deadline has missed the deadlines in between, which are coalesced or skipped according to the policy;
+    either way the next deadline is the next one still ahead on the original grid.
+
+    Attributes:
+        clock (Clock): The clock the deadlines are on.
+        interval (float): The nominal number of clock seconds between two ticks.
+        policy (str): What happens to missed deadlines, one of POLICIES.
+        metrics (TickMetrics): Collects the timing of the ticks, or None.
+        deadline (float): The deadline of the last tick.
+
+    Methods:
+        start(): Anchors the deadlines at the current time.
+        wait(): Waits for the next deadline.
+        wait_async(): Waits for the next deadline without blocking the event loop.
+    """
+
+    def __init__(self, clock, interval=1, policy="coalesce", metrics=None):
+        """
+        Initializes a new TickScheduler object.
+
+        Args:
+            clock (Clock): The clock the deadlines are on.
+            interval (float): The nominal number of clock seconds between two ticks (default: 1).
+            policy (str): What happens to missed deadlines, one of POLICIES (default: "coalesce").
+            metrics (TickMetrics): Collects the timing of the ticks (default: None).
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown tick policy: {policy!r}")
+
+        self.clock = clock
+        self.interval = interval
+        self.policy = policy
+        self.metrics = metrics
+        self.deadline = None
+        self._lateness = 0.0
+
+    def start(self):
+        """
+        Anchors the deadlines at the current time: the first tick is due one interval from now.
+        """
+        self.deadline = self.clock.now()
+        self._lateness = 0.0
+
+    def wait(self):
+        """
+        Waits for the next deadline.
+
+        Returns:
+            int: The number of ticks to run: 1, plus the missed ticks if they are coalesced.
+        """
+        self.deadline += self.interval
+        self.clock.sleep_until(self.deadline)
+        return self._fire()
+
+    async def wait_async(self):
+        """
+        Waits for the next deadline without blocking the event loop.
+
+        Returns:
+            int: The number of ticks to run: 1, plus the missed ticks if they are coalesced.
+        """
+        self.deadline += self.interval
+        await self.clock.sleep_until_async(self.deadline)
+        return self._fire()
+
+    def _fire(self):
+        now = self.clock.now()
+        lateness = max(now - self.deadline, 0.0)
+        missed = int(lateness // self.interval)
+        self.deadline += missed * self.interval
+
+        ticks = 1 if self.policy == "skip" else missed + 1
+        if self.metrics is not None:
+            self.metrics.observe(lateness, abs(lateness - self._lateness), missed, self.policy)
+        metrics = instrumentation.active()
+        if metrics is not None:
+            metrics.observe("tick.lateness", lateness)
+            if missed:
+                metrics.count(f"ticks.{'skipped' if self.policy == 'skip' else 'coalesced'}", missed)
+        self._lateness = lateness
+        return ticks
+
+
+async def drive(rockets, ticks, clock, policy, consumer_delay, metrics):
+    """
+    Flies many rockets concurrently on one event loop, with a consumer that blocks for a while on every
+    status, like a slow terminal would.
+
+    Args:
+        rockets (int): The number of concurrent rockets.
+        ticks (int): The number of ticks a flight lasts if the rocket does not explode.
+        clock (Clock): The clock the rockets fly on.
+        policy (str): One of POLICIES.
+        consumer_delay (float): The number of wall-clock seconds the consumer blocks per status.
+        metrics (TickMetrics): Collects the timing of every rocket.
+    """
+    # Rocket paces its flights with a TickScheduler, so it can only be imported once this module is loaded.
+    from rocket import Rocket
+
+    async def fly(seed):
+        rocket = Rocket(
+            25 * ticks * (ticks + 1) / 2,
+            168233,
+            1500,
+            rng=random.Random(seed),
+            clock=clock,
+            decisions=PolicyDecisions(),
+            tick_policy=policy,
+            tick_metrics=metrics,
+        )
+        async for _ in rocket.launch_async():
+            if consumer_delay:
+                time.sleep(consumer_delay)
+
+    import asyncio
+
+    await asyncio.gather(*(fly(seed) for seed in range(rockets)))
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Measure the tick lateness and jitter of many concurrent rockets.")
+    parser.add_argument("--rockets", type=int, default=300, help="concurrent rockets (default: 300)")
+    parser.add_argument("--ticks", type=int, default=10, help="ticks of a flight without explosion (default: 10)")
+    parser.add_argument("--clock", default="real", help='"real" or a time-warp factor such as "100x" (default: real)')
+    parser.add_argument("--policy", choices=POLICIES, default="coalesce", help="missed tick policy (default: coalesce)")
+    parser.add_argument(
+        "--consumer-delay", type=float, default=0.0, help="seconds the consumer blocks per status (default: 0)"
+    )
+    args = parser.parse_args()
+
+    tick_metrics = TickMetrics()
+    started_at = time.monotonic()
+    asyncio.run(drive(args.rockets, args.ticks, create_clock(args.clock), args.policy, args.consumer_delay, tick_metrics))
+    print(f"{args.rockets} rockets flew in {time.monotonic() - started_at:.3f} s")
+    print(tick_metrics.report())